@@ -0,0 +1,464 @@
+# Capacity-constrained Allocation of Students to Internships
+# File: backend/app/allocation.py
+#
+# Usage (from backend/):
+#   python -m app.allocation students.ndjson --output allocation.ndjson --capacity 2 --workers 4
+#
+# Students use the bulk export input format (/api/recommend fields plus
+# student_id). Seats per listing come from a listing's "seats" field, a
+# --capacities JSON file ({"<internship id>": seats}) or --capacity.
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.bulk_export import (
+    DEFAULT_DATA_PATH, DEFAULT_PROFILES_PATH, _STATE, _write_atomic,
+    detect_format, parse_record, process_chunks, read_chunks, shared_engine
+)
+from app.models import RecommendationRequest
+
+
+class CandidateGraph:
+    """
+    Sparsified student x internship utility matrix in CSR form.
+
+    Only each student's top-k listings (scores at or above the engine's
+    MIN_SIMILARITY) are kept, so memory grows with students * k rather than
+    students * internships: 10^6 students at k=20 take about 160 MB.
+    """
+
+    def __init__(self, student_ids: List[Any], indptr: np.ndarray, items: np.ndarray, utilities: np.ndarray):
+        """
+        Args:
+            student_ids: Student identifier per row
+            indptr: Row offsets into items/utilities (len(student_ids) + 1)
+            items: Catalog row of each edge (int32), each student's edges best first
+            utilities: Engine score of each edge (float32)
+        """
+        self.student_ids = student_ids
+        self.indptr = indptr
+        self.items = items
+        self.utilities = utilities
+
+    @property
+    def students(self) -> int:
+        return len(self.student_ids)
+
+    @property
+    def edges(self) -> int:
+        return len(self.items)
+
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.items.nbytes + self.utilities.nbytes
+
+    @classmethod
+    def from_parts(cls, parts: List[Tuple[List[Any], np.ndarray, np.ndarray, np.ndarray]]) -> "CandidateGraph":
+        """Concatenate (student ids, per-student edge counts, items, utilities) parts in order"""
+        counts = np.concatenate([part[1] for part in parts]) if parts else np.empty(0, dtype=np.int64)
+        indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return cls(
+            [student_id for part in parts for student_id in part[0]],
+            indptr,
+            np.concatenate([part[2] for part in parts]) if parts else np.empty(0, dtype=np.int32),
+            np.concatenate([part[3] for part in parts]) if parts else np.empty(0, dtype=np.float32),
+        )
+
+
+def candidate_chunk(chunk_index: int, records: List[Tuple[int, Any]], input_format: str,
+                    k: int, list_separator: str = ";") -> Dict[str, Any]:
+    """
+    Top-k candidate edges of one chunk of students (runs in a worker)
+
+    Returns:
+        Chunk index, (student ids, edge counts, items, utilities) and error lines
+    """
+    engine = _STATE["engine"]
+    registry = _STATE["profiles"]
+    cpu_start = time.process_time()
+    student_ids, counts, items, utilities, errors = [], [], [], [], []
+
+    for line_no, raw in records:
+        try:
+            payload = parse_record(raw, input_format, list_separator)
+            student_id = payload.get("student_id", line_no)
+            request = RecommendationRequest(**payload)
+            profile = registry.resolve(request.weight_profile, request.user_id or str(student_id))
+            rows, scores = engine.top_rows(
+                education=request.education,
+                skills=request.skills,
+                sectors=request.sectors,
+                location_state=request.location_state,
+                k=k,
+                filters=request.hard_filters(),
+                weights=profile.weights,
+                skill_blend=profile.skill_blend
+            )
+        except Exception as e:
+            errors.append(json.dumps({"line": line_no, "error": str(e)[:500]}, ensure_ascii=False))
+            continue
+        student_ids.append(student_id)
+        counts.append(len(rows))
+        items.append(rows.astype(np.int32))
+        utilities.append(scores.astype(np.float32))
+
+    return {
+        "chunk": chunk_index,
+        "part": (
+            student_ids,
+            np.array(counts, dtype=np.int64),
+            np.concatenate(items) if items else np.empty(0, dtype=np.int32),
+            np.concatenate(utilities) if utilities else np.empty(0, dtype=np.float32),
+        ),
+        "errors": errors,
+        "cpu_seconds": time.process_time() - cpu_start,
+    }
+
+
+def build_candidate_graph(input_path: str, data_path: str = DEFAULT_DATA_PATH, k: int = 20,
+                          workers: Optional[int] = None, chunk_size: int = 1000,
+                          input_format: Optional[str] = None, list_separator: str = ";",
+                          exclude_expired: bool = False,
+                          weight_profiles_path: Optional[str] = DEFAULT_PROFILES_PATH):
+    """
+    Score a student pool against the catalog in a process pool and keep each student's top k
+
+    Workers share one memory-mapped engine index (see bulk_export.shared_engine).
+
+    Returns:
+        (CandidateGraph, catalog internships, error lines, worker CPU seconds)
+    """
+    input_format = input_format or detect_format(input_path)
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    parts: Dict[int, Tuple] = {}
+    errors: List[str] = []
+    cpu_seconds = 0.0
+
+    def collect(result: Dict[str, Any]) -> None:
+        nonlocal cpu_seconds
+        parts[result["chunk"]] = result["part"]
+        errors.extend(result["errors"])
+        cpu_seconds += result["cpu_seconds"]
+
+    index_dir = tempfile.mkdtemp(prefix="allocation-index-")
+    with shared_engine(data_path, index_dir, exclude_expired, weight_profiles_path) as engine:
+        process_chunks(candidate_chunk, read_chunks(input_path, input_format, chunk_size), workers, collect,
+                       input_format, k, list_separator)
+        internships = engine.internships
+
+    graph = CandidateGraph.from_parts([parts[chunk] for chunk in sorted(parts)])
+    return graph, internships, errors, cpu_seconds
+
+
+def capacities_for(internships: List[Dict[str, Any]], default: int = 1,
+                   overrides: Optional[Dict[str, int]] = None) -> np.ndarray:
+    """
+    Seats per catalog row: override by internship id, else the listing's "seats" field, else default
+    """
+    overrides = overrides or {}
+    return np.array([
+        int(overrides.get(str(internship["id"]), internship.get("seats", default)))
+        for internship in internships
+    ], dtype=np.int64)
+
+
+def _best_bids(indptr: np.ndarray, items: np.ndarray, utilities: np.ndarray, open_edges: np.ndarray,
+               prices: np.ndarray, bidders: np.ndarray, epsilon: float):
+    """
+    Each bidder's bid at the current prices
+
+    Returns:
+        (bidding students, listing each bids for, utility of that listing, bid);
+        bidders whose best net value is not positive are left out
+    """
+    # Edges of the bidders as one flat array, segmented per bidder
+    counts = np.diff(indptr)[bidders]
+    segment_starts = np.zeros(len(bidders), dtype=np.int64)
+    np.cumsum(counts[:-1], out=segment_starts[1:])
+    edge = np.repeat(indptr[bidders] - segment_starts, counts) + np.arange(counts.sum())
+    edge_items = items[edge]
+    values = np.where(open_edges[edge], utilities[edge] - prices[edge_items], -np.inf)
+
+    # Best and second-best net value per bidder (the outside option is worth 0)
+    best = np.maximum.reduceat(values, segment_starts)
+    bidder = np.repeat(np.arange(len(bidders)), counts)
+    is_best = np.flatnonzero(values == best[bidder])
+    _, first = np.unique(bidder[is_best], return_index=True)
+    best_edge = is_best[first]
+    values[best_edge] = -np.inf
+    second = np.maximum(np.maximum.reduceat(values, segment_starts), 0.0)
+
+    # Bidders whose best option is worth nothing drop out for good (prices never fall)
+    bidding = best > 0
+    won_edge = edge[best_edge[bidding]]
+    offer_utilities = utilities[won_edge].astype(np.float64)
+    return bidders[bidding], items[won_edge], offer_utilities, offer_utilities - second[bidding] + epsilon
+
+
+def auction_allocate(graph: CandidateGraph, capacities: np.ndarray, epsilon: float = 1e-3,
+                     max_rounds: int = 100000, block_size: int = 65536) -> Dict[str, Any]:
+    """
+    Maximize total utility subject to listing capacities with a vectorized auction
+
+    Every unassigned student bids, in the same round, for the candidate with
+    the best utility minus price, raising its price by the margin over their
+    second-best option (or over staying unassigned, worth 0) plus epsilon. A
+    listing keeps its highest capacity bids and evicts the rest; once full,
+    its price is its lowest kept bid. A student whose best net value drops
+    to 0 or below stays unassigned. Prices only rise on full listings, so at
+    the end the assignment is within students * epsilon of the optimum on the
+    candidate graph; the returned dual bound measures the actual gap.
+
+    Args:
+        graph: Candidate graph of utilities
+        capacities: Seats per catalog row
+        epsilon: Minimum bid increment (smaller = closer to optimal, more rounds)
+        max_rounds: Safety limit on bidding rounds
+        block_size: Bidders whose bids are computed together (bounds temporary memory)
+
+    Returns:
+        assignment (catalog row per student, -1 if unassigned), utility per student,
+        prices, objective, dual_bound, rounds and solve seconds
+    """
+    start = time.perf_counter()
+    indptr, items = graph.indptr, graph.items
+    utilities = graph.utilities
+    n = graph.students
+    capacities = np.asarray(capacities, dtype=np.int64)
+
+    prices = np.zeros(len(capacities))
+    assignment = np.full(n, -1, dtype=np.int64)
+    bids = np.zeros(n)
+    won = np.zeros(n)
+
+    # Students with no candidates (or only zero-capacity ones) never bid
+    open_edges = capacities[items] > 0
+    active = np.flatnonzero(np.diff(indptr) > 0)
+    active = active[np.add.reduceat(open_edges, indptr[active]) > 0]
+
+    rounds = 0
+    while len(active) and rounds < max_rounds:
+        rounds += 1
+
+        # Bids for every bidder at this round's prices, a block at a time to bound temporaries
+        blocks = [
+            _best_bids(indptr, items, utilities, open_edges, prices, active[block:block + block_size], epsilon)
+            for block in range(0, len(active), block_size)
+        ]
+        students, targets, offer_utilities, offers = (np.concatenate(parts) for parts in zip(*blocks))
+
+        # Each listing that got bids keeps its top capacity bids among holders and bidders
+        contested = np.zeros(len(capacities), dtype=bool)
+        contested[targets] = True
+        holders = np.flatnonzero(assignment >= 0)
+        holders = holders[contested[assignment[holders]]]
+        contenders = np.concatenate([holders, students])
+        contender_items = np.concatenate([assignment[holders], targets])
+        contender_bids = np.concatenate([bids[holders], offers])
+        contender_utilities = np.concatenate([won[holders], offer_utilities])
+
+        order = np.lexsort((-contender_bids, contender_items))
+        contenders, contender_items, contender_bids, contender_utilities = (
+            contenders[order], contender_items[order], contender_bids[order], contender_utilities[order]
+        )
+        item_start = np.searchsorted(contender_items, contender_items, side="left")
+        rank = np.arange(len(contenders)) - item_start
+        keep = rank < capacities[contender_items]
+
+        assignment[contenders[~keep]] = -1
+        assignment[contenders[keep]] = contender_items[keep]
+        bids[contenders[keep]] = contender_bids[keep]
+        won[contenders[keep]] = contender_utilities[keep]
+
+        # Lowest kept bid of every full listing (kept bids are sorted descending per listing)
+        last_kept = np.flatnonzero(keep & (rank == capacities[contender_items] - 1))
+        prices[contender_items[last_kept]] = contender_bids[last_kept]
+
+        # Evicted holders and outbid bidders bid again next round
+        active = np.unique(contenders[~keep])
+
+    assigned = np.flatnonzero(assignment >= 0)
+    utility = np.where(assignment >= 0, won, 0.0)
+    return {
+        "assignment": assignment,
+        "utility": utility,
+        "prices": prices,
+        "objective": float(utility.sum()),
+        "dual_bound": _dual_bound(graph, prices, capacities, open_edges),
+        "assigned": len(assigned),
+        "rounds": rounds,
+        "converged": len(active) == 0,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def _dual_bound(graph: CandidateGraph, prices: np.ndarray, capacities: np.ndarray,
+                open_edges: np.ndarray) -> float:
+    """LP dual value for the prices: an upper bound on any feasible assignment's utility"""
+    if not graph.edges:
+        return 0.0
+    net = np.where(open_edges, graph.utilities - prices[graph.items], -np.inf)
+    lengths = np.diff(graph.indptr)
+    nonempty = lengths > 0
+    best = np.full(graph.students, 0.0)
+    best[nonempty] = np.maximum.reduceat(net, graph.indptr[:-1][nonempty])
+    return float(np.maximum(best, 0.0).sum() + (capacities * prices).sum())
+
+
+def independent_top1_overflow(graph: CandidateGraph, capacities: np.ndarray) -> Dict[str, int]:
+    """
+    What ranking every student independently does: top-1 demand against seats
+
+    Returns:
+        Listings recommended first to more students than they have seats, and
+        the number of students beyond those seats
+    """
+    lengths = np.diff(graph.indptr)
+    firsts = graph.items[graph.indptr[:-1][lengths > 0]]
+    demand = np.bincount(firsts, minlength=len(capacities))
+    excess = np.maximum(demand - capacities, 0)
+    return {"oversubscribed_listings": int((excess > 0).sum()), "students_over_capacity": int(excess.sum())}
+
+
+def run_allocation(input_path: str, output_path: str, data_path: str = DEFAULT_DATA_PATH,
+                   k: int = 20, capacity: int = 1, capacities_path: Optional[str] = None,
+                   epsilon: float = 1e-3, workers: Optional[int] = None, chunk_size: int = 1000,
+                   input_format: Optional[str] = None, list_separator: str = ";",
+                   exclude_expired: bool = False,
+                   weight_profiles_path: Optional[str] = DEFAULT_PROFILES_PATH) -> Dict[str, Any]:
+    """
+    Build the candidate graph for a student pool, solve the allocation and write it as NDJSON
+
+    Args:
+        input_path: NDJSON or CSV file of student profiles
+        output_path: Allocation output (one line per student; internship null if unassigned)
+        data_path: Internship catalog
+        k: Candidate listings kept per student
+        capacity: Seats of listings without a "seats" field or override
+        capacities_path: JSON file mapping internship id to seats (optional)
+        epsilon: Auction bid increment
+        workers: Scoring processes (None = one per CPU, 0 = in this process)
+        chunk_size: Students per scoring task
+        input_format, list_separator, exclude_expired, weight_profiles_path: As in bulk_export.run_export
+
+    Returns:
+        Allocation report
+
+    Raises:
+        RuntimeError: If no student has a candidate listing (nothing to allocate)
+    """
+    start = time.perf_counter()
+    graph, internships, errors, cpu_seconds = build_candidate_graph(
+        input_path, data_path, k, workers, chunk_size, input_format, list_separator,
+        exclude_expired, weight_profiles_path
+    )
+    graph_seconds = time.perf_counter() - start
+    print(f"🕸️ Candidate graph: {graph.students} students, {graph.edges} edges "
+          f"({graph.nbytes / 1e6:.1f} MB) in {graph_seconds:.1f}s")
+    if graph.edges == 0:
+        if errors:
+            _write_atomic(f"{output_path}.errors", errors)
+        raise RuntimeError(f"No student has a candidate listing scoring at least the engine's minimum "
+                           f"({graph.students} students, {len(errors)} input errors); nothing was allocated")
+
+    overrides = None
+    if capacities_path:
+        with open(capacities_path, "r", encoding="utf-8") as f:
+            overrides = json.load(f)
+    capacities = capacities_for(internships, capacity, overrides)
+
+    result = auction_allocate(graph, capacities, epsilon)
+    assignment = result["assignment"]
+
+    lines = []
+    for student, student_id in enumerate(graph.student_ids):
+        row = int(assignment[student])
+        if row < 0:
+            lines.append(json.dumps({"student_id": student_id, "internship_id": None, "score": None}))
+            continue
+        lines.append(json.dumps({
+            "student_id": student_id,
+            "internship_id": internships[row]["id"],
+            "score": round(float(result["utility"][student]), 4),
+        }, ensure_ascii=False))
+    _write_atomic(output_path, lines)
+    if errors:
+        _write_atomic(f"{output_path}.errors", errors)
+
+    objective, dual_bound = result["objective"], result["dual_bound"]
+    return {
+        "students": graph.students,
+        "errors": len(errors),
+        "listings": len(internships),
+        "seats": int(capacities.sum()),
+        "candidate_edges": graph.edges,
+        "graph_megabytes": round(graph.nbytes / 1e6, 1),
+        "assigned": result["assigned"],
+        "filled_listings": int((np.bincount(assignment[assignment >= 0], minlength=len(capacities)) > 0).sum()),
+        "objective": round(objective, 3),
+        "mean_utility": round(objective / result["assigned"], 4) if result["assigned"] else 0.0,
+        "dual_bound": round(dual_bound, 3),
+        "optimality_gap": round((dual_bound - objective) / dual_bound, 6) if dual_bound else 0.0,
+        "auction_rounds": result["rounds"],
+        "converged": result["converged"],
+        "graph_seconds": round(graph_seconds, 2),
+        "scoring_cpu_seconds": round(cpu_seconds, 2),
+        "solve_seconds": round(result["seconds"], 3),
+        **independent_top1_overflow(graph, capacities),
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print an allocation report"""
+    print(f"\n✅ Assigned {report['assigned']} of {report['students']} students "
+          f"to {report['filled_listings']} listings ({report['seats']} seats)")
+    print(f"  Objective: {report['objective']} (mean score {report['mean_utility']}), "
+          f"dual bound {report['dual_bound']}, gap {report['optimality_gap']:.4%}")
+    print(f"  Independent ranking would send {report['students_over_capacity']} students' top pick "
+          f"to {report['oversubscribed_listings']} oversubscribed listings")
+    print(f"⏱️ Candidate graph {report['graph_seconds']}s ({report['scoring_cpu_seconds']} CPU s), "
+          f"auction {report['solve_seconds']}s in {report['auction_rounds']} rounds")
+
+
+# CLI interface for allocation runs
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Allocate students to internships under seat capacities")
+    parser.add_argument("input", help="NDJSON or CSV file of student profiles")
+    parser.add_argument("--output", required=True, help="Allocation NDJSON file")
+    parser.add_argument("--data", default=os.environ.get("INTERNSHIP_DATA_PATH", DEFAULT_DATA_PATH),
+                        help="Internship catalog JSON")
+    parser.add_argument("--k", type=int, default=20, help="Candidate listings kept per student")
+    parser.add_argument("--capacity", type=int, default=1, help="Default seats per listing")
+    parser.add_argument("--capacities", help="JSON file mapping internship id to seats")
+    parser.add_argument("--epsilon", type=float, default=1e-3, help="Auction bid increment")
+    parser.add_argument("--workers", type=int, help="Scoring processes (default: one per CPU, 0 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--format", choices=("ndjson", "csv"), help="Input format (default: from extension)")
+    parser.add_argument("--exclude-expired", action="store_true",
+                        default=os.environ.get("EXCLUDE_EXPIRED_LISTINGS", "false").lower() in ("1", "true", "yes"),
+                        help="Skip listings past their deadline (default: EXCLUDE_EXPIRED_LISTINGS, as the API)")
+    parser.add_argument("--weight-profiles", default=os.environ.get("WEIGHT_PROFILES_PATH", DEFAULT_PROFILES_PATH))
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    try:
+        allocation_report = run_allocation(
+            args.input, args.output, data_path=args.data, k=args.k, capacity=args.capacity,
+            capacities_path=args.capacities, epsilon=args.epsilon, workers=args.workers,
+            chunk_size=args.chunk_size, input_format=args.format,
+            exclude_expired=args.exclude_expired, weight_profiles_path=args.weight_profiles
+        )
+    except (RuntimeError, ValueError) as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+    if args.json:
+        print(json.dumps(allocation_report, indent=2))
+    else:
+        print_report(allocation_report)
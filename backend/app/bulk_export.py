@@ -0,0 +1,458 @@
+# Nightly Bulk Recommendation Export with Checkpoint and Resume
+# File: backend/app/bulk_export.py
+#
+# Usage (from backend/):
+#   python -m app.bulk_export students.ndjson --output exports/2026-10-19 --workers 4
+#   python -m app.bulk_export students.csv --output exports/2026-10-19    # re-run to resume
+#
+# Profiles use the /api/recommend request fields plus an optional student_id.
+# CSV files take the same column names, with list columns (skills, sectors)
+# separated by ";".
+
+import argparse
+import contextlib
+import csv
+import fcntl
+import gc
+import json
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.models import RecommendationRequest
+from app.recommendation_engine import InternshipRecommendationEngine
+from app.weight_profiles import WeightProfileRegistry
+
+CHECKPOINT_FILE = "_checkpoint.json"
+LOCK_FILE = "_export.lock"
+INDEX_DIR = "_index"
+LIST_COLUMNS = ("skills", "sectors")
+
+DEFAULT_DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "internships_dataset.json")
+DEFAULT_PROFILES_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "weight_profiles.json")
+
+# Engine and weight profiles, inherited by forked workers
+_STATE: Dict[str, Any] = {}
+
+
+def detect_format(path: str) -> str:
+    """Input format from the file extension (csv, otherwise ndjson)"""
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def read_chunks(path: str, input_format: str, chunk_size: int) -> Iterator[Tuple[int, List[Tuple[int, Any]]]]:
+    """
+    Stream (chunk index, [(line number, raw record), ...]) from an input file
+
+    NDJSON records stay unparsed strings so parsing happens in the workers;
+    blank lines are skipped but still counted in line numbers.
+    """
+    chunk: List[Tuple[int, Any]] = []
+    chunk_index = 0
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if input_format == "csv":
+            reader = csv.DictReader(f)
+            records = ((reader.line_num, row) for row in reader)
+        else:
+            records = ((line_no, line) for line_no, line in enumerate(f, start=1) if line.strip())
+
+        for record in records:
+            chunk.append(record)
+            if len(chunk) == chunk_size:
+                yield chunk_index, chunk
+                chunk, chunk_index = [], chunk_index + 1
+    if chunk:
+        yield chunk_index, chunk
+
+
+def parse_record(raw: Any, input_format: str, list_separator: str = ";") -> Dict[str, Any]:
+    """Request payload from one NDJSON line or CSV row"""
+    if input_format != "csv":
+        return json.loads(raw)
+    payload = {key: value.strip() for key, value in raw.items() if key and value not in (None, "")}
+    for column in LIST_COLUMNS:
+        if column in payload:
+            payload[column] = [item.strip() for item in payload[column].split(list_separator) if item.strip()]
+    return payload
+
+
+def _write_atomic(path: str, lines: List[str]) -> None:
+    """Write lines to path so readers never see a partial file"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(line)
+            f.write("\n")
+    os.replace(temp_path, path)
+
+
+def _export_row(engine: InternshipRecommendationEngine, idx: int, score: float, reason: str) -> Dict[str, Any]:
+    """Campaign fields of one recommended listing"""
+    internship = engine.internships[idx]
+    return {
+        "id": internship["id"],
+        "title": internship["title"],
+        "company": internship["company"],
+        "location_city": internship["location_city"],
+        "location_state": internship["location_state"],
+        "stipend": internship["stipend"],
+        "apply_url": internship["apply_url"],
+        "similarity_score": round(score, 4),
+        "reason": reason,
+    }
+
+
+def export_chunk(chunk_index: int, records: List[Tuple[int, Any]], output_dir: str,
+                 input_format: str, list_separator: str = ";") -> Dict[str, Any]:
+    """
+    Score one chunk of profiles and write its partition file (runs in a worker)
+
+    Invalid profiles are written to a matching .errors file instead of
+    failing the chunk.
+
+    Returns:
+        Chunk counters and timings
+    """
+    engine = _STATE["engine"]
+    registry = _STATE["profiles"]
+    start, cpu_start = time.perf_counter(), time.process_time()
+    lines, errors = [], []
+
+    for line_no, raw in records:
+        try:
+            payload = parse_record(raw, input_format, list_separator)
+            student_id = payload.get("student_id", line_no)
+            request = RecommendationRequest(**payload)
+            profile = registry.resolve(request.weight_profile, request.user_id or str(student_id))
+            rows = engine.get_recommendation_rows(
+                education=request.education,
+                skills=request.skills,
+                sectors=request.sectors,
+                location_state=request.location_state,
+                max_results=request.max_results or 5,
+                filters=request.hard_filters(),
+                diversity=request.diversity_options(),
+                weights=profile.weights,
+                skill_blend=profile.skill_blend
+            )
+            lines.append(json.dumps({
+                "student_id": student_id,
+                "weight_profile": profile.name,
+                "recommendations": [_export_row(engine, idx, score, reason) for idx, score, reason in rows],
+            }, ensure_ascii=False))
+        except Exception as e:
+            errors.append(json.dumps({"line": line_no, "error": str(e)[:500]}, ensure_ascii=False))
+
+    part = os.path.join(output_dir, f"part-{chunk_index:06d}")
+    _write_atomic(f"{part}.ndjson", lines)
+    if errors:
+        _write_atomic(f"{part}.errors.ndjson", errors)
+    elif os.path.exists(f"{part}.errors.ndjson"):
+        os.remove(f"{part}.errors.ndjson")
+
+    return {
+        "chunk": chunk_index,
+        "profiles": len(lines),
+        "errors": len(errors),
+        "seconds": time.perf_counter() - start,
+        "cpu_seconds": time.process_time() - cpu_start,
+    }
+
+
+class ExportCheckpoint:
+    """
+    Progress of an export, saved atomically after every finished chunk.
+
+    A chunk's partition file is written before the chunk is recorded here, so
+    after a crash a resumed run redoes at most the chunks that were in flight
+    (rewriting their partition files). The signature ties the checkpoint to
+    its input file, chunking and catalog; resuming with any of them changed
+    is refused.
+    """
+
+    def __init__(self, output_dir: str, signature: Dict[str, Any]):
+        self.path = os.path.join(output_dir, CHECKPOINT_FILE)
+        self.signature = signature
+        self.completed: set = set()
+        self.profiles = self.errors = 0
+        self.cpu_seconds = 0.0
+        self.complete = False
+
+    def load(self) -> "ExportCheckpoint":
+        """Read saved progress (if any)
+
+        Raises:
+            ValueError: If the saved checkpoint belongs to a different input, chunking or catalog
+        """
+        if not os.path.exists(self.path):
+            return self
+        with open(self.path, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved["signature"] != self.signature:
+            raise ValueError(f"Checkpoint {self.path} belongs to a different export; use --restart to start over")
+        self.completed = set(saved["completed_chunks"])
+        self.profiles = saved["profiles"]
+        self.errors = saved["errors"]
+        self.cpu_seconds = saved["cpu_seconds"]
+        self.complete = saved.get("complete", False)
+        return self
+
+    def mark_done(self, result: Dict[str, Any]) -> None:
+        """Record a finished chunk"""
+        self.completed.add(result["chunk"])
+        self.profiles += result["profiles"]
+        self.errors += result["errors"]
+        self.cpu_seconds += result["cpu_seconds"]
+        self.save()
+
+    def save(self) -> None:
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "signature": self.signature,
+                "completed_chunks": sorted(self.completed),
+                "profiles": self.profiles,
+                "errors": self.errors,
+                "cpu_seconds": round(self.cpu_seconds, 3),
+                "complete": self.complete,
+            }, f)
+        os.replace(temp_path, self.path)
+
+
+def _file_signature(path: str) -> Dict[str, Any]:
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def clear_output(output_dir: str) -> None:
+    """Remove the partition files, checkpoint and index of a previous run"""
+    for name in os.listdir(output_dir):
+        if name.startswith("part-") or name.startswith(CHECKPOINT_FILE):
+            os.remove(os.path.join(output_dir, name))
+    shutil.rmtree(os.path.join(output_dir, INDEX_DIR), ignore_errors=True)
+
+
+@contextlib.contextmanager
+def shared_engine(data_path: str, index_dir: str, exclude_expired: bool = False,
+                  weight_profiles_path: Optional[str] = None):
+    """
+    Load the engine and weight profiles for worker processes to share
+
+    The engine is built once in this process and its matrices are swapped for
+    a memory-mapped index in index_dir; workers forked afterwards read the
+    same pages instead of holding private copies. The index is removed on exit.
+
+    Yields:
+        The loaded engine
+
+    Raises:
+        RuntimeError: If exclude_expired leaves no listing to recommend
+    """
+    engine = InternshipRecommendationEngine(data_path, exclude_expired=exclude_expired)
+    engine.load_data()
+    if exclude_expired and engine.catalog_index.expired_count(date.today()) == engine.catalog_index.size:
+        raise RuntimeError(f"Every listing in {data_path} is past its application deadline; "
+                           "run without excluding expired listings")
+    index_bytes = sum(engine.memory_map_matrices(index_dir).values())
+    print(f"🗺️ Memory-mapped engine index: {index_bytes / 1e6:.1f} MB in {index_dir}")
+
+    registry = WeightProfileRegistry.from_engine_defaults()
+    if weight_profiles_path and os.path.exists(weight_profiles_path):
+        registry.load_config(weight_profiles_path)
+    _STATE.update(engine=engine, profiles=registry)
+    # Frozen objects are never touched by the collector, so forked workers keep sharing their pages
+    gc.collect()
+    gc.freeze()
+    try:
+        yield engine
+    finally:
+        gc.unfreeze()
+        _STATE.clear()
+        shutil.rmtree(index_dir, ignore_errors=True)
+
+
+def process_chunks(worker: Callable[..., Any], chunks: Iterable[Tuple[int, List[Tuple[int, Any]]]],
+                   workers: int, on_result: Callable[[Any], None], *args: Any) -> None:
+    """
+    Run worker(chunk_index, records, *args) for every chunk in a forked process pool
+
+    Submission is bounded to two chunks per worker, so only a few chunks are
+    in memory however large the input is. Results are passed to on_result as
+    chunks finish (not necessarily in order). workers=0 runs in this process.
+    """
+    if workers == 0:
+        for chunk_index, records in chunks:
+            on_result(worker(chunk_index, records, *args))
+        return
+
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        pending = set()
+        for chunk_index, records in chunks:
+            while len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    on_result(future.result())
+            pending.add(pool.submit(worker, chunk_index, records, *args))
+        for future in wait(pending).done:
+            on_result(future.result())
+
+
+@contextlib.contextmanager
+def output_lock(output_dir: str):
+    """
+    Hold an exclusive lock on an output directory for the length of a run
+
+    Two runs on one directory would rewrite each other's memory-mapped index
+    and partition files.
+
+    Raises:
+        RuntimeError: If another export holds the lock
+    """
+    lock_file = open(os.path.join(output_dir, LOCK_FILE), "w")
+    try:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise RuntimeError(f"Another export is already writing to {output_dir}")
+        yield
+    finally:
+        lock_file.close()
+
+
+def run_export(input_path: str, output_dir: str, data_path: str = DEFAULT_DATA_PATH,
+               chunk_size: int = 1000, workers: Optional[int] = None,
+               input_format: Optional[str] = None, list_separator: str = ";",
+               exclude_expired: bool = False, weight_profiles_path: Optional[str] = DEFAULT_PROFILES_PATH,
+               restart: bool = False, progress_interval: float = 10.0) -> Dict[str, Any]:
+    """
+    Score every profile in an input file and write partitioned NDJSON output
+
+    Args:
+        input_path: NDJSON or CSV file of student profiles
+        output_dir: Directory for part-NNNNNN.ndjson files and the checkpoint
+        data_path: Internship catalog to score against
+        chunk_size: Profiles per chunk (one partition file and checkpoint step each)
+        workers: Worker processes (None = one per CPU, 0 = score in this process)
+        input_format: "ndjson" or "csv" (default: from the file extension)
+        list_separator: Separator of list columns in CSV input
+        exclude_expired: Skip listings whose application deadline has passed
+        weight_profiles_path: Weight profile config, as used by the API (optional)
+        restart: Discard previous progress in output_dir instead of resuming
+        progress_interval: Seconds between progress lines
+
+    Returns:
+        Run report with throughput per second and per core
+    """
+    input_format = input_format or detect_format(input_path)
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    os.makedirs(output_dir, exist_ok=True)
+    with output_lock(output_dir):
+        if restart:
+            clear_output(output_dir)
+
+        signature = {
+            "input": _file_signature(input_path),
+            "format": input_format,
+            "chunk_size": chunk_size,
+            "catalog": _file_signature(data_path),
+            "exclude_expired": exclude_expired,
+        }
+        checkpoint = ExportCheckpoint(output_dir, signature).load()
+        resumed_chunks = len(checkpoint.completed)
+        if resumed_chunks:
+            print(f"⏯️ Resuming: {resumed_chunks} chunks ({checkpoint.profiles} profiles) already exported")
+
+        start = time.perf_counter()
+        run_profiles = run_errors = 0
+        run_cpu = 0.0
+        last_progress = start
+
+        def finish(result: Dict[str, Any]) -> None:
+            nonlocal run_profiles, run_errors, run_cpu, last_progress
+            checkpoint.mark_done(result)
+            run_profiles += result["profiles"]
+            run_errors += result["errors"]
+            run_cpu += result["cpu_seconds"]
+            now = time.perf_counter()
+            if now - last_progress >= progress_interval:
+                last_progress = now
+                print(f"📦 {len(checkpoint.completed)} chunks, {run_profiles} profiles this run "
+                      f"({run_profiles / (now - start):.0f} profiles/s)")
+
+        with shared_engine(data_path, os.path.join(output_dir, INDEX_DIR), exclude_expired, weight_profiles_path):
+            chunks = (
+                (chunk_index, records)
+                for chunk_index, records in read_chunks(input_path, input_format, chunk_size)
+                if chunk_index not in checkpoint.completed
+            )
+            process_chunks(export_chunk, chunks, workers, finish, output_dir, input_format, list_separator)
+
+        checkpoint.complete = True
+        checkpoint.save()
+
+        wall = time.perf_counter() - start
+        return {
+            "input": os.path.abspath(input_path),
+            "output": os.path.abspath(output_dir),
+            "workers": workers,
+            "chunks": len(checkpoint.completed),
+            "resumed_chunks": resumed_chunks,
+            "profiles": checkpoint.profiles,
+            "errors": checkpoint.errors,
+            "run_profiles": run_profiles,
+            "run_errors": run_errors,
+            "seconds": round(wall, 3),
+            "profiles_per_second": round(run_profiles / wall, 1) if wall else 0.0,
+            # Scoring CPU time summed over workers, so this stays meaningful on shared machines
+            "profiles_per_core_second": round(run_profiles / run_cpu, 1) if run_cpu else 0.0,
+        }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print an export run report"""
+    print(f"\n✅ Exported {report['profiles']} profiles in {report['chunks']} partitions to {report['output']}")
+    if report["resumed_chunks"]:
+        print(f"  Resumed after {report['resumed_chunks']} chunks; {report['run_profiles']} profiles this run")
+    print(f"  Errors: {report['errors']} (see part-*.errors.ndjson)")
+    print(f"⏱️ {report['seconds']}s with {report['workers']} workers → {report['profiles_per_second']} profiles/s, "
+          f"{report['profiles_per_core_second']} profiles/s per core")
+
+
+# CLI interface for nightly exports
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute recommendations for a file of student profiles")
+    parser.add_argument("input", help="NDJSON or CSV file of profiles")
+    parser.add_argument("--output", required=True, help="Output directory (partition files and checkpoint)")
+    parser.add_argument("--data", default=os.environ.get("INTERNSHIP_DATA_PATH", DEFAULT_DATA_PATH),
+                        help="Internship catalog JSON")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU, 0 = in-process)")
+    parser.add_argument("--format", choices=("ndjson", "csv"), help="Input format (default: from extension)")
+    parser.add_argument("--list-separator", default=";", help="Separator of skills/sectors in CSV input")
+    parser.add_argument("--exclude-expired", action="store_true",
+                        default=os.environ.get("EXCLUDE_EXPIRED_LISTINGS", "false").lower() in ("1", "true", "yes"),
+                        help="Skip listings past their deadline (default: EXCLUDE_EXPIRED_LISTINGS, as the API)")
+    parser.add_argument("--weight-profiles", default=os.environ.get("WEIGHT_PROFILES_PATH", DEFAULT_PROFILES_PATH))
+    parser.add_argument("--restart", action="store_true", help="Discard previous progress and start over")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    try:
+        export_report = run_export(
+            args.input, args.output, data_path=args.data, chunk_size=args.chunk_size, workers=args.workers,
+            input_format=args.format, list_separator=args.list_separator,
+            exclude_expired=args.exclude_expired, weight_profiles_path=args.weight_profiles,
+            restart=args.restart
+        )
+    except (RuntimeError, ValueError) as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+    if args.json:
+        print(json.dumps(export_report, indent=2))
+    else:
+        print_report(export_report)
@@ -0,0 +1,275 @@
+# Columnar Catalog Index with Bitmap Hard Filters
+# File: backend/app/catalog_index.py
+
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Deadline used for listings without a parseable application_deadline (never expires)
+NO_DEADLINE = np.iinfo(np.int32).max
+
+# Cached threshold bitmaps per range-indexed column
+RANGE_BITMAP_CACHE = 128
+
+_EPOCH = date(1970, 1, 1)
+_STIPEND_PATTERN = re.compile(r"\d[\d,]*")
+
+
+def parse_stipend(stipend: Any) -> int:
+    """
+    Parse a formatted stipend such as "₹27,382/month" into an integer amount
+
+    Returns:
+        Monthly amount in rupees, or 0 if no amount can be found (e.g. "Unpaid")
+    """
+    if isinstance(stipend, (int, float)):
+        return int(stipend)
+    match = _STIPEND_PATTERN.search(str(stipend or ""))
+    return int(match.group().replace(",", "")) if match else 0
+
+
+def parse_date_days(value: Optional[str]) -> int:
+    """Parse a YYYY-MM-DD date into days since the Unix epoch (NO_DEADLINE if invalid)"""
+    try:
+        return (date.fromisoformat(str(value)[:10]) - _EPOCH).days
+    except (TypeError, ValueError):
+        return NO_DEADLINE
+
+
+def date_to_days(day: date) -> int:
+    """Convert a date into days since the Unix epoch"""
+    return (day - _EPOCH).days
+
+
+def jaccard(matches: np.ndarray, skill_count: int, row_skill_counts: np.ndarray) -> np.ndarray:
+    """Jaccard similarity from per-row match counts and set sizes"""
+    union = skill_count + row_skill_counts - matches
+    return np.divide(matches, union, out=np.zeros(len(matches)), where=union > 0)
+
+
+class RangeIndex:
+    """
+    Rows sorted by a numeric column, so a threshold filter is one binary search.
+
+    The packed bitmap of the rows past a cut is built on first use and cached
+    by cut position, so repeated thresholds (the few values clients actually
+    send) cost a lookup rather than a pass over the column.
+    """
+
+    def __init__(self, values: np.ndarray):
+        self.size = len(values)
+        self.order = np.argsort(values, kind="stable")
+        self.sorted_values = values[self.order]
+        self._bitmaps: Dict[tuple, np.ndarray] = {}
+
+    def _bitmap(self, start: int, stop: int) -> np.ndarray:
+        """Packed bitmap of the rows at sorted positions start..stop-1"""
+        key = (start, stop)
+        bitmap = self._bitmaps.get(key)
+        if bitmap is None:
+            mask = np.zeros(self.size, dtype=bool)
+            mask[self.order[start:stop]] = True
+            bitmap = np.packbits(mask)
+            if len(self._bitmaps) >= RANGE_BITMAP_CACHE:
+                # Replaced by a single assignment so concurrent readers never see a half-cleared cache
+                self._bitmaps = {}
+            self._bitmaps[key] = bitmap
+        return bitmap
+
+    def at_least(self, value: float) -> np.ndarray:
+        """Packed bitmap of rows whose value is >= value"""
+        return self._bitmap(int(np.searchsorted(self.sorted_values, value, side="left")), self.size)
+
+    def at_most(self, value: float) -> np.ndarray:
+        """Packed bitmap of rows whose value is <= value"""
+        return self._bitmap(0, int(np.searchsorted(self.sorted_values, value, side="right")))
+
+
+class CatalogIndex:
+    """
+    Columnar view of the internship catalog built once at load time.
+
+    Numeric columns (stipend, duration, deadline, required education level) are
+    parsed into NumPy arrays. Stipend and duration get sorted range indexes,
+    deadlines a sorted index with the open rows cached per day, and eligibility
+    one cumulative bitmap per education level, so each hard filter resolves to
+    a cached packed bitmap; the bitmaps are ANDed together and the engine only
+    scores the surviving rows.
+    """
+
+    def __init__(self, internships: List[Dict[str, Any]], education_hierarchy: Dict[str, int]):
+        """
+        Build the index
+
+        Args:
+            internships: Catalog rows in engine order
+            education_hierarchy: Education level ranks used for eligibility
+        """
+        self.size = len(internships)
+
+        # Parsed numeric columns
+        self.stipend = np.array([parse_stipend(i.get("stipend")) for i in internships], dtype=np.int64)
+        self.duration_weeks = np.array([int(i.get("duration_weeks") or 0) for i in internships], dtype=np.int32)
+        self.deadline_days = np.array(
+            [parse_date_days(i.get("application_deadline")) for i in internships], dtype=np.int32
+        )
+        self.education_levels = np.array(
+            [education_hierarchy.get(i["education_requirement"], 0) for i in internships], dtype=np.int8
+        )
+
+        # Integer codes for categorical scoring components
+        self.sector_values, self.sector_codes = self._encode([i["sector"].lower() for i in internships])
+        self.location_values, self.location_codes = self._encode(
+            [(i["location_state"].lower(), i["location_city"].lower()) for i in internships]
+        )
+        self.company_values, self.company_codes = self._encode([i["company"] for i in internships])
+
+        # Lowercased skill sets flattened into (row, skill code) arrays for Jaccard overlap
+        skill_sets = [sorted({skill.lower() for skill in i["skills_required"]}) for i in internships]
+        self.skill_lookup: Dict[str, int] = {}
+        self.skill_counts = np.array([len(skills) for skills in skill_sets], dtype=np.int32)
+        self.skill_rows = np.repeat(np.arange(self.size, dtype=np.int32), self.skill_counts)
+        self.skill_codes = np.array(
+            [self.skill_lookup.setdefault(skill, len(self.skill_lookup)) for skills in skill_sets for skill in skills],
+            dtype=np.int32
+        )
+
+        # Inverted skill index: ascending rows of each skill code, delimited by offsets
+        self.skill_postings = self.skill_rows[np.argsort(self.skill_codes, kind="stable")]
+        self.skill_offsets = np.concatenate([
+            [0], np.cumsum(np.bincount(self.skill_codes, minlength=len(self.skill_lookup)))
+        ])
+
+        # Range indexes for the threshold filters
+        self.stipend_index = RangeIndex(self.stipend)
+        self.duration_index = RangeIndex(self.duration_weeks)
+
+        # Cumulative eligibility bitmaps: rows whose required level is <= the user level
+        self.max_level = int(max(education_hierarchy.values(), default=0))
+        self.eligibility_bitmaps = [
+            np.packbits(self.education_levels <= level) for level in range(self.max_level + 1)
+        ]
+
+        # Deadline index: rows sorted by deadline so the open/expired split is one binary search
+        self.deadline_order = np.argsort(self.deadline_days, kind="stable")
+        self.sorted_deadlines = self.deadline_days[self.deadline_order]
+        self._open_cache = None
+
+    @staticmethod
+    def _encode(values: List[Any]):
+        """Map values to dense integer codes (first-seen order)"""
+        lookup: Dict[Any, int] = {}
+        codes = np.empty(len(values), dtype=np.int32)
+        for i, value in enumerate(values):
+            codes[i] = lookup.setdefault(value, len(lookup))
+        return list(lookup), codes
+
+    def _user_skill_codes(self, skills: List[str]):
+        """(codes of the user's skills known to the catalog, number of distinct user skills)"""
+        user_skills = {skill.lower() for skill in skills}
+        return [self.skill_lookup[skill] for skill in user_skills if skill in self.skill_lookup], len(user_skills)
+
+    def known_skills(self, skills: List[str]):
+        """(mask over skill codes of the user's skills, number of distinct user skills), case-insensitive"""
+        codes, skill_count = self._user_skill_codes(skills)
+        known = np.zeros(len(self.skill_lookup), dtype=bool)
+        known[codes] = True
+        return known, skill_count
+
+    def skill_candidates(self, skills: List[str]):
+        """
+        Rows sharing at least one skill with a skill list, from the inverted skill index
+
+        Costs time proportional to the matching postings rather than the catalog.
+
+        Returns:
+            (ascending candidate rows, their Jaccard overlap); every other row's overlap is 0
+        """
+        codes, skill_count = self._user_skill_codes(skills)
+        postings = [self.skill_postings[self.skill_offsets[code]:self.skill_offsets[code + 1]] for code in codes]
+        if not postings:
+            return np.empty(0, dtype=np.int32), np.empty(0)
+        rows, matches = np.unique(np.concatenate(postings), return_counts=True)
+        return rows, jaccard(matches, skill_count, self.skill_counts[rows])
+
+    def skill_overlap(self, skills: List[str]) -> np.ndarray:
+        """
+        Jaccard similarity between a skill list and every row's skill set (case-insensitive)
+
+        Works on the flat code arrays only, so scoring never touches the
+        catalog's Python objects.
+        """
+        known, skill_count = self.known_skills(skills)
+        matches = np.bincount(self.skill_rows[known[self.skill_codes]], minlength=self.size)
+        return jaccard(matches, skill_count, self.skill_counts)
+
+    def _open_state(self, day: date):
+        """(day, open rows, open bitmap) for a day, recomputed only when the day changes"""
+        today = date_to_days(day)
+        cache = self._open_cache
+        if cache is None or cache[0] != today:
+            start = np.searchsorted(self.sorted_deadlines, today, side="left")
+            # The suffix of deadline_order is in deadline order; the mask yields it in row order in O(N)
+            mask = np.zeros(self.size, dtype=bool)
+            mask[self.deadline_order[start:]] = True
+            rows = np.flatnonzero(mask)
+            cache = (today, rows, np.packbits(mask))
+            # Single assignment so concurrent readers see either the old or the new day
+            self._open_cache = cache
+        return cache
+
+    def open_rows(self, day: date) -> np.ndarray:
+        """Sorted rows whose application deadline is on or after day"""
+        return self._open_state(day)[1]
+
+    def open_bitmap(self, day: date) -> np.ndarray:
+        """Packed bitmap of rows whose application deadline is on or after day"""
+        return self._open_state(day)[2]
+
+    def expired_count(self, day: date) -> int:
+        """Number of rows whose application deadline is before day"""
+        return self.size - len(self._open_state(day)[1])
+
+    def filter_rows(self, min_stipend: Optional[int] = None,
+                    min_duration_weeks: Optional[int] = None,
+                    max_duration_weeks: Optional[int] = None,
+                    open_on: Optional[date] = None,
+                    max_education_level: Optional[int] = None) -> Optional[np.ndarray]:
+        """
+        Apply hard filters to the catalog
+
+        Args:
+            min_stipend: Minimum monthly stipend in rupees
+            min_duration_weeks: Minimum internship duration
+            max_duration_weeks: Maximum internship duration
+            open_on: Keep only listings whose application deadline is on or after this day
+            max_education_level: Keep only listings requiring at most this education level
+
+        Returns:
+            Sorted row indices that pass every filter, or None if every row passes
+            (so callers can score the full matrices without copying row subsets)
+        """
+        bitmaps = []
+        if min_stipend is not None:
+            bitmaps.append(self.stipend_index.at_least(min_stipend))
+        if min_duration_weeks is not None:
+            bitmaps.append(self.duration_index.at_least(min_duration_weeks))
+        if max_duration_weeks is not None:
+            bitmaps.append(self.duration_index.at_most(max_duration_weeks))
+        if open_on is not None:
+            bitmaps.append(self.open_bitmap(open_on))
+        if max_education_level is not None:
+            level = min(max(int(max_education_level), 0), self.max_level)
+            bitmaps.append(self.eligibility_bitmaps[level])
+
+        if not bitmaps:
+            return None
+
+        combined = bitmaps[0].copy()
+        for bitmap in bitmaps[1:]:
+            np.bitwise_and(combined, bitmap, out=combined)
+        mask = np.unpackbits(combined, count=self.size).view(bool)
+        rows = np.flatnonzero(mask)
+        return None if len(rows) == self.size else rows
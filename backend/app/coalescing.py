@@ -0,0 +1,75 @@
+# Single-flight Coalescing of Identical Concurrent Requests
+# File: backend/app/coalescing.py
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class SingleFlight:
+    """
+    Runs at most one computation per key at a time.
+
+    The first caller for a key runs the computation off the event loop;
+    callers that arrive with the same key while it is in flight await the same
+    future and share its result (or its exception). Nothing is cached once the
+    computation finishes, so results are never stale.
+    """
+
+    def __init__(self, enabled: bool = True,
+                 runner: Optional[Callable[..., Awaitable[Any]]] = None):
+        """
+        Args:
+            enabled: When False every call runs its own computation (for comparisons)
+            runner: Coroutine function runner(fn, *args) that runs fn off the event loop
+                (defaults to the loop's default executor)
+        """
+        self.enabled = enabled
+        self.runner = runner
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.requests = 0
+        self.computations = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Return fn(*args), sharing one in-flight computation among callers with the same key
+
+        Args:
+            key: Hashable identity of the computation
+            fn: Blocking function, run through the runner
+        """
+        self.requests += 1
+        loop = asyncio.get_running_loop()
+
+        future = self._in_flight.get(key) if self.enabled else None
+        if future is not None:
+            self.coalesced += 1
+            # Shield so one cancelled waiter does not cancel the computation for the others
+            return await asyncio.shield(future)
+
+        self.computations += 1
+        if self.runner is not None:
+            future = asyncio.ensure_future(self.runner(fn, *args))
+        else:
+            future = loop.run_in_executor(None, fn, *args)
+        if not self.enabled:
+            return await future
+
+        self._in_flight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            # Only the owner removes the key, and only while it still maps to its own future
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Request, computation and coalescing counters"""
+        return {
+            "enabled": self.enabled,
+            "requests": self.requests,
+            "computations": self.computations,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+            "saved_ratio": self.coalesced / self.requests if self.requests else 0.0,
+        }
@@ -0,0 +1,289 @@
+# Implicit-Feedback Collaborative Filtering (ALS with Conjugate Gradient)
+# File: backend/app/collaborative.py
+#
+# Usage (from backend/):
+#   python -m app.collaborative EVENT_LOG_DIR [--output data/collaborative_model.npz]
+#       [--factors 32] [--iterations 10] [--regularization 0.05] [--alpha 1.0] [--workers N]
+#
+# Trains user and listing factors from the interaction event log (views,
+# clicks, applications and fills; impressions alone are not positives). The
+# engine blends the listing factors into its scores as the 'collaborative'
+# weight when COLLABORATIVE_MODEL_PATH points at the saved model.
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from app.event_log import EVENT_KINDS, read_segment, segment_files
+
+# Preference strength of each logged interaction (impressions carry none)
+EVENT_WEIGHTS = {"view": 1.0, "click": 3.0, "application": 10.0, "fill": 20.0}
+
+# Nonzeros per chunk when gathering factor rows (bounds scratch memory)
+GATHER_CHUNK = 1 << 18
+
+
+def interactions_from_segments(paths: Iterable[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Weighted (user, internship) interactions from event log segments
+
+    Events of anonymous users (user key 0) and impressions are skipped.
+
+    Returns:
+        (user keys, internship ids, weights) with one entry per event
+    """
+    weight_by_kind = np.array([EVENT_WEIGHTS.get(kind, 0.0) for kind in EVENT_KINDS], dtype=np.float32)
+    users, items, weights = [], [], []
+    for path in paths:
+        events = read_segment(path)
+        events = events[(events["user_key"] != 0) & (weight_by_kind[events["kind"]] > 0)]
+        users.append(events["user_key"])
+        items.append(events["internship_id"])
+        weights.append(weight_by_kind[events["kind"]])
+    if not users:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    return np.concatenate(users), np.concatenate(items), np.concatenate(weights)
+
+
+def interaction_matrix(user_keys: np.ndarray, item_ids: np.ndarray, weights: np.ndarray):
+    """
+    Sum interactions into a users x items CSR matrix
+
+    Returns:
+        (CSR float32 matrix, sorted distinct user keys, sorted distinct internship ids)
+    """
+    from scipy import sparse
+
+    users, user_index = np.unique(user_keys, return_inverse=True)
+    items, item_index = np.unique(item_ids, return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (weights.astype(np.float32), (user_index, item_index)), shape=(len(users), len(items))
+    )
+    matrix.sum_duplicates()
+    return matrix, users, items
+
+
+def _solve_block(confidence, factors: np.ndarray, other: np.ndarray, gram: np.ndarray, cg_steps: int) -> None:
+    """
+    A few conjugate-gradient steps on every row of one block of factors, in place
+
+    For each row u this approximately solves the implicit-ALS normal equations
+    (Y'Y + Y'(C_u - I)Y + reg I) x_u = Y'C_u p_u, warm-started from the
+    current x_u. The Y'(C_u - I)Y x term is a sampled dot product per nonzero
+    followed by one sparse-dense product, so the f x f systems of every row
+    are never formed.
+
+    Args:
+        confidence: CSR block with C - 1 (alpha * weight) per observed pair
+        factors: Factors of the block's rows (updated)
+        other: Fixed factors of the other side
+        gram: Y'Y + reg I
+        cg_steps: Conjugate-gradient iterations
+    """
+    from scipy import sparse
+
+    indptr, columns = confidence.indptr, confidence.indices
+    rows = np.repeat(np.arange(confidence.shape[0], dtype=np.int32), np.diff(indptr))
+    weighted = np.empty(len(columns), dtype=np.float32)
+
+    def apply(direction: np.ndarray) -> np.ndarray:
+        product = direction @ gram
+        for start in range(0, len(columns), GATHER_CHUNK):
+            stop = start + GATHER_CHUNK
+            weighted[start:stop] = np.einsum(
+                "ij,ij->i", direction[rows[start:stop]], other[columns[start:stop]]
+            )
+        np.multiply(weighted, confidence.data, out=weighted)
+        product += sparse.csr_matrix((weighted, columns, indptr), shape=confidence.shape) @ other
+        return product
+
+    target = sparse.csr_matrix((confidence.data + 1, columns, indptr), shape=confidence.shape) @ other
+    residual = target - apply(factors)
+    direction = residual.copy()
+    residual_norm = np.einsum("ij,ij->i", residual, residual)
+    for _ in range(cg_steps):
+        applied = apply(direction)
+        curvature = np.einsum("ij,ij->i", direction, applied)
+        step = np.divide(residual_norm, curvature, out=np.zeros_like(curvature), where=curvature > 0)
+        factors += step[:, None] * direction
+        residual -= step[:, None] * applied
+        new_norm = np.einsum("ij,ij->i", residual, residual)
+        ratio = np.divide(new_norm, residual_norm, out=np.zeros_like(new_norm), where=residual_norm > 0)
+        direction *= ratio[:, None]
+        direction += residual
+        residual_norm = new_norm
+
+
+def _half_step(confidence, factors: np.ndarray, other: np.ndarray, regularization: float,
+               cg_steps: int, pool: Optional[ThreadPoolExecutor], blocks: int) -> None:
+    """Update one side's factors with the other side fixed, one thread per block of rows"""
+    gram = other.T @ other + regularization * np.eye(other.shape[1], dtype=np.float32)
+    bounds = np.linspace(0, confidence.shape[0], blocks + 1).astype(np.int64)
+    jobs = [(confidence[start:stop], factors[start:stop]) for start, stop in zip(bounds[:-1], bounds[1:])
+            if stop > start]
+    if pool is None:
+        for block, block_factors in jobs:
+            _solve_block(block, block_factors, other, gram, cg_steps)
+    else:
+        # numpy's gathers and products release the GIL, so blocks run on separate cores
+        list(pool.map(lambda job: _solve_block(job[0], job[1], other, gram, cg_steps), jobs))
+
+
+def train_implicit_als(matrix, factors: int = 32, iterations: int = 10, regularization: float = 0.05,
+                       alpha: float = 1.0, cg_steps: int = 3, workers: Optional[int] = None,
+                       seed: int = 42) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """
+    Implicit-feedback matrix factorization by alternating least squares with CG
+
+    Args:
+        matrix: Users x items CSR interaction weights (interaction_matrix)
+        factors: Latent dimensions
+        iterations: Alternating passes over users and items
+        regularization: L2 penalty on the factors
+        alpha: Confidence per unit of interaction weight (confidence = 1 + alpha * weight)
+        cg_steps: Conjugate-gradient steps per row and pass
+        workers: Threads solving blocks of rows (defaults to the CPU count)
+        seed: Factor initialization seed
+
+    Returns:
+        (user factors, item factors, report) with float32 factors
+    """
+    start_time = time.perf_counter()
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    users_items = matrix.astype(np.float32)
+    users_items.data *= alpha
+    items_users = users_items.T.tocsr()
+
+    rng = np.random.default_rng(seed)
+    user_factors = (rng.standard_normal((matrix.shape[0], factors)) * 0.01).astype(np.float32)
+    item_factors = (rng.standard_normal((matrix.shape[1], factors)) * 0.01).astype(np.float32)
+
+    blocks = max(workers * 4, 1)
+    pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    iteration_seconds = []
+    try:
+        for _ in range(iterations):
+            iteration_start = time.perf_counter()
+            _half_step(users_items, user_factors, item_factors, regularization, cg_steps, pool, blocks)
+            _half_step(items_users, item_factors, user_factors, regularization, cg_steps, pool, blocks)
+            iteration_seconds.append(time.perf_counter() - iteration_start)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return user_factors, item_factors, {
+        "users": matrix.shape[0],
+        "items": matrix.shape[1],
+        "interactions": int(matrix.nnz),
+        "factors": factors,
+        "iterations": iterations,
+        "workers": workers,
+        "seconds": time.perf_counter() - start_time,
+        "seconds_per_iteration": float(np.mean(iteration_seconds)) if iteration_seconds else 0.0,
+    }
+
+
+class CollaborativeModel:
+    """
+    Trained user and listing factors, keyed by event-log user key and internship id.
+
+    Users without factors (anonymous or unseen in training) get the mean
+    user vector, which scores listings by how broadly they are chosen. The
+    version (the saved file's mtime) tells rankings of different trainings apart.
+    """
+
+    def __init__(self, user_keys: np.ndarray, user_factors: np.ndarray,
+                 item_ids: np.ndarray, item_factors: np.ndarray, version: float = 0.0):
+        order = np.argsort(user_keys)
+        self.user_keys = np.ascontiguousarray(user_keys[order], dtype=np.uint64)
+        self.user_factors = np.ascontiguousarray(user_factors[order], dtype=np.float32)
+        self.item_ids = np.asarray(item_ids, dtype=np.int64)
+        self.item_factors = np.ascontiguousarray(item_factors, dtype=np.float32)
+        self.mean_user = (self.user_factors.mean(axis=0) if len(self.user_factors)
+                          else np.zeros(self.item_factors.shape[1], dtype=np.float32))
+        self.version = version
+
+    @property
+    def factors(self) -> int:
+        return self.item_factors.shape[1]
+
+    def knows(self, user: int) -> bool:
+        """Whether the user has trained factors"""
+        position = np.searchsorted(self.user_keys, np.uint64(user))
+        return bool(position < len(self.user_keys) and self.user_keys[position] == user)
+
+    def user_vector(self, user: int) -> np.ndarray:
+        """Factors of a user (the mean user vector when unknown)"""
+        position = np.searchsorted(self.user_keys, np.uint64(user))
+        if position < len(self.user_keys) and self.user_keys[position] == user:
+            return self.user_factors[position]
+        return self.mean_user
+
+    def item_factors_for(self, internship_ids: np.ndarray) -> np.ndarray:
+        """Listing factors aligned to internship ids (zeros for listings without interactions)"""
+        aligned = np.zeros((len(internship_ids), self.factors), dtype=np.float32)
+        position = np.minimum(np.searchsorted(self.item_ids, internship_ids), max(len(self.item_ids) - 1, 0))
+        known = self.item_ids[position] == internship_ids if len(self.item_ids) else np.zeros(0, dtype=bool)
+        aligned[known] = self.item_factors[position[known]]
+        return aligned
+
+    def save(self, path: str) -> None:
+        """Write the model atomically"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            np.savez(f, user_keys=self.user_keys, user_factors=self.user_factors,
+                     item_ids=self.item_ids, item_factors=self.item_factors)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CollaborativeModel":
+        # The mtime is taken first, so a file replaced while it is read is picked up again later
+        version = os.path.getmtime(path)
+        with np.load(path) as saved:
+            return cls(saved["user_keys"], saved["user_factors"], saved["item_ids"], saved["item_factors"], version)
+
+
+def print_report(report: Dict[str, Any], output: str) -> None:
+    """Print a training summary"""
+    print(f"🤝 Trained {report['factors']} factors for {report['users']} users x {report['items']} listings "
+          f"from {report['interactions']} interactions")
+    print(f"⏱️ {report['seconds']:.1f}s total, {report['seconds_per_iteration']:.1f}s per iteration "
+          f"({report['iterations']} iterations, {report['workers']} workers)")
+    print(f"💾 Model written to {output}")
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Train the collaborative component from the event log")
+    parser.add_argument("event_log_dir", help="EVENT_LOG_DIR of the API (completed segments are read)")
+    parser.add_argument("--output", default=os.path.join(
+        os.path.dirname(__file__), "..", "data", "collaborative_model.npz"
+    ))
+    parser.add_argument("--factors", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--regularization", type=float, default=0.05)
+    parser.add_argument("--alpha", type=float, default=1.0)
+    parser.add_argument("--cg-steps", type=int, default=3)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+
+    segments = segment_files(args.event_log_dir)
+    user_keys, item_ids, weights = interactions_from_segments(segments)
+    if not len(user_keys):
+        print(f"❌ No interactions from identified users in {len(segments)} segments")
+        return 1
+    matrix, users, items = interaction_matrix(user_keys, item_ids, weights)
+    user_factors, item_factors, report = train_implicit_als(
+        matrix, args.factors, args.iterations, args.regularization, args.alpha, args.cg_steps, args.workers
+    )
+    CollaborativeModel(users, user_factors, items, item_factors).save(args.output)
+    print_report(report, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
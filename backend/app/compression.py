@@ -0,0 +1,126 @@
+# Negotiated gzip/brotli Response Compression
+# File: backend/app/compression.py
+
+import gzip
+import json
+from typing import Any, Dict, Optional
+
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed (headers would eat the savings)
+MIN_COMPRESS_SIZE = 1024
+
+# Static payloads are compressed once, so spend more CPU for smaller output
+STATIC_GZIP_LEVEL = 9
+STATIC_BROTLI_QUALITY = 11
+
+# Dynamic payloads are compressed per request, so favour speed
+DYNAMIC_GZIP_LEVEL = 5
+DYNAMIC_BROTLI_QUALITY = 4
+
+
+def available_encodings() -> tuple:
+    """Content codings this process can produce, in order of preference"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> str:
+    """
+    Pick the best content coding from an Accept-Encoding header
+
+    Args:
+        accept_encoding: Raw header value (e.g. "gzip, deflate, br;q=0.9")
+
+    Returns:
+        "br", "gzip" or "identity"
+    """
+    if not accept_encoding:
+        return "identity"
+
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        parts = item.strip().split(";")
+        coding = parts[0].strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in parts[1:]:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+
+    best, best_quality = "identity", 0.0
+    for coding in available_encodings():
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, static: bool = False) -> bytes:
+    """Compress a body with the given content coding"""
+    if encoding == "br":
+        quality = STATIC_BROTLI_QUALITY if static else DYNAMIC_BROTLI_QUALITY
+        return brotli.compress(body, quality=quality)
+    if encoding == "gzip":
+        level = STATIC_GZIP_LEVEL if static else DYNAMIC_GZIP_LEVEL
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    return body
+
+
+def _encoded_response(body: bytes, encoding: str, media_type: str) -> Response:
+    """Build a response carrying an already-encoded body"""
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def compressed_response(body: bytes, accept_encoding: Optional[str],
+                        media_type: str = "application/json") -> Response:
+    """Compress a per-request body if it is large enough and the client accepts it"""
+    encoding = negotiate_encoding(accept_encoding) if len(body) >= MIN_COMPRESS_SIZE else "identity"
+    return _encoded_response(compress(body, encoding), encoding, media_type)
+
+
+class PrecompressedPayload:
+    """
+    JSON payload encoded once with every supported content coding
+
+    Used for catalog-wide endpoints whose content only changes on reload, so
+    serving them is a dictionary lookup instead of per-request encoding.
+    """
+
+    __slots__ = ("bodies", "media_type")
+
+    def __init__(self, body: bytes, media_type: str = "application/json"):
+        self.media_type = media_type
+        self.bodies = {"identity": body}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            for encoding in available_encodings():
+                self.bodies[encoding] = compress(body, encoding, static=True)
+
+    @classmethod
+    def from_object(cls, obj: Any) -> "PrecompressedPayload":
+        """Encode a JSON-serializable object"""
+        return cls(json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    def response(self, accept_encoding: Optional[str]) -> Response:
+        """Serve the best stored variant for the client"""
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding not in self.bodies:
+            encoding = "identity"
+        return _encoded_response(self.bodies[encoding], encoding, self.media_type)
+
+    def sizes(self) -> Dict[str, int]:
+        """Stored size in bytes of each variant"""
+        return {encoding: len(body) for encoding, body in self.bodies.items()}
@@ -0,0 +1,275 @@
+# Engine Snapshot Manager for Atomic Catalog Hot-Reload
+# File: backend/app/engine_manager.py
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.recommendation_engine import InternshipRecommendationEngine
+
+
+def _build_engine(data_path: str, engine_options: Dict[str, Any]) -> InternshipRecommendationEngine:
+    """Build and fully load an engine (runs in a background thread or process)"""
+    engine = InternshipRecommendationEngine(data_path, **engine_options)
+    engine.load_data()
+    return engine
+
+
+def _file_mtime(path: str) -> Optional[float]:
+    """Return the modification time of a file, or None if it does not exist"""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+class EngineSnapshot:
+    """
+    Immutable, fully loaded recommendation engine plus catalog metadata.
+
+    Request handlers read the current snapshot once and use it until they finish,
+    so swapping in a new snapshot never affects requests already in flight.
+    """
+
+    __slots__ = ("engine", "version", "data_path", "data_mtime", "loaded_at", "build_seconds",
+                 "warmup_seconds")
+
+    def __init__(self, engine: InternshipRecommendationEngine, version: int, data_path: str,
+                 data_mtime: Optional[float], build_seconds: float, warmup_seconds: float = 0.0):
+        object.__setattr__(self, "engine", engine)
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "data_path", data_path)
+        object.__setattr__(self, "data_mtime", data_mtime)
+        object.__setattr__(self, "loaded_at", time.time())
+        object.__setattr__(self, "build_seconds", build_seconds)
+        object.__setattr__(self, "warmup_seconds", warmup_seconds)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("EngineSnapshot is immutable")
+
+    def info(self) -> Dict[str, Any]:
+        """Summary of the snapshot for health and admin endpoints"""
+        return {
+            "version": self.version,
+            "data_path": self.data_path,
+            "loaded_at": self.loaded_at,
+            "build_seconds": round(self.build_seconds, 3),
+            "warmup_seconds": round(self.warmup_seconds, 3),
+            "total_internships": len(self.engine.internships),
+        }
+
+
+class EngineManager:
+    """
+    Owns the current engine snapshot and rebuilds it in the background.
+
+    A new engine is built off the serving path (in a separate process by default,
+    so TF-IDF fitting does not compete with request handling for the GIL) and is
+    published with a single reference assignment. Reloads can be triggered
+    explicitly or by watching the dataset file for changes.
+
+    Every engine is warmed up with synthetic queries before it is published, and
+    the manager only reports ready once the current snapshot has been warmed in
+    this process (a snapshot inherited over fork is warmed again by ensure_warm).
+    """
+
+    def __init__(self, data_path: str, build_mode: str = "process", watch_interval: float = 5.0,
+                 engine_options: Optional[Dict[str, Any]] = None, warm_up: bool = True,
+                 configure: Optional[Callable[[InternshipRecommendationEngine], None]] = None):
+        """
+        Initialize the manager
+
+        Args:
+            data_path: Path to the internships dataset JSON file
+            build_mode: "process" or "thread" - where background builds run
+            watch_interval: Seconds between dataset file checks (0 disables watching)
+            engine_options: Extra keyword arguments for InternshipRecommendationEngine
+            warm_up: Run synthetic queries through a new engine before publishing it
+            configure: Called with every new engine in the serving process before it is
+                warmed and published (for process-local state that cannot be pickled
+                across a build process, such as live counters)
+        """
+        if build_mode not in ("process", "thread"):
+            raise ValueError(f"Unsupported build mode: {build_mode}")
+
+        self.data_path = data_path
+        self.build_mode = build_mode
+        self.watch_interval = watch_interval
+        self.engine_options = dict(engine_options or {})
+        self.warm_up = warm_up
+        self.configure = configure
+
+        self._snapshot: Optional[EngineSnapshot] = None
+        self._version = 0
+        self._reload_lock: Optional[asyncio.Lock] = None
+        self._watch_task: Optional[asyncio.Task] = None
+        self._failed_mtime: Optional[float] = None
+        self._ready_pid: Optional[int] = None
+
+        self.reload_count = 0
+        self.last_reload_error: Optional[str] = None
+
+    @property
+    def current(self) -> Optional[EngineSnapshot]:
+        """The snapshot new requests should use (None until the first load)"""
+        return self._snapshot
+
+    @property
+    def ready(self) -> bool:
+        """Whether a warmed snapshot is serving in this process"""
+        return self._snapshot is not None and self._ready_pid == os.getpid()
+
+    def _warm(self, engine: InternshipRecommendationEngine) -> float:
+        """
+        Configure and warm an engine up, returning the seconds spent warming
+
+        A warm-up that scores no rows raises, so the engine is never published
+        and the manager does not report ready with it.
+        """
+        if self.configure is not None:
+            self.configure(engine)
+        if not self.warm_up:
+            return 0.0
+        return engine.warm_up()["seconds"]
+
+    def _publish(self, engine: InternshipRecommendationEngine, data_path: str,
+                 data_mtime: Optional[float], build_seconds: float,
+                 warmup_seconds: float = 0.0) -> EngineSnapshot:
+        """Swap in a freshly built (and warmed) engine"""
+        self._version += 1
+        snapshot = EngineSnapshot(engine, self._version, data_path, data_mtime, build_seconds, warmup_seconds)
+        # Single reference assignment - atomic for readers
+        self._snapshot = snapshot
+        self._ready_pid = os.getpid()
+        return snapshot
+
+    def _switch_dataset(self, data_path: str) -> None:
+        """Watch an explicitly requested dataset from now on (this process only)"""
+        if data_path != self.data_path:
+            print(f"📂 Serving and watching {data_path} instead of {self.data_path}")
+            self.data_path = data_path
+
+    def load(self, data_path: Optional[str] = None) -> EngineSnapshot:
+        """Build an engine synchronously on the calling thread and publish it"""
+        data_path = data_path or self.data_path
+        data_mtime = _file_mtime(data_path)
+        start_time = time.perf_counter()
+        engine = _build_engine(data_path, self.engine_options)
+        build_seconds = time.perf_counter() - start_time
+        snapshot = self._publish(engine, data_path, data_mtime, build_seconds, self._warm(engine))
+        self._switch_dataset(data_path)
+        return snapshot
+
+    def ensure_warm(self) -> None:
+        """Warm the current snapshot if it was loaded in another process (e.g. a pre-fork master)"""
+        snapshot = self._snapshot
+        if snapshot is None or self._ready_pid == os.getpid():
+            return
+        seconds = self._warm(snapshot.engine)
+        self._ready_pid = os.getpid()
+        print(f"🔥 Engine warmed up in {seconds * 1000:.0f}ms")
+
+    def _make_executor(self):
+        """Create a one-shot executor for a background build"""
+        if self.build_mode == "process":
+            # Spawn avoids forking a process that is running event loop and worker threads
+            return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="engine-reload")
+
+    async def reload(self, data_path: Optional[str] = None) -> EngineSnapshot:
+        """
+        Build a new engine in the background and swap it in atomically
+
+        Concurrent reload calls are serialized. If the build fails the current
+        snapshot stays in place and the error is re-raised. A data_path other
+        than the configured one also becomes the dataset this process watches;
+        other worker processes are not told, so only pass one with a single worker.
+        """
+        if self._reload_lock is None:
+            self._reload_lock = asyncio.Lock()
+
+        async with self._reload_lock:
+            data_path = data_path or self.data_path
+            if not os.path.exists(data_path):
+                raise FileNotFoundError(f"Dataset not found at {data_path}")
+
+            data_mtime = _file_mtime(data_path)
+            loop = asyncio.get_running_loop()
+            start_time = time.perf_counter()
+
+            executor = self._make_executor()
+            try:
+                engine = await loop.run_in_executor(
+                    executor, _build_engine, data_path, self.engine_options
+                )
+                build_seconds = time.perf_counter() - start_time
+                # Warm in this process, where the engine will serve, but off the event loop
+                warmup_seconds = await loop.run_in_executor(None, self._warm, engine)
+            except Exception as e:
+                self.last_reload_error = str(e)
+                print(f"❌ Engine reload failed, keeping version {self._version}: {e}")
+                raise
+            finally:
+                executor.shutdown(wait=False)
+
+            snapshot = self._publish(engine, data_path, data_mtime, build_seconds, warmup_seconds)
+            self._switch_dataset(data_path)
+            self.reload_count += 1
+            self.last_reload_error = None
+            print(f"🔄 Engine reloaded: version {snapshot.version} "
+                  f"({len(engine.internships)} internships, {snapshot.build_seconds:.2f}s)")
+            return snapshot
+
+    async def _watch_loop(self) -> None:
+        """Poll the dataset file and reload when its modification time changes"""
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            snapshot = self._snapshot
+            if snapshot is None:
+                continue
+
+            mtime = _file_mtime(self.data_path)
+            if mtime is None or mtime in (snapshot.data_mtime, self._failed_mtime):
+                continue
+            if self._reload_lock is not None and self._reload_lock.locked():
+                continue
+
+            try:
+                await self.reload()
+            except Exception:
+                # Already logged; retry only once the file changes again
+                self._failed_mtime = mtime
+
+    def start_watching(self) -> None:
+        """Start the dataset file watcher on the running event loop"""
+        if self.watch_interval <= 0 or self._watch_task is not None:
+            return
+        self._watch_task = asyncio.get_running_loop().create_task(self._watch_loop())
+
+    async def stop_watching(self) -> None:
+        """Stop the dataset file watcher"""
+        if self._watch_task is None:
+            return
+        self._watch_task.cancel()
+        try:
+            await self._watch_task
+        except asyncio.CancelledError:
+            pass
+        self._watch_task = None
+
+    def status(self) -> Dict[str, Any]:
+        """Reload status for admin endpoints"""
+        snapshot = self._snapshot
+        return {
+            "snapshot": snapshot.info() if snapshot else None,
+            "ready": self.ready,
+            "build_mode": self.build_mode,
+            "watching": self._watch_task is not None,
+            "watch_interval": self.watch_interval,
+            "reload_count": self.reload_count,
+            "reload_in_progress": bool(self._reload_lock and self._reload_lock.locked()),
+            "last_reload_error": self.last_reload_error,
+        }
@@ -0,0 +1,261 @@
+# Offline Evaluation Harness for Ranking Quality and Speed
+# File: backend/app/evaluation.py
+
+import argparse
+import contextlib
+import json
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models import EducationLevel
+from app.recommendation_engine import EDUCATION_HIERARCHY, InternshipRecommendationEngine
+
+# Engine shared with pool workers (inherited on fork, loaded by the initializer otherwise)
+_ENGINE: Optional[InternshipRecommendationEngine] = None
+
+
+def load_profiles(path: str) -> List[Dict[str, Any]]:
+    """
+    Load labeled profiles from a JSON array or NDJSON file
+
+    Each entry looks like:
+        {"profile": {"education": "B.Tech", "skills": [...], "sectors": [...],
+                     "location_state": "Telangana"},
+         "relevant_ids": [12, 57, 101]}
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read().strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def generate_labeled_profiles(internships: List[Dict[str, Any]], count: int,
+                              seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Synthesize labeled student profiles from a catalog
+
+    Each profile is derived from a random "target" listing (its sector, state,
+    an eligible education level and a subset of its skills plus one unrelated
+    skill). A listing counts as relevant when it is in the same sector, shares
+    at least two of the profile's skills and the profile meets its education
+    requirement.
+
+    Args:
+        internships: Catalog rows
+        count: Number of profiles to generate
+        seed: Random seed for reproducible evaluation sets
+
+    Returns:
+        Labeled profiles in the load_profiles format
+    """
+    rng = random.Random(seed)
+    hierarchy = EDUCATION_HIERARCHY
+    education_levels = [level.value for level in EducationLevel]
+    all_skills = sorted({skill for i in internships for skill in i["skills_required"]})
+
+    by_sector: Dict[str, List[Dict[str, Any]]] = {}
+    for internship in internships:
+        by_sector.setdefault(internship["sector"], []).append(internship)
+
+    profiles = []
+    for _ in range(count):
+        target = rng.choice(internships)
+        required_level = hierarchy.get(target["education_requirement"], 0)
+        eligible = [e for e in education_levels if hierarchy.get(e, 0) >= required_level]
+        education = rng.choice(eligible or education_levels)
+        user_level = hierarchy.get(education, 0)
+
+        skills = rng.sample(target["skills_required"], min(len(target["skills_required"]), rng.randint(2, 3)))
+        skills.append(rng.choice(all_skills))
+        skills = list(dict.fromkeys(skills))
+        skills_lower = {skill.lower() for skill in skills}
+
+        relevant_ids = [
+            i["id"] for i in by_sector[target["sector"]]
+            if len(skills_lower & {s.lower() for s in i["skills_required"]}) >= 2
+            and user_level >= hierarchy.get(i["education_requirement"], 0)
+        ]
+
+        profiles.append({
+            "profile": {
+                "education": education,
+                "skills": skills,
+                "sectors": [target["sector"]] if rng.random() < 0.7 else None,
+                "location_state": target["location_state"] if rng.random() < 0.5 else None,
+            },
+            "relevant_ids": relevant_ids,
+        })
+    return profiles
+
+
+def precision_at_k(ranked_ids: Sequence[int], relevant: set, k: int) -> float:
+    """Fraction of the top k results that are relevant"""
+    return sum(1 for i in ranked_ids[:k] if i in relevant) / k if k else 0.0
+
+
+def recall_at_k(ranked_ids: Sequence[int], relevant: set, k: int) -> float:
+    """Fraction of the relevant items found in the top k results"""
+    if not relevant:
+        return 0.0
+    return sum(1 for i in ranked_ids[:k] if i in relevant) / len(relevant)
+
+
+def ndcg_at_k(ranked_ids: Sequence[int], relevant: set, k: int) -> float:
+    """Normalized discounted cumulative gain with binary relevance"""
+    dcg = sum(1.0 / math.log2(rank + 2) for rank, i in enumerate(ranked_ids[:k]) if i in relevant)
+    ideal = sum(1.0 / math.log2(rank + 2) for rank in range(min(len(relevant), k)))
+    return dcg / ideal if ideal else 0.0
+
+
+def _init_worker(data_path: str, engine_options: Dict[str, Any]) -> None:
+    """Load the engine in a worker that did not inherit one"""
+    global _ENGINE
+    if _ENGINE is None:
+        _ENGINE = InternshipRecommendationEngine(data_path, **engine_options)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            _ENGINE.load_data()
+
+
+def _rank_chunk(profiles: List[Dict[str, Any]], k: int) -> List[Tuple[List[int], float]]:
+    """Rank a chunk of profiles, returning (ranked internship ids, latency seconds) per profile"""
+    engine = _ENGINE
+    results = []
+    for profile in profiles:
+        start = time.perf_counter()
+        rows = engine.get_recommendation_rows(
+            education=profile["education"],
+            skills=profile["skills"],
+            sectors=profile.get("sectors"),
+            location_state=profile.get("location_state"),
+            max_results=k
+        )
+        latency = time.perf_counter() - start
+        results.append(([engine.internships[idx]["id"] for idx, _, _ in rows], latency))
+    return results
+
+
+def evaluate(data_path: str, labeled_profiles: List[Dict[str, Any]], k: int = 5,
+             workers: Optional[int] = None, chunk_size: int = 64,
+             engine_options: Optional[Dict[str, Any]] = None,
+             engine: Optional[InternshipRecommendationEngine] = None) -> Dict[str, Any]:
+    """
+    Run labeled profiles through the engine in a process pool and score the rankings
+
+    Args:
+        data_path: Dataset the engine is built from
+        labeled_profiles: Profiles with relevant_ids (see load_profiles)
+        k: Cut-off for precision/recall/nDCG
+        workers: Pool size (defaults to the CPU count; 1 runs in-process)
+        chunk_size: Profiles per pool task
+        engine_options: Extra keyword arguments for InternshipRecommendationEngine
+        engine: Already loaded engine to reuse (shared with workers on fork)
+
+    Returns:
+        Report with quality metrics, throughput and latency percentiles
+    """
+    global _ENGINE
+    engine_options = {"exclude_expired": False, **(engine_options or {})}
+    workers = workers or os.cpu_count() or 1
+
+    build_start = time.perf_counter()
+    _ENGINE = engine
+    _init_worker(data_path, engine_options)
+    build_seconds = time.perf_counter() - build_start
+
+    profiles = [entry["profile"] for entry in labeled_profiles]
+    chunks = [profiles[i:i + chunk_size] for i in range(0, len(profiles), chunk_size)]
+
+    start = time.perf_counter()
+    if workers == 1:
+        ranked = [_rank_chunk(chunk, k) for chunk in chunks]
+    else:
+        # Fork shares the already built engine copy-on-write instead of rebuilding per worker
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method),
+                                 initializer=_init_worker, initargs=(data_path, engine_options)) as pool:
+            ranked = list(pool.map(_rank_chunk, chunks, [k] * len(chunks)))
+    wall_seconds = time.perf_counter() - start
+
+    results = [result for chunk in ranked for result in chunk]
+    precisions, recalls, ndcgs, latencies = [], [], [], []
+    for entry, (ranked_ids, latency) in zip(labeled_profiles, results):
+        relevant = set(entry["relevant_ids"])
+        precisions.append(precision_at_k(ranked_ids, relevant, k))
+        recalls.append(recall_at_k(ranked_ids, relevant, k))
+        ndcgs.append(ndcg_at_k(ranked_ids, relevant, k))
+        latencies.append(latency * 1000)
+
+    latencies = np.array(latencies) if latencies else np.zeros(1)
+    return {
+        "profiles": len(results),
+        "catalog_size": len(_ENGINE.internships),
+        "k": k,
+        f"precision@{k}": float(np.mean(precisions)) if precisions else 0.0,
+        f"recall@{k}": float(np.mean(recalls)) if recalls else 0.0,
+        f"ndcg@{k}": float(np.mean(ndcgs)) if ndcgs else 0.0,
+        "workers": workers,
+        "engine_build_seconds": round(build_seconds, 3),
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_per_second": round(len(results) / wall_seconds, 1) if wall_seconds else 0.0,
+        "latency_ms": {
+            "p50": round(float(np.percentile(latencies, 50)), 3),
+            "p95": round(float(np.percentile(latencies, 95)), 3),
+            "p99": round(float(np.percentile(latencies, 99)), 3),
+            "max": round(float(latencies.max()), 3),
+        },
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print an evaluation report"""
+    k = report["k"]
+    print(f"\n📊 Evaluation over {report['profiles']} profiles "
+          f"({report['catalog_size']} internships, {report['workers']} workers)")
+    print(f"  Precision@{k}: {report[f'precision@{k}']:.3f}")
+    print(f"  Recall@{k}:    {report[f'recall@{k}']:.3f}")
+    print(f"  nDCG@{k}:      {report[f'ndcg@{k}']:.3f}")
+    print(f"⚡ Throughput: {report['throughput_per_second']} profiles/s "
+          f"(wall {report['wall_seconds']}s, engine build {report['engine_build_seconds']}s)")
+    latency = report["latency_ms"]
+    print(f"⏱️ Latency ms: p50={latency['p50']} p95={latency['p95']} "
+          f"p99={latency['p99']} max={latency['max']}")
+
+
+# CLI interface for evaluation runs
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate recommendation quality and speed")
+    parser.add_argument("--data", default=os.path.join(os.path.dirname(__file__), "..", "data",
+                                                       "internships_dataset.json"))
+    parser.add_argument("--profiles", help="Labeled profiles (JSON array or NDJSON)")
+    parser.add_argument("--generate", type=int, default=500,
+                        help="Number of synthetic profiles when --profiles is not given")
+    parser.add_argument("--save-profiles", help="Write the evaluated profiles to this file")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    if args.profiles:
+        labeled = load_profiles(args.profiles)
+    else:
+        with open(args.data, "r", encoding="utf-8") as f:
+            labeled = generate_labeled_profiles(json.load(f), args.generate, args.seed)
+
+    if args.save_profiles:
+        with open(args.save_profiles, "w", encoding="utf-8") as f:
+            json.dump(labeled, f, ensure_ascii=False, indent=2)
+
+    evaluation = evaluate(args.data, labeled, k=args.k, workers=args.workers)
+    if args.json:
+        print(json.dumps(evaluation, indent=2))
+    else:
+        print_report(evaluation)
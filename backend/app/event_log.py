@@ -0,0 +1,310 @@
+# Append-only Interaction Event Log with Batched Background Writes
+# File: backend/app/event_log.py
+
+import asyncio
+import glob
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+# Event kinds (the code stored in each record is the index)
+EVENT_KINDS = ("impression", "view", "click", "application", "fill")
+IMPRESSION = 0
+
+# Fixed record schema; client events have position -1 and a NaN score
+EVENT_DTYPE = np.dtype([
+    ("timestamp", "<f8"),          # Unix time
+    ("kind", "u1"),                # Index into EVENT_KINDS
+    ("position", "<i2"),           # Rank the listing was shown at
+    ("internship_id", "<i8"),
+    ("score", "<f4"),              # Similarity score it was shown with
+    ("impression_id", "<u8"),      # Joins clicks and applications to the impression
+    ("user_key", "<u8"),           # Hash of the user id (0 = anonymous)
+    ("catalog_version", "<i4"),
+    ("weight_profile", "S16"),
+])
+
+SEGMENT_FORMATS = ("ndjson", "binary")
+_NDJSON_LINE = ('{"timestamp":%.6f,"kind":%s,"position":%d,"internship_id":%d,"score":%s,'
+                '"impression_id":%d,"user_key":%d,"catalog_version":%d,"weight_profile":%s}\n')
+_BINARY_MAGIC = b"IMEVENTS1\n"
+# Suffix of the segment being written; renamed away when the segment is rotated
+ACTIVE_SUFFIX = ".part"
+
+
+def user_key(user_id: Optional[str]) -> int:
+    """Stable 64-bit key for a user id, so raw ids never reach the log (0 when anonymous)"""
+    if not user_id:
+        return 0
+    return int.from_bytes(hashlib.blake2b(user_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def segment_files(directory: str) -> list:
+    """Completed segment files in a log directory, oldest first"""
+    return sorted(glob.glob(os.path.join(directory, "events-*.gz")))
+
+
+def read_segment(path: str) -> np.ndarray:
+    """
+    Load a segment file written by EventLog
+
+    Args:
+        path: .ndjson.gz or .events.gz segment (complete or still active)
+
+    Returns:
+        Structured array with EVENT_DTYPE records in write order
+    """
+    with gzip.open(path, "rb") as f:
+        payload = f.read()
+    if path.removesuffix(ACTIVE_SUFFIX).endswith(".events.gz"):
+        if not payload.startswith(_BINARY_MAGIC):
+            raise ValueError(f"Not an event segment: {path}")
+        return np.frombuffer(payload, dtype=EVENT_DTYPE, offset=len(_BINARY_MAGIC)).copy()
+
+    lines = payload.splitlines()
+    events = np.zeros(len(lines), dtype=EVENT_DTYPE)
+    for i, line in enumerate(lines):
+        record = json.loads(line)
+        record["kind"] = EVENT_KINDS.index(record["kind"])
+        record["weight_profile"] = record["weight_profile"].encode("utf-8")
+        record["score"] = np.nan if record["score"] is None else record["score"]
+        events[i] = tuple(record[name] for name in EVENT_DTYPE.names)
+    return events
+
+
+class EventLog:
+    """
+    Fixed-schema interaction events buffered in memory and written to disk in batches.
+
+    Request handlers append records to a preallocated ring buffer under a
+    lock held for a few microseconds; nothing on the request path touches
+    the disk or waits for a writer. A background task drains the buffer every
+    flush interval (sooner once it is half full) and appends each batch as
+    one gzip member to the active segment file, which is rotated by size or
+    age. When a burst outruns the writer, new events are dropped and counted
+    rather than blocking requests.
+    """
+
+    def __init__(self, directory: str, segment_format: str = "ndjson", capacity: int = 65536,
+                 segment_bytes: int = 64 << 20, segment_seconds: float = 3600.0, compress_level: int = 1):
+        """
+        Initialize the log
+
+        Args:
+            directory: Directory segment files are written to (created if missing)
+            segment_format: "ndjson" (one JSON object per line) or "binary" (raw EVENT_DTYPE records)
+            capacity: Events the ring buffer holds between flushes
+            segment_bytes: Rotate the active segment once its compressed size reaches this
+            segment_seconds: Rotate the active segment once it is this old
+            compress_level: gzip level for each batch (1 favours speed)
+        """
+        if segment_format not in SEGMENT_FORMATS:
+            raise ValueError(f"Unsupported event segment format: {segment_format}")
+
+        self.directory = directory
+        self.segment_format = segment_format
+        self.capacity = capacity
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.compress_level = compress_level
+
+        self._buffer = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self._start = 0
+        self._count = 0
+        self._lock = threading.Lock()
+        # Serializes flushes (draining and segment writes) without holding up appends
+        self._write_lock = threading.Lock()
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._segment_path: Optional[str] = None
+        self._segment_opened = 0.0
+        self._segment_sequence = 0
+
+        self.appended = self.dropped = self.written = self.flushes = self.segments = 0
+        self.last_flush_error: Optional[str] = None
+
+    def append(self, kind: int, internship_ids: Sequence[int], scores: Optional[Sequence[float]] = None,
+               impression_id: int = 0, user: int = 0, catalog_version: int = 0,
+               weight_profile: str = "") -> int:
+        """
+        Buffer one event per internship (never blocks on I/O)
+
+        Args:
+            kind: Index into EVENT_KINDS
+            internship_ids: Internships the event applies to, in rank order for impressions
+            scores: Scores the internships were shown with (impressions only)
+            impression_id: Id returned with the recommendations the event refers to
+            user: user_key() of the user
+            catalog_version: Catalog snapshot version that ranked the internships
+            weight_profile: Weight profile that ranked them
+
+        Returns:
+            Number of events buffered (the rest were dropped because the buffer is full)
+        """
+        count = len(internship_ids)
+        records = np.empty(count, dtype=EVENT_DTYPE)
+        records["timestamp"] = time.time()
+        records["kind"] = kind
+        records["position"] = np.arange(count) if kind == IMPRESSION else -1
+        records["internship_id"] = internship_ids
+        records["score"] = np.nan if scores is None else scores
+        records["impression_id"] = impression_id
+        records["user_key"] = user
+        records["catalog_version"] = catalog_version
+        records["weight_profile"] = weight_profile.encode("utf-8")[:16]
+
+        with self._lock:
+            kept = min(count, self.capacity - self._count)
+            end = (self._start + self._count) % self.capacity
+            first = min(kept, self.capacity - end)
+            self._buffer[end:end + first] = records[:first]
+            self._buffer[:kept - first] = records[first:kept]
+            self._count += kept
+            self.appended += kept
+            self.dropped += count - kept
+            backlog = self._count
+        if backlog * 2 >= self.capacity and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        return kept
+
+    def _drain(self) -> np.ndarray:
+        """Take every buffered event, oldest first"""
+        with self._lock:
+            end = self._start + self._count
+            if end <= self.capacity:
+                batch = self._buffer[self._start:end].copy()
+            else:
+                batch = np.concatenate((self._buffer[self._start:], self._buffer[:end - self.capacity]))
+            self._start = end % self.capacity
+            self._count = 0
+        return batch
+
+    def _encode(self, batch: np.ndarray) -> bytes:
+        """Serialize a batch in the segment format"""
+        if self.segment_format == "binary":
+            return batch.tobytes()
+        # Format the columns in bulk; only the few distinct strings go through json.dumps
+        kinds = [json.dumps(kind) for kind in EVENT_KINDS]
+        profiles = {profile: json.dumps(profile.decode("utf-8")) for profile in np.unique(batch["weight_profile"])}
+        scores = np.char.mod("%.6g", batch["score"]).tolist()
+        lines = [
+            _NDJSON_LINE % (timestamp, kinds[kind], position, internship_id,
+                            "null" if score == "nan" else score, impression_id, user, version, profiles[profile])
+            for timestamp, kind, position, internship_id, score, impression_id, user, version, profile in zip(
+                batch["timestamp"].tolist(), batch["kind"].tolist(), batch["position"].tolist(),
+                batch["internship_id"].tolist(), scores, batch["impression_id"].tolist(),
+                batch["user_key"].tolist(), batch["catalog_version"].tolist(), batch["weight_profile"].tolist()
+            )
+        ]
+        return "".join(lines).encode("utf-8")
+
+    def _rotate(self) -> None:
+        """Close the active segment, making it visible to readers"""
+        if self._segment_path is None:
+            return
+        os.replace(self._segment_path, self._segment_path[:-len(ACTIVE_SUFFIX)])
+        self._segment_path = None
+        self.segments += 1
+
+    def _segment(self, now: float) -> str:
+        """Path of the active segment, rotating it first when it is too large or too old"""
+        if self._segment_path is not None and (
+                os.path.getsize(self._segment_path) >= self.segment_bytes
+                or now - self._segment_opened >= self.segment_seconds):
+            self._rotate()
+        if self._segment_path is None:
+            os.makedirs(self.directory, exist_ok=True)
+            extension = "events.gz" if self.segment_format == "binary" else "ndjson.gz"
+            stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(now))
+            # The pid keeps segments of pre-forked workers apart
+            name = f"events-{stamp}-{os.getpid()}-{self._segment_sequence:04d}.{extension}{ACTIVE_SUFFIX}"
+            self._segment_path = os.path.join(self.directory, name)
+            self._segment_opened = now
+            self._segment_sequence += 1
+            if self.segment_format == "binary":
+                with open(self._segment_path, "ab") as f:
+                    f.write(gzip.compress(_BINARY_MAGIC, self.compress_level))
+        return self._segment_path
+
+    def flush(self, close: bool = False) -> int:
+        """
+        Write every buffered event to the active segment (runs off the event loop)
+
+        Args:
+            close: Also rotate the active segment (on shutdown)
+
+        Returns:
+            Number of events written
+        """
+        with self._write_lock:
+            batch = self._drain()
+            try:
+                if len(batch):
+                    # Concatenated gzip members form one valid gzip stream
+                    member = gzip.compress(self._encode(batch), self.compress_level)
+                    with open(self._segment(time.time()), "ab") as f:
+                        f.write(member)
+                    self.written += len(batch)
+                    self.flushes += 1
+                if close:
+                    self._rotate()
+            except OSError as e:
+                self.dropped += len(batch)
+                self.last_flush_error = str(e)
+                print(f"❌ Error writing event log segment: {e}")
+                return 0
+            return len(batch)
+
+    async def run(self, interval: float, runner: Callable[[Callable[[], int]], Awaitable[int]]) -> None:
+        """
+        Flush every interval seconds, or as soon as the buffer is half full
+
+        Args:
+            interval: Seconds between flushes
+            runner: Runs a blocking callable off the event loop (e.g. a scheduler lane)
+        """
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await runner(self.flush)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_flush_error = str(e)
+
+    def pending(self) -> int:
+        """Events buffered but not yet written"""
+        return self._count
+
+    def segment_files(self) -> list:
+        """Completed segment files, oldest first"""
+        return segment_files(self.directory)
+
+    def stats(self) -> Dict[str, Any]:
+        """Buffer occupancy and write counters for this process"""
+        return {
+            "directory": self.directory,
+            "format": self.segment_format,
+            "capacity": self.capacity,
+            "pending": self._count,
+            "appended": self.appended,
+            "dropped": self.dropped,
+            "written": self.written,
+            "flushes": self.flushes,
+            "segments_completed": self.segments,
+            "active_segment": self._segment_path,
+            "last_flush_error": self.last_flush_error,
+        }
@@ -0,0 +1,283 @@
+# Live Seat, Application and View Counters per Listing
+# File: backend/app/listing_counters.py
+
+import fcntl
+import os
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+# Counter columns
+SEATS, APPLICATIONS, VIEWS = 0, 1, 2
+COLUMNS = ("seats", "applications", "views")
+
+# Remaining seats of a listing nobody has set a seat count for (never penalized)
+UNKNOWN_SEATS = -1
+
+# Segment header: magic, capacity
+_HEADER = struct.Struct("<8sQ")
+_HEADER_SIZE = 64
+_MAGIC = b"IMCOUNT1"
+
+# Writers lock one of this many stripes of internship ids
+LOCK_STRIPES = 64
+
+
+def congestion_penalty(seats: np.ndarray, applications: np.ndarray,
+                       weight: float, saturation: float = 5.0) -> np.ndarray:
+    """
+    Score penalty per listing from its remaining seats and application volume
+
+    Listings with applications up to their remaining seats get no penalty;
+    beyond that it grows linearly and reaches the full weight at saturation
+    applications per seat. A listing with no seats left gets the full weight,
+    and one whose seats were never set (UNKNOWN_SEATS) gets none.
+
+    Args:
+        seats: Remaining seats per listing
+        applications: Applications per listing
+        weight: Penalty of a full or saturated listing
+        saturation: Applications per remaining seat at which the penalty is full (> 1)
+
+    Returns:
+        Non-negative penalty per listing
+    """
+    pressure = applications / np.maximum(seats, 1)
+    penalty = weight * np.clip((pressure - 1.0) / (saturation - 1.0), 0.0, 1.0)
+    penalty[seats == 0] = weight
+    penalty[seats < 0] = 0.0
+    return penalty
+
+
+class ListingCounters:
+    """
+    Array-backed counters keyed by internship id: remaining seats, applications and views.
+
+    The counters are one int64 array of shape (3, capacity), either private to
+    the process or in a named shared-memory segment every worker on the host
+    attaches to. Keying by id (not catalog row) keeps counts valid across
+    catalog reloads; the engine gathers them for its rows with one fancy index.
+    Readers never lock: aligned int64 loads are never torn, at worst a moment
+    stale, so scoring does not contend with updates. Writers lock one of
+    LOCK_STRIPES stripes of ids (a thread lock, plus an fcntl byte-range lock
+    across processes for shared memory), so increments to different stripes
+    proceed in parallel. fcntl locks belong to the process, so use one instance
+    per process (forked workers may share the one they inherit).
+    """
+
+    def __init__(self, capacity: int = 1 << 18, name: Optional[str] = None):
+        """
+        Create the counters, or attach to an existing shared segment
+
+        Args:
+            capacity: Internship ids 0..capacity-1 can be counted
+            name: Shared-memory segment name (None = private to this process)
+        """
+        self.capacity = capacity
+        self.name = name
+        # Whether this process created the counters (only the creator restores a snapshot)
+        self.created = True
+        size = _HEADER_SIZE + len(COLUMNS) * capacity * 8
+
+        if name is None:
+            self._shm = None
+            buffer = bytearray(size)
+        else:
+            try:
+                self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            except FileExistsError:
+                self._shm = shared_memory.SharedMemory(name=name)
+                self.created = False
+            # The segment outlives any single worker; unlink() removes it explicitly
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+            buffer = self._shm.buf
+
+        self.values = np.ndarray((len(COLUMNS), capacity), dtype=np.int64, buffer=buffer, offset=_HEADER_SIZE)
+        if self.created:
+            self.values[SEATS] = UNKNOWN_SEATS
+            _HEADER.pack_into(buffer, 0, _MAGIC, capacity)
+        else:
+            # The creating worker may not have written the header yet
+            for _ in range(100):
+                magic, existing_capacity = _HEADER.unpack_from(buffer, 0)
+                if magic != bytes(len(_MAGIC)):
+                    break
+                time.sleep(0.01)
+            if (magic, existing_capacity) != (_MAGIC, capacity):
+                self.values = None
+                self._shm.close()
+                raise ValueError(f"Shared counters '{name}' exist with a different layout; unlink them first")
+
+        self._thread_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self._lock_fd = None
+        if name is not None:
+            self._lock_fd = os.open(
+                os.path.join(tempfile.gettempdir(), f"{name}.lock"), os.O_RDWR | os.O_CREAT, 0o600
+            )
+        self.updates = self.rejected = 0
+        self.snapshot_at: Optional[float] = None
+
+    @contextmanager
+    def _locked(self, stripe: int):
+        """Hold one stripe's locks"""
+        with self._thread_locks[stripe]:
+            if self._lock_fd is None:
+                yield
+                return
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_EX, 1, stripe)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, stripe)
+
+    def _valid_ids(self, ids: Iterable[int]) -> np.ndarray:
+        ids = np.asarray(list(ids) if not isinstance(ids, np.ndarray) else ids, dtype=np.int64)
+        valid = (ids >= 0) & (ids < self.capacity)
+        self.rejected += int((~valid).sum())
+        return ids[valid]
+
+    def add(self, column: int, ids: Iterable[int], amount: int = 1) -> int:
+        """
+        Add amount to a counter of each id (repeated ids are added repeatedly)
+
+        Args:
+            column: APPLICATIONS or VIEWS
+            ids: Internship ids
+            amount: Increment per occurrence
+
+        Returns:
+            Number of ids counted (ids outside the capacity are skipped)
+        """
+        ids = self._valid_ids(ids)
+        row = self.values[column]
+        stripes = ids % LOCK_STRIPES
+        for stripe in np.unique(stripes):
+            stripe_ids = ids[stripes == stripe]
+            with self._locked(int(stripe)):
+                np.add.at(row, stripe_ids, amount)
+        self.updates += len(ids)
+        return len(ids)
+
+    def fill_seats(self, ids: Iterable[int]) -> int:
+        """
+        Take one remaining seat of each id (listings with unknown or no seats left are unchanged)
+
+        Returns:
+            Number of seats taken
+        """
+        ids = self._valid_ids(ids)
+        seats = self.values[SEATS]
+        taken = 0
+        unique_ids, counts = np.unique(ids, return_counts=True)
+        stripes = unique_ids % LOCK_STRIPES
+        for stripe in np.unique(stripes):
+            in_stripe = stripes == stripe
+            stripe_ids, stripe_counts = unique_ids[in_stripe], counts[in_stripe]
+            with self._locked(int(stripe)):
+                current = seats[stripe_ids]
+                take = np.where(current > 0, np.minimum(current, stripe_counts), 0)
+                seats[stripe_ids] = current - take
+            taken += int(take.sum())
+        self.updates += taken
+        return taken
+
+    def set_seats(self, seats: Dict[int, int]) -> int:
+        """
+        Set the remaining seats of listings (UNKNOWN_SEATS clears a count)
+
+        Returns:
+            Number of listings updated
+        """
+        updated = 0
+        for internship_id, count in seats.items():
+            internship_id = int(internship_id)
+            if not 0 <= internship_id < self.capacity:
+                self.rejected += 1
+                continue
+            with self._locked(internship_id % LOCK_STRIPES):
+                self.values[SEATS, internship_id] = max(int(count), UNKNOWN_SEATS)
+            updated += 1
+        self.updates += updated
+        return updated
+
+    def gather(self, ids: np.ndarray) -> np.ndarray:
+        """
+        Lock-free read of the counters of many ids
+
+        Returns:
+            Array of shape (3, len(ids)); ids outside the capacity read as unknown seats and zero counts
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        valid = (ids >= 0) & (ids < self.capacity)
+        if valid.all():
+            return self.values[:, ids]
+        result = np.zeros((len(COLUMNS), len(ids)), dtype=np.int64)
+        result[SEATS] = UNKNOWN_SEATS
+        result[:, valid] = self.values[:, ids[valid]]
+        return result
+
+    def get(self, internship_id: int) -> Dict[str, int]:
+        """Counters of one listing"""
+        values = self.gather(np.array([internship_id]))[:, 0]
+        return dict(zip(COLUMNS, (int(value) for value in values)))
+
+    def snapshot(self, path: str) -> None:
+        """Write the counters to disk atomically (a consistent-enough copy; readers are not paused)"""
+        # Per-process temp file: workers sharing one segment may snapshot at the same time
+        temp_path = f"{path}.{os.getpid()}.tmp.npy"
+        np.save(temp_path, self.values.copy())
+        os.replace(temp_path, path)
+        self.snapshot_at = time.time()
+
+    def restore(self, path: str) -> bool:
+        """Load counters saved by snapshot() (ids beyond this capacity are dropped)"""
+        if not os.path.exists(path):
+            return False
+        saved = np.load(path)
+        width = min(saved.shape[1], self.capacity)
+        self.values[:, :width] = saved[:, :width]
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Totals over all listings plus this process's update counters"""
+        seats = self.values[SEATS]
+        return {
+            "backend": "shared" if self.name else "local",
+            "capacity": self.capacity,
+            "listings_with_seats": int((seats >= 0).sum()),
+            "full_listings": int((seats == 0).sum()),
+            "applications": int(self.values[APPLICATIONS].sum()),
+            "views": int(self.values[VIEWS].sum()),
+            "updates": self.updates,
+            "rejected": self.rejected,
+            "snapshot_at": self.snapshot_at,
+        }
+
+    def close(self) -> None:
+        """Detach this process from the segment"""
+        self.values = None
+        if self._shm is not None:
+            self._shm.close()
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+
+    def unlink(self) -> None:
+        """Remove the shared segment and its lock file (no-op for local counters)"""
+        if self._shm is None:
+            return
+        try:
+            # unlink() unregisters from the resource tracker, which __init__ already did
+            resource_tracker.register(self._shm._name, "shared_memory")
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        try:
+            os.unlink(os.path.join(tempfile.gettempdir(), f"{self.name}.lock"))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,330 @@
+# Async Load Generator Replaying Realistic Student Traffic
+# File: backend/app/loadtest.py
+#
+# Usage (from backend/):
+#   python -m app.loadtest --in-process --concurrency 32 --duration 20
+#   python -m app.loadtest --url http://127.0.0.1:8000 --rps 200 --duration 60
+#   python -m app.loadtest --url http://127.0.0.1:8000 --rps 40 --duration 30 --bulk-batch-size 100
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from app.data_processor import InternshipDataProcessor
+from app.models import EducationLevel, SectorType
+
+# Latency histogram bucket upper bounds in milliseconds
+HISTOGRAM_BOUNDS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class TrafficModel:
+    """
+    Synthesizes RecommendationRequest payloads from the catalog generator's
+    sector configuration.
+
+    A fixed pool of distinct student profiles is drawn from each sector's
+    education levels, skills and cities; requests pick profiles with
+    Zipf-skewed popularity so a few combinations dominate, as on results day.
+    """
+
+    def __init__(self, profiles: int = 500, zipf_s: float = 1.1, seed: int = 42,
+                 time_budget_ms: Optional[int] = None):
+        """
+        Args:
+            profiles: Number of distinct student profiles
+            zipf_s: Zipf exponent for profile popularity (0 = uniform)
+            seed: Random seed
+            time_budget_ms: Latency budget sent with every request (optional)
+        """
+        self.rng = random.Random(seed)
+        processor = InternshipDataProcessor()
+        config = processor.sectors_config
+        education_levels = {level.value for level in EducationLevel}
+        sector_names = [name for name in config if name in {sector.value for sector in SectorType}]
+
+        self.pool: List[Dict[str, Any]] = []
+        for _ in range(profiles):
+            sector = self.rng.choice(sector_names)
+            sector_config = config[sector]
+            education = [e for e in sector_config["education"] if e in education_levels]
+            payload: Dict[str, Any] = {
+                "education": self.rng.choice(education),
+                "skills": self.rng.sample(sector_config["skills"], self.rng.randint(2, 4)),
+                "max_results": self.rng.choice((5, 5, 5, 10)),
+            }
+            if self.rng.random() < 0.7:
+                payload["sectors"] = [sector]
+            if self.rng.random() < 0.5:
+                city = self.rng.choice(sector_config["locations"])
+                payload["location_state"] = processor._get_state_for_city(city)
+            if time_budget_ms:
+                payload["time_budget_ms"] = time_budget_ms
+            self.pool.append(payload)
+
+        weights = [1.0 / (rank + 1) ** zipf_s for rank in range(profiles)]
+        total = sum(weights)
+        self.cumulative = np.cumsum([w / total for w in weights])
+
+    def sample(self) -> Dict[str, Any]:
+        """Next request payload"""
+        index = int(np.searchsorted(self.cumulative, self.rng.random(), side="right"))
+        return self.pool[min(index, len(self.pool) - 1)]
+
+
+class LoadResult:
+    """Latencies and outcomes of a load test run"""
+
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.statuses: Dict[str, int] = {}
+        self.partial = 0
+        self.started = time.perf_counter()
+        self.finished = self.started
+
+    def record(self, status: str, latency_ms: float) -> None:
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.latencies_ms.append(latency_ms)
+
+    def report(self) -> Dict[str, Any]:
+        """Throughput, error rate, latency percentiles and histogram"""
+        total = len(self.latencies_ms)
+        duration = max(self.finished - self.started, 1e-9)
+        errors = sum(count for status, count in self.statuses.items() if status != "200")
+        latencies = np.array(self.latencies_ms) if total else np.zeros(1)
+
+        histogram, lower = [], 0
+        for bound in HISTOGRAM_BOUNDS + (math.inf,):
+            count = int(((latencies > lower) & (latencies <= bound)).sum()) if total else 0
+            histogram.append({"le_ms": None if bound == math.inf else bound, "count": count})
+            lower = bound
+
+        return {
+            "requests": total,
+            "duration_seconds": round(duration, 3),
+            "throughput_rps": round(total / duration, 1),
+            "error_rate": errors / total if total else 0.0,
+            "statuses": self.statuses,
+            "partial_rate": self.partial / total if total else 0.0,
+            "latency_ms": {
+                "mean": round(float(latencies.mean()), 3),
+                "p50": round(float(np.percentile(latencies, 50)), 3),
+                "p90": round(float(np.percentile(latencies, 90)), 3),
+                "p95": round(float(np.percentile(latencies, 95)), 3),
+                "p99": round(float(np.percentile(latencies, 99)), 3),
+                "max": round(float(latencies.max()), 3),
+            },
+            "histogram": histogram,
+        }
+
+
+async def _send(client: httpx.AsyncClient, payload: Dict[str, Any], result: LoadResult,
+                scheduled: Optional[float] = None) -> None:
+    """Send one request; open-loop latency counts from the scheduled start"""
+    start = scheduled if scheduled is not None else time.perf_counter()
+    try:
+        response = await client.post("/api/recommend", json=payload, headers={"Accept-Encoding": "gzip"})
+        status = str(response.status_code)
+        if response.headers.get("x-partial-results") == "true":
+            result.partial += 1
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    result.record(status, (time.perf_counter() - start) * 1000)
+
+
+async def run_concurrency(client: httpx.AsyncClient, traffic: TrafficModel, concurrency: int,
+                          duration: float, max_requests: Optional[int] = None) -> LoadResult:
+    """Closed loop: `concurrency` virtual students each send back-to-back requests"""
+    result = LoadResult()
+    deadline = result.started + duration
+    sent = 0
+
+    async def student():
+        nonlocal sent
+        while time.perf_counter() < deadline and (max_requests is None or sent < max_requests):
+            sent += 1
+            await _send(client, traffic.sample(), result)
+
+    await asyncio.gather(*(student() for _ in range(concurrency)))
+    result.finished = time.perf_counter()
+    return result
+
+
+async def run_rate(client: httpx.AsyncClient, traffic: TrafficModel, rps: float,
+                   duration: float, max_in_flight: int = 1000) -> LoadResult:
+    """
+    Open loop: start requests at a fixed arrival rate regardless of response times
+
+    Latency is measured from each request's scheduled start, so a slow server
+    shows up as queueing delay instead of a silently lower request rate.
+    """
+    result = LoadResult()
+    in_flight = asyncio.Semaphore(max_in_flight)
+    tasks = []
+
+    async def fire(payload, scheduled):
+        async with in_flight:
+            await _send(client, payload, result, scheduled)
+
+    for i in range(int(rps * duration)):
+        scheduled = result.started + i / rps
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(fire(traffic.sample(), scheduled)))
+
+    await asyncio.gather(*tasks)
+    result.finished = time.perf_counter()
+    return result
+
+
+async def run_bulk(client: httpx.AsyncClient, traffic: TrafficModel, batch_size: int,
+                   jobs: int, stop: asyncio.Event) -> Dict[str, Any]:
+    """
+    Bulk job running alongside the interactive load: `jobs` clients post
+    /api/recommend/batch requests back-to-back until stop is set
+    """
+    latencies, profiles, errors = [], 0, 0
+    started = time.perf_counter()
+
+    async def job():
+        nonlocal profiles, errors
+        while not stop.is_set():
+            batch = {"requests": [traffic.sample() for _ in range(batch_size)]}
+            start = time.perf_counter()
+            try:
+                response = await client.post("/api/recommend/batch", json=batch, timeout=300.0)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            latencies.append((time.perf_counter() - start) * 1000)
+            if ok:
+                profiles += batch_size
+            else:
+                errors += 1
+
+    await asyncio.gather(*(job() for _ in range(jobs)))
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    return {
+        "batches": len(latencies),
+        "batch_size": batch_size,
+        "errors": errors,
+        "profiles_per_second": round(profiles / elapsed, 1),
+        "mean_batch_ms": round(float(np.mean(latencies)), 1) if latencies else 0.0,
+    }
+
+
+def in_process_client() -> httpx.AsyncClient:
+    """Client bound to the FastAPI app through ASGI, with the engine loaded and warmed"""
+    from app.main import app, engine_manager, initialize
+
+    # ASGITransport does not run lifespan events
+    initialize()
+    engine_manager.ensure_warm()
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest")
+
+
+async def load_test(url: Optional[str] = None, concurrency: int = 16, rps: Optional[float] = None,
+                    duration: float = 10.0, max_requests: Optional[int] = None,
+                    traffic: Optional[TrafficModel] = None, bulk_batch_size: int = 0,
+                    bulk_jobs: int = 1) -> Dict[str, Any]:
+    """
+    Drive /api/recommend and return the report, optionally with a bulk job running alongside
+
+    Args:
+        url: Base URL of a running server (None = in-process ASGI transport)
+        concurrency: Virtual students for closed-loop runs
+        rps: Target arrival rate (switches to an open-loop run)
+        duration: Seconds to run
+        max_requests: Stop closed-loop runs after this many requests
+        traffic: Payload generator (defaults to TrafficModel())
+        bulk_batch_size: Profiles per /api/recommend/batch request (0 = no bulk job)
+        bulk_jobs: Concurrent bulk clients
+    """
+    traffic = traffic or TrafficModel()
+    if url:
+        limits = httpx.Limits(max_connections=max(concurrency, 100))
+        client = httpx.AsyncClient(base_url=url, timeout=30.0, limits=limits)
+    else:
+        client = in_process_client()
+
+    async with client:
+        stop = asyncio.Event()
+        bulk = None
+        if bulk_batch_size:
+            bulk = asyncio.ensure_future(run_bulk(client, traffic, bulk_batch_size, bulk_jobs, stop))
+        try:
+            if rps:
+                result = await run_rate(client, traffic, rps, duration)
+            else:
+                result = await run_concurrency(client, traffic, concurrency, duration, max_requests)
+        finally:
+            stop.set()
+        bulk_report = await bulk if bulk is not None else None
+
+    report = result.report()
+    if bulk_report is not None:
+        report["bulk"] = bulk_report
+    report["mode"] = f"open loop {rps} rps" if rps else f"closed loop, concurrency {concurrency}"
+    report["target"] = url or "in-process ASGI"
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a load test report with a text latency histogram"""
+    print(f"\n🚦 Load test against {report['target']} ({report['mode']})")
+    print(f"  Requests: {report['requests']} in {report['duration_seconds']}s "
+          f"→ {report['throughput_rps']} req/s")
+    print(f"  Error rate: {report['error_rate']:.2%}  statuses: {report['statuses']}  "
+          f"partial: {report['partial_rate']:.2%}")
+    latency = report["latency_ms"]
+    print(f"⏱️ Latency ms: mean={latency['mean']} p50={latency['p50']} p90={latency['p90']} "
+          f"p95={latency['p95']} p99={latency['p99']} max={latency['max']}")
+    if "bulk" in report:
+        bulk = report["bulk"]
+        print(f"📦 Bulk job: {bulk['batches']} batches of {bulk['batch_size']} "
+              f"→ {bulk['profiles_per_second']} profiles/s, mean batch {bulk['mean_batch_ms']} ms, "
+              f"errors {bulk['errors']}")
+
+    peak = max((bucket["count"] for bucket in report["histogram"]), default=0) or 1
+    for bucket in report["histogram"]:
+        label = "inf" if bucket["le_ms"] is None else f"{bucket['le_ms']:g}"
+        bar = "█" * int(40 * bucket["count"] / peak)
+        print(f"  ≤ {label:>5} ms {bucket['count']:>7} {bar}")
+
+
+# CLI interface for load tests
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay realistic student traffic against the API")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Base URL of a running server, e.g. http://127.0.0.1:8000")
+    target.add_argument("--in-process", action="store_true", help="Drive the app through ASGI in this process")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rps", type=float, help="Target requests per second (open loop)")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--requests", type=int, help="Stop after this many requests (closed loop)")
+    parser.add_argument("--profiles", type=int, default=500)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--time-budget-ms", type=int, help="Latency budget sent with every request")
+    parser.add_argument("--bulk-batch-size", type=int, default=0,
+                        help="Run a bulk job alongside, posting batches of this many profiles")
+    parser.add_argument("--bulk-jobs", type=int, default=1, help="Concurrent bulk clients")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    load_report = asyncio.run(load_test(
+        url=args.url, concurrency=args.concurrency, rps=args.rps, duration=args.duration,
+        max_requests=args.requests, traffic=TrafficModel(args.profiles, args.zipf, args.seed, args.time_budget_ms),
+        bulk_batch_size=args.bulk_batch_size, bulk_jobs=args.bulk_jobs
+    ))
+    if args.json:
+        print(json.dumps(load_report, indent=2))
+    else:
+        print_report(load_report)
@@ -1,15 +1,34 @@
 # PM Internship Recommendation Engine - FastAPI Backend
 # File: backend/app/main.py
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
+import asyncio
+import functools
 import json
 import os
-from app.recommendation_engine import InternshipRecommendationEngine
-from app.models import RecommendationRequest, InternshipResponse
+import random
+import time
+from datetime import date
+from app.engine_manager import EngineManager
+from app.event_log import EVENT_KINDS, IMPRESSION, EventLog, user_key
+from app.listing_counters import APPLICATIONS, VIEWS, ListingCounters
+from app.coalescing import SingleFlight
+from app.collaborative import CollaborativeModel
+from app.compression import compressed_response
+from app.memory_report import process_memory
+from app.result_cache import LocalResultCache, SharedResultCache
+from app.scheduling import BULK, INTERACTIVE, LaneFull, LaneScheduler
+from app.student_index import StudentPool
+from app.weight_profiles import WeightProfileRegistry
+from app.models import (
+    RecommendationRequest, BatchRecommendationRequest, InternshipResponse, ReloadRequest,
+    SectorsResponse, LocationsResponse, SkillsResponse, StatsResponse, CandidateStudentsResponse,
+    ListingEvent, ListingEventsRequest, SeatsRequest
+)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -29,22 +48,259 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize recommendation engine
-recommendation_engine = None
+# Live seat, application and view counters per listing: "shared" (one shared-memory
+# array for every worker on the host), "local" (private to the process) or "off".
+# "local" is for single-process servers only: with several workers each would count
+# part of the traffic and overwrite the others' snapshots, so gunicorn.conf.py
+# defaults to "shared" (set it explicitly for uvicorn --workers).
+# The counters are allocated by initialize(), not at import, so importing the app
+# (tools, tests, the gunicorn config) never creates or attaches a shared segment.
+LISTING_COUNTERS_MODE = os.environ.get("LISTING_COUNTERS", "local").lower()
+listing_counters: Optional[ListingCounters] = None
+
+def open_listing_counters() -> Optional[ListingCounters]:
+    """Allocate (or attach to) this process's listing counters on first use; None when disabled"""
+    global listing_counters
+    if listing_counters is None and LISTING_COUNTERS_MODE in ("shared", "local"):
+        listing_counters = ListingCounters(
+            capacity=int(os.environ.get("LISTING_COUNTERS_CAPACITY", str(1 << 18))),
+            name=(os.environ.get("LISTING_COUNTERS_NAME", "intern_mitra_counters")
+                  if LISTING_COUNTERS_MODE == "shared" else None)
+        )
+    return listing_counters
+
+# Runtime state written by the server (counter snapshots), kept apart from the
+# catalog and model files in data/
+STATE_DIR = os.environ.get("STATE_DIR", os.path.join(os.path.dirname(__file__), "..", "state"))
+# Counters are snapshotted here every COUNTER_SNAPSHOT_INTERVAL seconds (0 disables) and
+# restored on startup
+LISTING_COUNTERS_PATH = os.environ.get("LISTING_COUNTERS_PATH", os.path.join(STATE_DIR, "listing_counters.npy"))
+COUNTER_SNAPSHOT_INTERVAL = float(os.environ.get("COUNTER_SNAPSHOT_INTERVAL", "30"))
+
+# Score penalty for full or oversubscribed listings (0 disables it). Cached results keep
+# the penalty they were ranked with until RESULT_CACHE_TTL expires them.
+CONGESTION_PENALTY_WEIGHT = float(os.environ.get("CONGESTION_PENALTY_WEIGHT", "0"))
+CONGESTION_SATURATION = float(os.environ.get("CONGESTION_SATURATION", "5"))
+CONGESTION_REFRESH_SECONDS = float(os.environ.get("CONGESTION_REFRESH_SECONDS", "1"))
+
+# Optional collaborative model trained from the event log (python -m app.collaborative);
+# it only affects weight profiles with a non-zero 'collaborative' weight
+COLLABORATIVE_MODEL_PATH = os.environ.get(
+    "COLLABORATIVE_MODEL_PATH",
+    os.path.join(os.path.dirname(__file__), "..", "data", "collaborative_model.npz")
+)
+# Seconds between checks for a retrained model, attached to the serving engine when found (0 disables)
+COLLABORATIVE_WATCH_INTERVAL = float(os.environ.get("COLLABORATIVE_WATCH_INTERVAL", "5"))
+_collaborative_model = {"mtime": None, "model": None}
+
+def load_collaborative_model():
+    """The collaborative model, re-read when its file changes (None if there is none)"""
+    try:
+        mtime = os.stat(COLLABORATIVE_MODEL_PATH).st_mtime
+    except OSError:
+        return None
+    if mtime != _collaborative_model["mtime"]:
+        model = CollaborativeModel.load(COLLABORATIVE_MODEL_PATH)
+        _collaborative_model.update(mtime=mtime, model=model)
+        print(f"🤝 Loaded collaborative model: {len(model.user_keys)} users, "
+              f"{len(model.item_ids)} listings, {model.factors} factors")
+    return _collaborative_model["model"]
+
+def refresh_collaborative_model() -> bool:
+    """Attach a retrained (or removed) collaborative model to the serving engine; True when it changed"""
+    model = load_collaborative_model()
+    snapshot = engine_manager.current
+    if snapshot is None or snapshot.engine.collaborative is model:
+        return False
+    snapshot.engine.attach_collaborative(model)
+    return True
+
+def configure_engine(engine):
+    """Attach this process's listing counters, congestion settings and collaborative model to a new engine"""
+    engine.listing_counters = listing_counters
+    engine.congestion_weight = CONGESTION_PENALTY_WEIGHT
+    engine.congestion_saturation = CONGESTION_SATURATION
+    engine.congestion_refresh_seconds = CONGESTION_REFRESH_SECONDS
+    engine.attach_collaborative(load_collaborative_model())
+
+# Recommendation engine snapshots (swapped atomically on reload)
+engine_manager = EngineManager(
+    data_path=os.environ.get(
+        "INTERNSHIP_DATA_PATH",
+        os.path.join(os.path.dirname(__file__), "..", "data", "internships_dataset.json")
+    ),
+    build_mode=os.environ.get("ENGINE_RELOAD_MODE", "process"),
+    watch_interval=float(os.environ.get("ENGINE_WATCH_INTERVAL", "5")),
+    # Hiding listings past their deadline is opt-in (EXCLUDE_EXPIRED_LISTINGS=true): the
+    # bundled sample dataset's deadlines have all passed
+    engine_options={
+        "exclude_expired": os.environ.get("EXCLUDE_EXPIRED_LISTINGS", "false").lower() in ("1", "true", "yes")
+    },
+    warm_up=os.environ.get("ENGINE_WARMUP", "true").lower() in ("1", "true", "yes"),
+    configure=configure_engine
+)
+
+# Named scoring weight profiles and experiment assignment
+weight_profiles = WeightProfileRegistry.from_engine_defaults()
+WEIGHT_PROFILES_PATH = os.environ.get(
+    "WEIGHT_PROFILES_PATH",
+    os.path.join(os.path.dirname(__file__), "..", "data", "weight_profiles.json")
+)
+
+# Separate execution lanes: student-facing requests vs bulk scoring and background writes,
+# with bulk work yielding to interactive traffic
+scheduler = LaneScheduler(
+    interactive_concurrency=int(os.environ.get("INTERACTIVE_CONCURRENCY", "4")),
+    bulk_concurrency=int(os.environ.get("BULK_CONCURRENCY", "1")),
+    interactive_queue=int(os.environ.get("INTERACTIVE_QUEUE_LIMIT", "0")),
+    bulk_queue=int(os.environ.get("BULK_QUEUE_LIMIT", "0")),
+    bulk_max_delay=float(os.environ.get("BULK_MAX_DELAY", "1.0")),
+    bulk_niceness=int(os.environ.get("BULK_NICENESS", "10")),
+    enabled=os.environ.get("LANE_SCHEDULING", "true").lower() in ("1", "true", "yes")
+)
+
+# Identical concurrent recommendation requests share one scoring pass
+recommendation_flights = SingleFlight(
+    enabled=os.environ.get("COALESCE_REQUESTS", "true").lower() in ("1", "true", "yes"),
+    runner=functools.partial(scheduler.run, INTERACTIVE)
+)
+
+# Optional student profile pool for reverse matching (NDJSON or CSV, the bulk export
+# input format), indexed against each engine snapshot
+student_pool = StudentPool(os.environ.get("STUDENT_PROFILES_PATH"))
+
+# Latency budget for requests that do not set time_budget_ms (0 = score exhaustively)
+DEFAULT_TIME_BUDGET_MS = int(os.environ.get("DEFAULT_TIME_BUDGET_MS", "0"))
+
+# Optional recommendation result cache: "shared" (one shared-memory cache for every
+# worker on the host), "local" (one LRU per worker) or "off"
+RESULT_CACHE_MODE = os.environ.get("RESULT_CACHE", "off").lower()
+if RESULT_CACHE_MODE == "shared":
+    result_cache = SharedResultCache(
+        name=os.environ.get("RESULT_CACHE_NAME", "intern_mitra_results"),
+        slots=int(os.environ.get("RESULT_CACHE_SLOTS", "4096")),
+        slot_size=int(os.environ.get("RESULT_CACHE_SLOT_BYTES", "8192")),
+        ttl=float(os.environ.get("RESULT_CACHE_TTL", "300"))
+    )
+elif RESULT_CACHE_MODE == "local":
+    result_cache = LocalResultCache(
+        max_entries=int(os.environ.get("RESULT_CACHE_SLOTS", "4096")),
+        ttl=float(os.environ.get("RESULT_CACHE_TTL", "300"))
+    )
+else:
+    result_cache = None
+
+# Optional interaction event log: impressions from /api/recommend plus client events from
+# /api/events, buffered in memory and flushed in batches to rotating gzip segments
+EVENT_LOG_DIR = os.environ.get("EVENT_LOG_DIR")
+event_log = EventLog(
+    EVENT_LOG_DIR,
+    segment_format=os.environ.get("EVENT_LOG_FORMAT", "ndjson"),
+    capacity=int(os.environ.get("EVENT_LOG_CAPACITY", "65536")),
+    segment_bytes=int(os.environ.get("EVENT_LOG_SEGMENT_BYTES", str(64 << 20))),
+    segment_seconds=float(os.environ.get("EVENT_LOG_SEGMENT_SECONDS", "3600"))
+) if EVENT_LOG_DIR else None
+EVENT_LOG_FLUSH_INTERVAL = float(os.environ.get("EVENT_LOG_FLUSH_INTERVAL", "1"))
+
+def get_snapshot():
+    """Return the current engine snapshot or fail the request"""
+    snapshot = engine_manager.current
+    if not snapshot:
+        raise HTTPException(status_code=500, detail="Recommendation engine not initialized")
+    return snapshot
+
+def get_engine():
+    """Return the engine of the current snapshot or fail the request"""
+    return get_snapshot().engine
+
+def initialize():
+    """
+    Open the listing counters and load weight profiles and the engine once per process tree
+    
+    Called by startup_event, or earlier by the gunicorn master (see
+    gunicorn.conf.py) so forked workers inherit the loaded engine and counters.
+    """
+    if engine_manager.current:
+        return
+    counters = open_listing_counters()
+    if counters is not None and counters.created and counters.restore(LISTING_COUNTERS_PATH):
+        print(f"🔢 Restored listing counters from {LISTING_COUNTERS_PATH}")
+    if os.path.exists(WEIGHT_PROFILES_PATH):
+        weight_profiles.load_config(WEIGHT_PROFILES_PATH)
+        print(f"⚖️ Loaded weight profiles: {', '.join(weight_profiles.profiles)}")
+    engine_manager.load()
+    if student_pool.configured:
+        student_pool.index_for(engine_manager.current.engine)
+
+counter_snapshot_task: Optional[asyncio.Task] = None
+collaborative_watch_task: Optional[asyncio.Task] = None
+event_log_task: Optional[asyncio.Task] = None
+
+def snapshot_counters():
+    """Write the listing counters to LISTING_COUNTERS_PATH"""
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(LISTING_COUNTERS_PATH)), exist_ok=True)
+        listing_counters.snapshot(LISTING_COUNTERS_PATH)
+    except Exception as e:
+        print(f"❌ Error snapshotting listing counters: {e}")
+
+async def watch_collaborative_model():
+    """Attach a retrained collaborative model every COLLABORATIVE_WATCH_INTERVAL seconds, off the event loop"""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(COLLABORATIVE_WATCH_INTERVAL)
+        try:
+            if await loop.run_in_executor(None, refresh_collaborative_model):
+                print("🤝 Serving engine switched to the updated collaborative model")
+        except Exception as e:
+            # Keep the attached model; a half-written file is retried on the next check
+            print(f"❌ Error loading collaborative model: {e}")
+
+async def snapshot_counters_periodically():
+    """Snapshot the listing counters every COUNTER_SNAPSHOT_INTERVAL seconds as bulk work"""
+    while True:
+        await asyncio.sleep(COUNTER_SNAPSHOT_INTERVAL)
+        try:
+            await scheduler.run(BULK, snapshot_counters)
+        except LaneFull:
+            pass
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize the recommendation engine on startup"""
-    global recommendation_engine
+    global counter_snapshot_task, collaborative_watch_task, event_log_task
     try:
-        data_path = os.path.join(os.path.dirname(__file__), "..", "data", "internships_dataset.json")
-        recommendation_engine = InternshipRecommendationEngine(data_path)
-        recommendation_engine.load_data()
+        initialize()
+        engine_manager.ensure_warm()
+        engine_manager.start_watching()
+        if listing_counters is not None and COUNTER_SNAPSHOT_INTERVAL > 0:
+            counter_snapshot_task = asyncio.create_task(snapshot_counters_periodically())
+        if COLLABORATIVE_WATCH_INTERVAL > 0:
+            collaborative_watch_task = asyncio.create_task(watch_collaborative_model())
+        if event_log is not None:
+            # Segment writes are bulk work and yield to interactive requests
+            event_log_task = asyncio.create_task(
+                event_log.run(EVENT_LOG_FLUSH_INTERVAL, functools.partial(scheduler.run, BULK))
+            )
         print("✅ Recommendation engine initialized successfully")
     except Exception as e:
         print(f"❌ Error initializing recommendation engine: {e}")
         raise e
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background catalog and model watching, counter snapshots, event log flushes and the lane thread pools"""
+    await engine_manager.stop_watching()
+    if collaborative_watch_task is not None:
+        collaborative_watch_task.cancel()
+    if counter_snapshot_task is not None:
+        counter_snapshot_task.cancel()
+        snapshot_counters()
+    if event_log_task is not None:
+        event_log_task.cancel()
+        event_log.flush(close=True)
+    scheduler.shutdown()
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -58,14 +314,29 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check with system status"""
+    snapshot = engine_manager.current
     return {
         "status": "healthy",
-        "engine_status": "loaded" if recommendation_engine else "not_loaded",
-        "total_internships": len(recommendation_engine.internships) if recommendation_engine else 0
+        "engine_status": "loaded" if snapshot else "not_loaded",
+        "ready": engine_manager.ready,
+        "total_internships": len(snapshot.engine.internships) if snapshot else 0,
+        "catalog_version": snapshot.version if snapshot else None
     }
 
+@app.get("/health/live")
+async def liveness():
+    """Liveness probe: the process is up and serving HTTP"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness():
+    """Readiness probe: a warmed-up engine is serving in this worker"""
+    if not engine_manager.ready:
+        return JSONResponse(status_code=503, content={"status": "not_ready"})
+    return {"status": "ready", "catalog_version": engine_manager.current.version}
+
 @app.post("/api/recommend", response_model=List[InternshipResponse])
-async def get_recommendations(request: RecommendationRequest):
+async def get_recommendations(request: RecommendationRequest, raw_request: Request):
     """
     Get personalized internship recommendations
     
@@ -75,118 +346,380 @@ async def get_recommendations(request: RecommendationRequest):
     Returns:
         List of recommended internships with explanations
     """
-    if not recommendation_engine:
-        raise HTTPException(status_code=500, detail="Recommendation engine not initialized")
+    snapshot = get_snapshot()
+    recommendation_engine = snapshot.engine
+    
+    try:
+        profile = weight_profiles.resolve(request.weight_profile, request.user_id)
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Unknown weight profile: {request.weight_profile}")
     
     try:
         # Validate request
         if not request.skills or len(request.skills) == 0:
             raise HTTPException(status_code=400, detail="At least one skill is required")
         
-        # Get recommendations from engine
-        recommendations = recommendation_engine.get_recommendations(
-            education=request.education,
-            skills=request.skills,
-            sectors=request.sectors,
-            location_state=request.location_state,
-            max_results=request.max_results or 5
-        )
+        start = time.perf_counter()
+        # The budget counts from here, so time spent queued for the scoring executor is included
+        budget_ms = request.time_budget_ms or DEFAULT_TIME_BUDGET_MS
+        deadline = start + budget_ms / 1000 if budget_ms else None
+        partial = False
         
-        if not recommendations:
-            return []
+        # Users with trained factors get personal rankings; everyone else shares the mean-user ranking
+        user = user_key(request.user_id)
+        collaborative = recommendation_engine.collaborative
+        uses_collaborative = profile.weights.get("collaborative", 0.0) > 0 and collaborative is not None
+        scoring_user = user if uses_collaborative and collaborative.knows(user) else 0
+        # Rankings that used the collaborative term belong to the model version that scored them
+        model_version = collaborative.version if uses_collaborative else None
         
-        # Convert to response format
-        response = []
-        for rec in recommendations:
-            internship_response = InternshipResponse(
-                id=rec["id"],
-                title=rec["title"],
-                company=rec["company"],
-                sector=rec["sector"],
-                location_city=rec["location_city"],
-                location_state=rec["location_state"],
-                stipend=rec["stipend"],
-                duration_weeks=rec["duration_weeks"],
-                skills_required=rec["skills_required"],
-                education_requirement=rec["education_requirement"],
-                description=rec["description"],
-                similarity_score=rec["similarity_score"],
-                reason=rec["reason"],
-                apply_url=rec["apply_url"],
-                eligibility_criteria=rec["eligibility_criteria"],
-                learning_outcomes=rec["learning_outcomes"]
+        # Cached rows are keyed on the catalog file (not the per-worker snapshot version),
+        # the day (listings expire), the profile weights and the collaborative model version,
+        # so every worker shares entries
+        cache_key = (
+            snapshot.data_path, snapshot.data_mtime, date.today().isoformat(),
+            profile.name, tuple(profile.weights.values()), profile.skill_blend, scoring_user, model_version
+        ) + request.coalescing_key()
+        cached = result_cache.get(cache_key) if result_cache is not None else None
+        if cached is not None:
+            rows = json.loads(cached)
+        else:
+            # Get ranked rows from engine, combining the components under the selected profile.
+            # Scoring runs on the interactive lane off the event loop; concurrent identical requests against the same
+            # engine snapshot (the engine's identity is stable while a flight holds it) and
+            # with the same budget share one pass
+            rows, partial = await recommendation_flights.run(
+                (id(recommendation_engine), profile.name, budget_ms, scoring_user, model_version)
+                + request.coalescing_key(),
+                functools.partial(
+                    recommendation_engine.rank_rows,
+                    education=request.education,
+                    skills=request.skills,
+                    sectors=request.sectors,
+                    location_state=request.location_state,
+                    max_results=request.max_results or 5,
+                    filters=request.hard_filters(),
+                    diversity=request.diversity_options(),
+                    weights=profile.weights,
+                    skill_blend=profile.skill_blend,
+                    deadline=deadline,
+                    user=scoring_user
+                )
             )
-            response.append(internship_response)
+            # Partial rankings are never cached
+            if result_cache is not None and not partial:
+                result_cache.put(cache_key, json.dumps(rows).encode("utf-8"))
+        weight_profiles.record(profile.name, time.perf_counter() - start, len(rows))
         
+        impression_id = None
+        if event_log is not None and rows:
+            # Buffered in memory; the background flush writes it out
+            impression_id = random.getrandbits(63)
+            event_log.append(
+                IMPRESSION, recommendation_engine.row_ids[[row[0] for row in rows]], [row[1] for row in rows],
+                impression_id, user, snapshot.version, profile.name
+            )
+        
+        # Splice scores and reasons into the pre-serialized listings; returning a
+        # Response skips re-validation while response_model still documents the schema
+        response = compressed_response(
+            recommendation_engine.render_recommendations_json(rows),
+            raw_request.headers.get("accept-encoding")
+        )
+        response.headers["X-Weight-Profile"] = profile.name
+        if partial:
+            response.headers["X-Partial-Results"] = "true"
+        if impression_id is not None:
+            response.headers["X-Impression-Id"] = str(impression_id)
         return response
         
+    except LaneFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         print(f"Error generating recommendations: {e}")
         raise HTTPException(status_code=500, detail=f"Error generating recommendations: {str(e)}")
 
-@app.get("/api/sectors")
-async def get_sectors():
-    """Get available sectors"""
-    if not recommendation_engine:
-        raise HTTPException(status_code=500, detail="Recommendation engine not initialized")
+@app.post("/api/recommend/batch", response_model=List[List[InternshipResponse]])
+async def get_batch_recommendations(batch: BatchRecommendationRequest, raw_request: Request):
+    """
+    Score many student profiles as a bulk job
+    
+    Each profile is scored as one unit on the bulk lane, so the job yields to
+    interactive /api/recommend traffic between profiles. Every profile is
+    scored against the same catalog snapshot.
+    
+    Returns:
+        One list of recommendations per request, in request order
+    """
+    snapshot = get_snapshot()
+    recommendation_engine = snapshot.engine
     
-    sectors = list(set([internship["sector"] for internship in recommendation_engine.internships]))
-    return {"sectors": sorted(sectors)}
+    try:
+        profiles = [weight_profiles.resolve(request.weight_profile, request.user_id) for request in batch.requests]
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Unknown weight profile: {e.args[0]}")
+    
+    try:
+        rendered = []
+        for request, profile in zip(batch.requests, profiles):
+            start = time.perf_counter()
+            rows = await scheduler.run(BULK, functools.partial(
+                recommendation_engine.get_recommendation_rows,
+                education=request.education,
+                skills=request.skills,
+                sectors=request.sectors,
+                location_state=request.location_state,
+                max_results=request.max_results or 5,
+                filters=request.hard_filters(),
+                diversity=request.diversity_options(),
+                weights=profile.weights,
+                skill_blend=profile.skill_blend,
+                user=user_key(request.user_id)
+            ))
+            weight_profiles.record(profile.name, time.perf_counter() - start, len(rows))
+            rendered.append(recommendation_engine.render_recommendations_json(rows))
+        
+        return compressed_response(b"[" + b",".join(rendered) + b"]", raw_request.headers.get("accept-encoding"))
+    
+    except LaneFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except Exception as e:
+        print(f"Error generating batch recommendations: {e}")
+        raise HTTPException(status_code=500, detail=f"Error generating batch recommendations: {str(e)}")
 
-@app.get("/api/locations")
-async def get_locations():
-    """Get available locations"""
-    if not recommendation_engine:
-        raise HTTPException(status_code=500, detail="Recommendation engine not initialized")
+@app.get("/api/internships/{internship_id}/candidates", response_model=CandidateStudentsResponse)
+async def get_candidate_students(internship_id: int,
+                                 max_results: int = Query(20, ge=1, le=500),
+                                 eligible_only: bool = False,
+                                 weight_profile: Optional[str] = None):
+    """
+    Rank the student pool for one internship (reverse matching)
+    
+    Args:
+        internship_id: Internship to find students for
+        max_results: Number of students to return
+        eligible_only: Only students meeting the internship's education requirement
+        weight_profile: Weight profile to score with (default profile when omitted)
     
-    states = list(set([internship["location_state"] for internship in recommendation_engine.internships]))
-    cities = list(set([internship["location_city"] for internship in recommendation_engine.internships]))
+    Returns:
+        Best-fitting students, scored with the same weighted formula as /api/recommend
+    """
+    if not student_pool.configured:
+        raise HTTPException(status_code=404, detail="No student pool configured (set STUDENT_PROFILES_PATH)")
+    recommendation_engine = get_engine()
+    row = recommendation_engine.row_by_id.get(internship_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"Internship {internship_id} not found")
+    try:
+        profile = weight_profiles.resolve(weight_profile)
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Unknown weight profile: {weight_profile}")
     
+    try:
+        index = student_pool.current(recommendation_engine)
+        if index is None:
+            # Re-indexing the pool after a catalog reload is bulk work; concurrent requests wait for one build
+            index = await scheduler.run(BULK, student_pool.index_for, recommendation_engine)
+        students, scores = await scheduler.run(INTERACTIVE, functools.partial(
+            index.top_students, row, max_results,
+            weights=profile.weights, skill_blend=profile.skill_blend, eligible_only=eligible_only
+        ))
+    except LaneFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except Exception as e:
+        print(f"Error ranking students: {e}")
+        raise HTTPException(status_code=500, detail=f"Error ranking students: {str(e)}")
+    
+    internship = recommendation_engine.internships[row]
     return {
-        "states": sorted([state for state in states if state != "Multiple"]),
-        "cities": sorted(cities)
+        "internship_id": internship_id,
+        "title": internship["title"],
+        "company": internship["company"],
+        "pool_size": len(index),
+        "candidates": [
+            {"student_id": index.student_ids[student], "similarity_score": round(float(score), 4)}
+            for student, score in zip(students, scores)
+        ],
     }
 
-@app.get("/api/skills")
-async def get_skills():
-    """Get available skills from all internships"""
-    if not recommendation_engine:
-        raise HTTPException(status_code=500, detail="Recommendation engine not initialized")
+@app.post("/api/events")
+async def record_listing_events(request: ListingEventsRequest):
+    """
+    Record views, clicks, applications or filled seats for listings
     
-    all_skills = set()
-    for internship in recommendation_engine.internships:
-        all_skills.update(internship["skills_required"])
+    Views, applications and fills update the listing counters; every event
+    is also appended to the event log. Both are in-memory updates taking
+    microseconds, so they run inline on the event loop and never queue
+    behind scoring.
     
-    return {"skills": sorted(list(all_skills))}
-
-@app.get("/api/stats")
-async def get_statistics():
-    """Get system statistics"""
-    if not recommendation_engine:
-        raise HTTPException(status_code=500, detail="Recommendation engine not initialized")
+    Args:
+        request: Event type, the internships it applies to and the impression it came from
     
-    internships = recommendation_engine.internships
+    Returns:
+        How many events were counted and logged and which ids are not in the current catalog
+    """
+    if listing_counters is None and event_log is None:
+        raise HTTPException(status_code=404, detail="Listing counters and the event log are disabled")
+    snapshot = get_snapshot()
+    row_by_id = snapshot.engine.row_by_id
+    known = [internship_id for internship_id in request.internship_ids if internship_id in row_by_id]
+    unknown = sorted({internship_id for internship_id in request.internship_ids if internship_id not in row_by_id})
     
-    # Calculate statistics
-    total_internships = len(internships)
-    sectors = list(set([i["sector"] for i in internships]))
-    companies = list(set([i["company"] for i in internships]))
-    locations = list(set([i["location_city"] for i in internships]))
+    counted = 0
+    if listing_counters is not None:
+        if request.event == ListingEvent.FILL:
+            counted = listing_counters.fill_seats(known)
+        elif request.event == ListingEvent.APPLICATION:
+            counted = listing_counters.add(APPLICATIONS, known)
+        elif request.event == ListingEvent.VIEW:
+            counted = listing_counters.add(VIEWS, known)
+    logged = 0
+    if event_log is not None and known:
+        logged = event_log.append(
+            EVENT_KINDS.index(request.event.value), known, None,
+            request.impression_id or 0, user_key(request.user_id), snapshot.version
+        )
+    return {"event": request.event.value, "counted": counted, "logged": logged, "unknown_ids": unknown}
+
+@app.get("/api/sectors", response_model=SectorsResponse)
+async def get_sectors(raw_request: Request):
+    """Get available sectors"""
+    recommendation_engine = get_engine()
+    return recommendation_engine.get_catalog_payload("sectors").response(
+        raw_request.headers.get("accept-encoding")
+    )
+
+@app.get("/api/locations", response_model=LocationsResponse)
+async def get_locations(raw_request: Request):
+    """Get available locations"""
+    recommendation_engine = get_engine()
+    return recommendation_engine.get_catalog_payload("locations").response(
+        raw_request.headers.get("accept-encoding")
+    )
+
+@app.get("/api/skills", response_model=SkillsResponse)
+async def get_skills(raw_request: Request):
+    """Get available skills from all internships"""
+    recommendation_engine = get_engine()
+    return recommendation_engine.get_catalog_payload("skills").response(
+        raw_request.headers.get("accept-encoding")
+    )
+
+@app.get("/api/stats", response_model=StatsResponse)
+async def get_statistics(raw_request: Request):
+    """Get system statistics"""
+    recommendation_engine = get_engine()
+    return recommendation_engine.get_catalog_payload("stats").response(
+        raw_request.headers.get("accept-encoding")
+    )
+
+# Worker processes serving this app (set by gunicorn.conf.py, read by uvicorn --workers)
+SERVER_WORKERS = int(os.environ.get("WEB_CONCURRENCY", "1"))
+
+# /admin/reload only loads datasets from this directory
+CATALOG_DATA_DIR = os.path.realpath(os.path.join(os.path.dirname(__file__), "..", "data"))
+
+def resolve_catalog_path(data_path: str) -> str:
+    """
+    Resolve a dataset path given to /admin/reload
     
-    # Sector distribution
-    from collections import Counter
-    sector_dist = Counter([i["sector"] for i in internships])
+    Relative paths are taken relative to CATALOG_DATA_DIR; anything that resolves
+    outside it (absolute paths, '..', symlinks) is rejected with a 400.
+    """
+    resolved = os.path.realpath(os.path.join(CATALOG_DATA_DIR, data_path))
+    if os.path.commonpath([resolved, CATALOG_DATA_DIR]) != CATALOG_DATA_DIR:
+        raise HTTPException(status_code=400, detail="data_path must be inside the backend data directory")
+    return resolved
+
+@app.post("/admin/reload")
+async def reload_catalog(request: Optional[ReloadRequest] = None):
+    """Rebuild the engine from the dataset in the background and swap it in atomically"""
+    data_path = None
+    if request and request.data_path:
+        if SERVER_WORKERS > 1:
+            # The request reaches one worker; the others would keep serving and watching the old file
+            raise HTTPException(
+                status_code=409,
+                detail=f"data_path can only be changed with a single worker ({SERVER_WORKERS} are running); "
+                       "set INTERNSHIP_DATA_PATH and restart instead"
+            )
+        data_path = resolve_catalog_path(request.data_path)
+    try:
+        # No bulk slot is held: the build runs in its own process (ENGINE_RELOAD_MODE=process) and
+        # holding the slot for its duration would stall event-log flushes, counter snapshots and
+        # /api/recommend/batch. Concurrent reloads are serialized by the engine manager.
+        snapshot = await engine_manager.reload(data_path)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reloading catalog: {str(e)}")
     
+    return {"status": "reloaded", **snapshot.info()}
+
+@app.get("/admin/reload")
+async def reload_status():
+    """Current catalog snapshot and reload status"""
+    return engine_manager.status()
+
+@app.get("/admin/weight-profiles")
+async def weight_profile_metrics():
+    """Weight profiles, the active experiment and per-profile request counters"""
+    return weight_profiles.metrics()
+
+@app.get("/admin/coalescing")
+async def coalescing_stats():
+    """How many recommendation computations were shared by concurrent identical requests"""
+    return recommendation_flights.stats()
+
+@app.get("/admin/lanes")
+async def lane_stats():
+    """Per-lane concurrency limits, queue depths and wait times for this worker"""
+    return scheduler.stats()
+
+@app.get("/admin/result-cache")
+async def result_cache_stats():
+    """Result cache counters for this worker"""
+    if result_cache is None:
+        return {"backend": "off"}
+    return result_cache.stats()
+
+@app.get("/admin/students")
+async def student_pool_stats():
+    """Size and build time of the reverse-matching student index in this worker"""
+    return student_pool.stats()
+
+@app.post("/admin/seats")
+async def set_listing_seats(request: SeatsRequest):
+    """Set the remaining seats of listings (feeds the congestion penalty)"""
+    if listing_counters is None:
+        raise HTTPException(status_code=404, detail="Listing counters are disabled (LISTING_COUNTERS=off)")
+    return {"updated": listing_counters.set_seats(request.seats)}
+
+@app.get("/admin/counters")
+async def listing_counter_stats(internship_id: Optional[int] = None):
+    """Counter totals and congestion settings, or the counters of one listing"""
+    if listing_counters is None:
+        return {"backend": "off"}
+    if internship_id is not None:
+        return {"internship_id": internship_id, **listing_counters.get(internship_id)}
     return {
-        "total_internships": total_internships,
-        "total_sectors": len(sectors),
-        "total_companies": len(companies),
-        "total_locations": len(locations),
-        "sector_distribution": dict(sector_dist),
-        "sectors": sorted(sectors),
-        "top_companies": sorted(companies)[:10]
+        **listing_counters.stats(),
+        "congestion_weight": CONGESTION_PENALTY_WEIGHT,
+        "congestion_saturation": CONGESTION_SATURATION,
     }
 
+@app.get("/admin/events")
+async def event_log_stats():
+    """Event log buffer occupancy and write counters for this worker"""
+    if event_log is None:
+        return {"backend": "off"}
+    return event_log.stats()
+
+@app.get("/admin/memory")
+async def memory_status():
+    """Shared vs private memory of the serving process (kB)"""
+    return {"pid": os.getpid(), "parent_pid": os.getppid(), **process_memory()}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,100 @@
+# Shared vs Private Memory Report for Pre-forked Workers
+# File: backend/app/memory_report.py
+
+import argparse
+import json
+import os
+from typing import Any, Dict, List, Union
+
+# smaps_rollup fields reported (values in kB)
+FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def process_memory(pid: Union[int, str] = "self") -> Dict[str, int]:
+    """
+    Memory breakdown of a process from /proc/<pid>/smaps_rollup
+
+    Returns:
+        kB per field plus shared (clean + dirty pages mapped by other processes)
+        and private (pages only this process maps)
+    """
+    path = f"/proc/{pid}/smaps_rollup"
+    if not os.path.exists(path):
+        path = f"/proc/{pid}/smaps"
+
+    totals = dict.fromkeys(FIELDS, 0)
+    with open(path, "r") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in totals:
+                totals[name] += int(rest.split()[0])
+
+    memory = {field.lower(): value for field, value in totals.items()}
+    memory["shared"] = totals["Shared_Clean"] + totals["Shared_Dirty"]
+    memory["private"] = totals["Private_Clean"] + totals["Private_Dirty"]
+    return memory
+
+
+def child_pids(pid: int) -> List[int]:
+    """Direct children of a process"""
+    children = []
+    task_dir = f"/proc/{pid}/task"
+    for task in os.listdir(task_dir):
+        try:
+            with open(os.path.join(task_dir, task, "children"), "r") as f:
+                children.extend(int(child) for child in f.read().split())
+        except FileNotFoundError:
+            continue
+    return sorted(set(children))
+
+
+def prefork_report(master_pid: int) -> Dict[str, Any]:
+    """
+    Memory of a pre-fork server (e.g. the gunicorn master) and its workers
+
+    PSS divides each shared page between the processes mapping it, so the PSS
+    total is the real footprint of the whole pool; RSS totals double count.
+    """
+    processes = {"master": {"pid": master_pid, **process_memory(master_pid)}}
+    workers = []
+    for pid in child_pids(master_pid):
+        try:
+            workers.append({"pid": pid, **process_memory(pid)})
+        except (FileNotFoundError, ProcessLookupError):
+            continue
+    processes["workers"] = workers
+
+    everyone = [processes["master"]] + workers
+    processes["totals"] = {
+        field: sum(p[field] for p in everyone) for field in ("rss", "pss", "shared", "private")
+    }
+    return processes
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a prefork_report in MB"""
+    def mb(kb: int) -> str:
+        return f"{kb / 1024:8.1f}"
+
+    print(f"{'process':>14} {'RSS MB':>8} {'PSS MB':>8} {'shared':>8} {'private':>8}")
+    rows = [("master " + str(report["master"]["pid"]), report["master"])]
+    rows += [("worker " + str(w["pid"]), w) for w in report["workers"]]
+    for label, m in rows:
+        print(f"{label:>14} {mb(m['rss'])} {mb(m['pss'])} {mb(m['shared'])} {mb(m['private'])}")
+    totals = report["totals"]
+    print(f"{'total':>14} {mb(totals['rss'])} {mb(totals['pss'])} {mb(totals['shared'])} {mb(totals['private'])}")
+    print(f"🧠 Pool footprint (PSS): {totals['pss'] / 1024:.1f} MB across {len(report['workers'])} workers")
+
+
+# CLI interface: python -m app.memory_report <gunicorn master pid>
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report shared vs private memory of a pre-fork server")
+    parser.add_argument("pid", type=int, help="Master process id")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    memory_report = prefork_report(args.pid)
+    if args.json:
+        print(json.dumps(memory_report, indent=2))
+    else:
+        print_report(memory_report)
@@ -2,7 +2,7 @@
 # File: backend/app/models.py
 
 from pydantic import BaseModel, Field, validator
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 from enum import Enum
 
 class EducationLevel(str, Enum):
@@ -75,7 +75,100 @@ class RecommendationRequest(BaseModel):
         le=10,
         description="Maximum number of recommendations to return"
     )
+    min_stipend: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Only include internships paying at least this monthly stipend in ₹ (optional)",
+        example=15000
+    )
+    min_duration_weeks: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Only include internships lasting at least this many weeks (optional)"
+    )
+    max_duration_weeks: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Only include internships lasting at most this many weeks (optional)",
+        example=12
+    )
+    open_only: bool = Field(
+        False,
+        description="Exclude internships whose application deadline has passed"
+    )
+    strict_eligibility: bool = Field(
+        False,
+        description="Only include internships whose education requirement the user meets"
+    )
+    
+    diversify: bool = Field(
+        False,
+        description="Re-rank results for variety (maximal marginal relevance) instead of pure score order"
+    )
+    max_per_company: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Maximum number of results from the same company (optional)",
+        example=1
+    )
+    max_per_sector: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Maximum number of results from the same sector (optional)"
+    )
+
+    weight_profile: Optional[str] = Field(
+        None,
+        description="Named scoring weight profile (defaults to the experiment assignment or 'default')"
+    )
+    user_id: Optional[str] = Field(
+        None,
+        max_length=128,
+        description="Stable user identifier used to assign weight-profile experiments (optional)"
+    )
+    time_budget_ms: Optional[int] = Field(
+        None,
+        ge=1,
+        le=60000,
+        description="Latency budget in milliseconds; when it runs out the best results found so far "
+                    "are returned and the X-Partial-Results header is set (optional)"
+    )
+
+    def hard_filters(self) -> dict:
+        """Hard filter arguments for the recommendation engine"""
+        return {
+            "min_stipend": self.min_stipend,
+            "min_duration_weeks": self.min_duration_weeks,
+            "max_duration_weeks": self.max_duration_weeks,
+            "open_only": self.open_only,
+            "strict_eligibility": self.strict_eligibility
+        }
     
+    def diversity_options(self) -> dict:
+        """Diversity re-ranking arguments for the recommendation engine"""
+        return {
+            "diversify": self.diversify,
+            "max_per_company": self.max_per_company,
+            "max_per_sector": self.max_per_sector
+        }
+
+    def coalescing_key(self) -> tuple:
+        """
+        Identity of the scoring work for this request
+
+        Skills are compared case-insensitively (the engine lowercases them
+        everywhere) but keep their order, which affects TF-IDF bigrams.
+        """
+        return (
+            self.education.value,
+            tuple(skill.lower() for skill in self.skills),
+            tuple(self.sectors) if self.sectors else None,
+            self.location_state,
+            self.max_results or 5,
+            tuple(self.hard_filters().items()),
+            tuple(self.diversity_options().items())
+        )
+
     @validator('skills')
     def validate_skills(cls, v):
         """Validate skills list"""
@@ -138,6 +231,7 @@ class StatsResponse(BaseModel):
     sector_distribution: dict
     sectors: List[str]
     top_companies: List[str]
+    expired_internships: int = 0
 
 class SectorsResponse(BaseModel):
     """Available sectors response"""
@@ -152,6 +246,70 @@ class SkillsResponse(BaseModel):
     """Available skills response"""
     skills: List[str]
 
+class CandidateStudent(BaseModel):
+    """One student ranked for an internship"""
+    student_id: Union[int, str]
+    similarity_score: float
+
+class CandidateStudentsResponse(BaseModel):
+    """Students of the indexed pool that best fit an internship"""
+    internship_id: int
+    title: str
+    company: str
+    pool_size: int = Field(..., description="Students in the indexed pool")
+    candidates: List[CandidateStudent]
+
+class BatchRecommendationRequest(BaseModel):
+    """Bulk request scoring many student profiles (runs on the bulk lane)"""
+    requests: List[RecommendationRequest] = Field(
+        ...,
+        min_items=1,
+        max_items=500,
+        description="Recommendation requests to score, answered in the same order"
+    )
+
+class ListingEvent(str, Enum):
+    """Student interactions counted against a listing"""
+    VIEW = "view"
+    CLICK = "click"
+    APPLICATION = "application"
+    FILL = "fill"
+
+class ListingEventsRequest(BaseModel):
+    """Impressions, applications or filled seats for one or more listings"""
+    event: ListingEvent = Field(..., description="What happened to each listed internship")
+    internship_ids: List[int] = Field(
+        ...,
+        min_items=1,
+        max_items=500,
+        description="Internships the event applies to (repeat an id to count it repeatedly)"
+    )
+    impression_id: Optional[int] = Field(
+        None,
+        ge=0,
+        description="X-Impression-Id of the recommendations the event came from (optional)"
+    )
+    user_id: Optional[str] = Field(
+        None,
+        max_length=128,
+        description="Stable user identifier; only its hash is logged (optional)"
+    )
+
+class SeatsRequest(BaseModel):
+    """Admin request to set the remaining seats of listings"""
+    seats: Dict[int, int] = Field(
+        ...,
+        description="Internship ID -> remaining seats (-1 clears the count)"
+    )
+
+class ReloadRequest(BaseModel):
+    """Admin request to hot-reload the internship catalog"""
+    data_path: Optional[str] = Field(
+        None,
+        description="Dataset file inside backend/data to serve from now on (single-worker servers only; "
+                    "defaults to the currently loaded file)"
+    )
+
 # Utility functions for data validation
 def validate_education_level(education: str) -> bool:
     """Validate if education level is supported"""
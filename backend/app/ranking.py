@@ -0,0 +1,109 @@
+# Top-k Selection and Diversity Re-ranking
+# File: backend/app/ranking.py
+
+from typing import List, Optional
+
+import numpy as np
+
+# Pools up to this size compute their full similarity block in one sparse product;
+# larger pools compute only the k rows that the greedy selection actually uses
+SIMILARITY_BLOCK_MAX_POOL = 256
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first, in O(n) selection time
+
+    Ties are broken by ascending index (including at the k-th boundary), so the
+    result is deterministic and identical for any subset that contains the winners.
+
+    Args:
+        scores: 1-D score array
+        k: Number of indices to return
+
+    Returns:
+        Up to k indices into scores ordered by (score desc, index asc)
+    """
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+
+    if k >= n:
+        candidates = np.arange(n)
+    else:
+        kth_score = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > kth_score)
+        ties = np.flatnonzero(scores == kth_score)[:k - len(above)]
+        candidates = np.concatenate([above, ties])
+
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order]
+
+
+def mmr_rerank(relevance: np.ndarray, vectors, k: int, diversity_lambda: float = 0.7,
+               company_codes: Optional[np.ndarray] = None, max_per_company: Optional[int] = None,
+               sector_codes: Optional[np.ndarray] = None, max_per_sector: Optional[int] = None) -> List[int]:
+    """
+    Maximal marginal relevance re-ranking with optional company/sector caps
+
+    Pairwise similarities come from sparse products rather than per-pair Python
+    loops: small pools compute the whole block at once, large pools compute
+    one row per greedy step. Each step folds the chosen item's row into a
+    running "max similarity to the selected set" vector.
+
+    Args:
+        relevance: Relevance score of each pool candidate
+        vectors: L2-normalized sparse rows for the pool (same order as relevance)
+        k: Number of items to select
+        diversity_lambda: 1.0 = pure relevance, lower values favour novelty
+        company_codes: Company code per candidate (required for max_per_company)
+        max_per_company: Maximum selections per company
+        sector_codes: Sector code per candidate (required for max_per_sector)
+        max_per_sector: Maximum selections per sector
+
+    Returns:
+        Positions into the pool, in selection order
+    """
+    pool_size = len(relevance)
+    k = min(k, pool_size)
+    if k <= 0:
+        return []
+
+    use_similarity = diversity_lambda < 1.0
+    block = None
+    if use_similarity and pool_size <= SIMILARITY_BLOCK_MAX_POOL:
+        block = (vectors @ vectors.T).toarray()
+
+    max_similarity = np.zeros(pool_size)
+    available = np.ones(pool_size, dtype=bool)
+    company_counts = {}
+    sector_counts = {}
+    selected: List[int] = []
+
+    while len(selected) < k and available.any():
+        marginal = diversity_lambda * relevance - (1.0 - diversity_lambda) * max_similarity
+        marginal[~available] = -np.inf
+        choice = int(np.argmax(marginal))
+        selected.append(choice)
+        available[choice] = False
+
+        if use_similarity:
+            if block is not None:
+                similarity = block[choice]
+            else:
+                similarity = (vectors @ vectors[choice].T).toarray().ravel()
+            np.maximum(max_similarity, similarity, out=max_similarity)
+
+        # Retire every remaining candidate from a company/sector that hit its cap
+        if max_per_company is not None:
+            code = company_codes[choice]
+            company_counts[code] = company_counts.get(code, 0) + 1
+            if company_counts[code] >= max_per_company:
+                available &= company_codes != code
+        if max_per_sector is not None:
+            code = sector_codes[choice]
+            sector_counts[code] = sector_counts.get(code, 0) + 1
+            if sector_counts[code] >= max_per_sector:
+                available &= sector_codes != code
+
+    return selected
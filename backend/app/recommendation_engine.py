@@ -3,15 +3,37 @@
 
 import json
 import numpy as np
-import pandas as pd
 from typing import List, Dict, Any, Optional, Tuple
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.preprocessing import StandardScaler
 import re
 import os
 from collections import Counter
 import time
+from datetime import date
+from app.catalog_index import CatalogIndex
+from app.listing_counters import APPLICATIONS, SEATS, congestion_penalty
+from app.ranking import mmr_rerank, top_k_indices
+from app.sector_partitions import SectorPartitions
+from app.serialization import build_listing_prefixes, render_recommendations
+from app.compression import PrecompressedPayload, available_encodings, compress
+
+# Education level hierarchy for compatibility matching
+EDUCATION_HIERARCHY = {
+    'ITI': 1, 'Diploma': 2,
+    'BCA': 3, 'BSc': 3, 'B.Com': 3, 'BBA': 3, 'BA': 3, 'B.Ed': 3,
+    'B.Tech': 4, 'B.E': 4, 'MBBS': 4, 'B.Pharma': 4, 'BDS': 4, 'BAMS': 4,
+    'B.Sc Nursing': 4, 'B.Sc Agriculture': 4, 'B.Tech Agricultural': 4,
+    'Mass Communication': 4,
+    'MCA': 5, 'M.Tech': 5, 'MBA': 5, 'M.Com': 5, 'MA': 5, 'MSc': 5,
+    'M.Ed': 5, 'M.Sc Agriculture': 5,
+    'CA': 6
+}
+
+# Recommendations scoring below this are never returned
+MIN_SIMILARITY = 0.2
+
+def _cosine_scores(query_vector, matrix) -> np.ndarray:
+    """Cosine similarity of one query row to every matrix row (TF-IDF rows are already L2-normalized)"""
+    return (matrix @ query_vector.T).toarray().ravel()
 
 class InternshipRecommendationEngine:
     """
@@ -19,21 +41,52 @@ class InternshipRecommendationEngine:
     with rule-based scoring for high accuracy (>90%) recommendations
     """
     
-    def __init__(self, data_path: str):
+    def __init__(self, data_path: str, exclude_expired: bool = False):
         """
         Initialize the recommendation engine
         
         Args:
             data_path: Path to the internships dataset JSON file
+            exclude_expired: Skip listings whose application deadline has passed
         """
         self.data_path = data_path
+        self.exclude_expired = exclude_expired
         self.internships = []
-        self.df = None
         self.tfidf_vectorizer = None
         self.tfidf_matrix = None
         self.skill_vectorizer = None
         self.skill_matrix = None
-        self.scaler = StandardScaler()
+        self.scoring_operator = None
+        self.sector_partitions = None
+        self.catalog_index = None
+        self.listing_json = []
+        self.row_by_id = {}
+        self.row_ids = np.empty(0, dtype=np.int64)
+        self.catalog_payloads = {}
+        self._stats_day = None
+        
+        # Live seat/application counters (app.listing_counters.ListingCounters) and the
+        # weight of the congestion penalty they feed (0 disables it)
+        self.listing_counters = None
+        self.congestion_weight = 0.0
+        self.congestion_saturation = 5.0
+        # Seconds a gathered penalty array is reused before the counters are read again
+        self.congestion_refresh_seconds = 1.0
+        self._congestion = None
+        
+        # Implicit-feedback model (app.collaborative.CollaborativeModel) and its
+        # listing factors aligned to catalog rows, swapped together by attach_collaborative
+        self._collaborative = (None, None)
+        
+        # Diversity re-ranking: MMR trade-off and candidate pool size
+        self.diversity_lambda = 0.7
+        self.diversity_pool_size = 100
+        
+        # Score preferred sectors first and skip sectors that cannot reach the top k
+        self.sector_pruning = True
+        
+        # Rows per chunk when scoring against a deadline (the budget is checked between chunks)
+        self.budget_chunk_rows = 4096
         
         # Weights for different matching components
         self.weights = {
@@ -41,20 +94,15 @@ class InternshipRecommendationEngine:
             'skill_match': 0.30,         # Direct skill matching
             'education_match': 0.15,     # Education compatibility
             'location_preference': 0.10,  # Location preference
-            'sector_preference': 0.05     # Sector preference
+            'sector_preference': 0.05,    # Sector preference
+            'collaborative': 0.0          # Collaborative filtering (needs a trained model)
         }
         
+        # Share of skill_match from TF-IDF similarity (the rest is direct skill overlap)
+        self.skill_blend = 0.6
+        
         # Education level hierarchy for compatibility matching
-        self.education_hierarchy = {
-            'ITI': 1, 'Diploma': 2,
-            'BCA': 3, 'BSc': 3, 'B.Com': 3, 'BBA': 3, 'BA': 3, 'B.Ed': 3,
-            'B.Tech': 4, 'B.E': 4, 'MBBS': 4, 'B.Pharma': 4, 'BDS': 4, 'BAMS': 4,
-            'B.Sc Nursing': 4, 'B.Sc Agriculture': 4, 'B.Tech Agricultural': 4,
-            'Mass Communication': 4,
-            'MCA': 5, 'M.Tech': 5, 'MBA': 5, 'M.Com': 5, 'MA': 5, 'MSc': 5,
-            'M.Ed': 5, 'M.Sc Agriculture': 5,
-            'CA': 6
-        }
+        self.education_hierarchy = dict(EDUCATION_HIERARCHY)
     
     def load_data(self) -> None:
         """Load and preprocess internship data"""
@@ -68,25 +116,34 @@ class InternshipRecommendationEngine:
             if not self.internships:
                 raise ValueError("Dataset is empty")
             
-            # Convert to DataFrame for easier processing
-            self.df = pd.DataFrame(self.internships)
-            
             # Preprocess and create feature matrices
-            self._preprocess_data()
-            self._create_tfidf_matrix()
-            self._create_skill_matrix()
+            combined_text, skills_text = self._preprocess_data()
+            self._create_tfidf_matrix(combined_text)
+            self._create_skill_matrix(skills_text)
+            self.catalog_index = CatalogIndex(self.internships, self.education_hierarchy)
+            
+            # Pre-serialize the static part of every listing for the fast response path
+            self.listing_json = build_listing_prefixes(self.internships)
+            self.row_by_id = {internship['id']: row for row, internship in enumerate(self.internships)}
+            self.row_ids = np.array([internship['id'] for internship in self.internships], dtype=np.int64)
+            self._build_catalog_payloads()
+            self._compact()
+            self._build_scoring_operator()
+            self.sector_partitions = SectorPartitions(
+                self.scoring_operator, self.tfidf_matrix.shape[1], self.catalog_index
+            )
             
             print(f"✅ Loaded {len(self.internships)} internships successfully")
-            print(f"📊 Sectors: {self.df['sector'].nunique()}")
-            print(f"🏢 Companies: {self.df['company'].nunique()}")
-            print(f"📍 Locations: {self.df['location_city'].nunique()}")
+            print(f"📊 Sectors: {len(self.catalog_index.sector_values)}")
+            print(f"🏢 Companies: {len(self.catalog_index.company_values)}")
+            print(f"📍 Locations: {len({i['location_city'] for i in self.internships})}")
             
         except Exception as e:
             print(f"❌ Error loading data: {e}")
             raise e
     
-    def _preprocess_data(self) -> None:
-        """Preprocess internship data for better matching"""
+    def _preprocess_data(self) -> Tuple[List[str], List[str]]:
+        """Preprocess internship data for better matching (combined text, normalized skills)"""
         # Create combined text features for content-based filtering
         text_features = []
         for internship in self.internships:
@@ -99,7 +156,6 @@ class InternshipRecommendationEngine:
             """.strip()
             text_features.append(combined_text)
         
-        self.df['combined_text'] = text_features
         
         # Normalize skills for better matching
         normalized_skills = []
@@ -107,10 +163,13 @@ class InternshipRecommendationEngine:
             skills = [skill.lower().strip() for skill in internship['skills_required']]
             normalized_skills.append(' '.join(skills))
         
-        self.df['skills_text'] = normalized_skills
+        return text_features, normalized_skills
     
-    def _create_tfidf_matrix(self) -> None:
+    def _create_tfidf_matrix(self, combined_text: List[str]) -> None:
         """Create TF-IDF matrix for content-based similarity"""
+        # Imported on first build so importing the API does not load scikit-learn
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
         # Initialize TF-IDF vectorizer with optimized parameters
         self.tfidf_vectorizer = TfidfVectorizer(
             max_features=5000,
@@ -123,13 +182,15 @@ class InternshipRecommendationEngine:
         )
         
         # Fit and transform the combined text
-        self.tfidf_matrix = self.tfidf_vectorizer.fit_transform(self.df['combined_text'])
+        self.tfidf_matrix = self.tfidf_vectorizer.fit_transform(combined_text)
         
         print(f"📈 TF-IDF matrix shape: {self.tfidf_matrix.shape}")
         print(f"🔤 Vocabulary size: {len(self.tfidf_vectorizer.vocabulary_)}")
     
-    def _create_skill_matrix(self) -> None:
+    def _create_skill_matrix(self, skills_text: List[str]) -> None:
         """Create skill-based matrix for direct skill matching"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
         self.skill_vectorizer = TfidfVectorizer(
             max_features=1000,
             ngram_range=(1, 1),
@@ -138,123 +199,290 @@ class InternshipRecommendationEngine:
             token_pattern=r'\b[a-zA-Z+#.]{2,}\b'  # Include programming languages like C++, C#
         )
         
-        self.skill_matrix = self.skill_vectorizer.fit_transform(self.df['skills_text'])
+        self.skill_matrix = self.skill_vectorizer.fit_transform(skills_text)
         print(f"🛠️ Skill matrix shape: {self.skill_matrix.shape}")
     
-    def _calculate_content_similarity(self, user_query: str) -> np.ndarray:
+    def _compact(self) -> None:
+        """
+        Release build-only state and store the sparse matrices in canonical form
+        
+        Keeps the long-lived engine small and its arrays in a few contiguous
+        buffers, so pre-forked workers can share it copy-on-write.
+        """
+        # Terms pruned by max_df/max_features are kept only for introspection
+        for vectorizer in (self.tfidf_vectorizer, self.skill_vectorizer):
+            if getattr(vectorizer, 'stop_words_', None) is not None:
+                vectorizer.stop_words_ = None
+        
+        for matrix in (self.tfidf_matrix, self.skill_matrix):
+            matrix.sort_indices()
+            matrix.data = np.ascontiguousarray(matrix.data)
+            matrix.indices = np.ascontiguousarray(matrix.indices)
+            matrix.indptr = np.ascontiguousarray(matrix.indptr)
+    
+    def _build_scoring_operator(self) -> None:
+        """
+        Stack the content and skill TF-IDF matrices column-wise into one CSR operator
+        
+        Both matrices are already L2-normalized by their vectorizers, so one
+        mat-vec against a query vector holding both weighted query parts yields
+        the weighted sum of the two cosine similarities.
+        """
+        from scipy import sparse
+        
+        self.scoring_operator = sparse.hstack([self.tfidf_matrix, self.skill_matrix], format='csr')
+        self.scoring_operator.sort_indices()
+    
+    def memory_map_matrices(self, directory: str) -> Dict[str, int]:
+        """
+        Move the sparse matrix buffers into .npy files and map them back read-only
+        
+        Worker processes forked afterwards read the scoring operator, its
+        sector partitions and the TF-IDF matrices from the shared page cache
+        instead of each holding a private copy.
+        
+        Args:
+            directory: Index directory for the .npy files (created if missing)
+        
+        Returns:
+            Bytes written per matrix name
+        """
+        os.makedirs(directory, exist_ok=True)
+        matrices = {
+            'tfidf': self.tfidf_matrix,
+            'skill': self.skill_matrix,
+            'operator': self.scoring_operator,
+        }
+        if self.sector_partitions is not None:
+            for code, operator in enumerate(self.sector_partitions.operators):
+                matrices[f'sector_{code}'] = operator
+        
+        sizes = {}
+        for name, matrix in matrices.items():
+            sizes[name] = 0
+            for part in ('data', 'indices', 'indptr'):
+                path = os.path.join(directory, f"{name}.{part}.npy")
+                np.save(path, getattr(matrix, part))
+                mapped = np.load(path, mmap_mode='r')
+                setattr(matrix, part, mapped)
+                sizes[name] += mapped.nbytes
+        return sizes
+    
+    def get_sectors(self) -> Dict[str, List[str]]:
+        """Available sectors in the catalog"""
+        sectors = list(set([internship["sector"] for internship in self.internships]))
+        return {"sectors": sorted(sectors)}
+    
+    def get_locations(self) -> Dict[str, List[str]]:
+        """Available states and cities in the catalog"""
+        states = list(set([internship["location_state"] for internship in self.internships]))
+        cities = list(set([internship["location_city"] for internship in self.internships]))
+        
+        return {
+            "states": sorted([state for state in states if state != "Multiple"]),
+            "cities": sorted(cities)
+        }
+    
+    def get_skills(self) -> Dict[str, List[str]]:
+        """Available skills across all internships"""
+        all_skills = set()
+        for internship in self.internships:
+            all_skills.update(internship["skills_required"])
+        
+        return {"skills": sorted(list(all_skills))}
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Catalog statistics (open listings only when expired ones are excluded)"""
+        internships = self.internships
+        expired = 0
+        if self.exclude_expired:
+            open_rows = self.catalog_index.open_rows(date.today())
+            internships = [self.internships[i] for i in open_rows]
+            expired = len(self.internships) - len(internships)
+        
+        sectors = list(set([i["sector"] for i in internships]))
+        companies = list(set([i["company"] for i in internships]))
+        locations = list(set([i["location_city"] for i in internships]))
+        sector_dist = Counter([i["sector"] for i in internships])
+        
+        return {
+            "total_internships": len(internships),
+            "total_sectors": len(sectors),
+            "total_companies": len(companies),
+            "total_locations": len(locations),
+            "sector_distribution": dict(sector_dist),
+            "sectors": sorted(sectors),
+            "top_companies": sorted(companies)[:10],
+            "expired_internships": expired
+        }
+    
+    def _build_catalog_payloads(self) -> None:
+        """Encode and precompress the catalog-wide endpoint responses once per load"""
+        self.catalog_payloads = {
+            "sectors": PrecompressedPayload.from_object(self.get_sectors()),
+            "locations": PrecompressedPayload.from_object(self.get_locations()),
+            "skills": PrecompressedPayload.from_object(self.get_skills()),
+            "stats": PrecompressedPayload.from_object(self.get_statistics()),
+        }
+        self._stats_day = date.today()
+    
+    def get_catalog_payload(self, name: str) -> PrecompressedPayload:
+        """Precompressed catalog payload; stats are rebuilt once a day as listings expire"""
+        if name == "stats" and self.exclude_expired and self._stats_day != date.today():
+            self.catalog_payloads = {
+                **self.catalog_payloads,
+                "stats": PrecompressedPayload.from_object(self.get_statistics())
+            }
+            self._stats_day = date.today()
+        return self.catalog_payloads[name]
+    
+    def filter_rows(self, education: str,
+                    min_stipend: Optional[int] = None,
+                    min_duration_weeks: Optional[int] = None,
+                    max_duration_weeks: Optional[int] = None,
+                    open_only: bool = False,
+                    strict_eligibility: bool = False) -> Optional[np.ndarray]:
+        """
+        Resolve hard filters to the catalog rows that survive them
+        
+        Args:
+            education: User's education level (used for strict eligibility)
+            min_stipend: Minimum monthly stipend in rupees
+            min_duration_weeks: Minimum duration in weeks
+            max_duration_weeks: Maximum duration in weeks
+            open_only: Exclude listings whose application deadline has passed
+            strict_eligibility: Exclude listings requiring a higher education level
+        
+        Returns:
+            Row indices to score, or None when every row survives
+        """
+        return self.catalog_index.filter_rows(
+            min_stipend=min_stipend,
+            min_duration_weeks=min_duration_weeks,
+            max_duration_weeks=max_duration_weeks,
+            open_on=date.today() if (open_only or self.exclude_expired) else None,
+            max_education_level=(
+                self.education_hierarchy.get(education, 0) if strict_eligibility else None
+            )
+        )
+    
+    def _row_count(self, rows: Optional[np.ndarray]) -> int:
+        """Number of rows being scored (all internships when rows is None)"""
+        return len(self.internships) if rows is None else len(rows)
+    
+    def _calculate_content_similarity(self, user_query: str,
+                                      rows: Optional[np.ndarray] = None) -> np.ndarray:
         """Calculate content similarity using TF-IDF and cosine similarity"""
         try:
             # Transform user query using fitted vectorizer
             user_vector = self.tfidf_vectorizer.transform([user_query])
+            matrix = self.tfidf_matrix if rows is None else self.tfidf_matrix[rows]
             
             # Calculate cosine similarity
-            content_similarities = cosine_similarity(user_vector, self.tfidf_matrix).flatten()
+            content_similarities = _cosine_scores(user_vector, matrix)
             
             return content_similarities
         except Exception as e:
             print(f"Error calculating content similarity: {e}")
-            return np.zeros(len(self.internships))
+            return np.zeros(self._row_count(rows))
     
-    def _calculate_skill_similarity(self, user_skills: List[str]) -> np.ndarray:
-        """Calculate skill-based similarity"""
+    def _calculate_skill_tfidf_similarity(self, user_skills: List[str],
+                                          rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Calculate TF-IDF cosine similarity between user skills and required skills"""
         try:
             # Normalize user skills
             user_skills_text = ' '.join([skill.lower().strip() for skill in user_skills])
             user_skill_vector = self.skill_vectorizer.transform([user_skills_text])
+            matrix = self.skill_matrix if rows is None else self.skill_matrix[rows]
             
             # Calculate cosine similarity for skills
-            skill_similarities = cosine_similarity(user_skill_vector, self.skill_matrix).flatten()
-            
-            # Also calculate direct skill overlap
-            direct_matches = []
-            user_skills_lower = [skill.lower() for skill in user_skills]
-            
-            for internship in self.internships:
-                internship_skills_lower = [skill.lower() for skill in internship['skills_required']]
-                
-                # Count matching skills
-                matches = len(set(user_skills_lower) & set(internship_skills_lower))
-                total_user_skills = len(user_skills_lower)
-                total_internship_skills = len(internship_skills_lower)
-                
-                # Calculate Jaccard similarity for skills
-                if total_user_skills + total_internship_skills == 0:
-                    direct_similarity = 0
-                else:
-                    union_size = len(set(user_skills_lower) | set(internship_skills_lower))
-                    direct_similarity = matches / union_size if union_size > 0 else 0
-                
-                direct_matches.append(direct_similarity)
-            
-            # Combine TF-IDF skill similarity with direct matching
-            combined_skill_scores = (0.6 * skill_similarities + 0.4 * np.array(direct_matches))
-            
-            return combined_skill_scores
+            return _cosine_scores(user_skill_vector, matrix)
         except Exception as e:
             print(f"Error calculating skill similarity: {e}")
-            return np.zeros(len(self.internships))
+            return np.zeros(self._row_count(rows))
     
-    def _calculate_education_compatibility(self, user_education: str) -> np.ndarray:
+    def _calculate_skill_overlap(self, user_skills: List[str],
+                                 rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Calculate direct skill overlap (Jaccard similarity of skill sets)"""
+        try:
+            overlap = self.catalog_index.skill_overlap(user_skills)
+            return overlap if rows is None else overlap[rows]
+        except Exception as e:
+            print(f"Error calculating skill overlap: {e}")
+            return np.zeros(self._row_count(rows))
+    
+    def _calculate_skill_similarity(self, user_skills: List[str],
+                                    rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Calculate skill-based similarity"""
+        # Combine TF-IDF skill similarity with direct matching
+        return (
+            self.skill_blend * self._calculate_skill_tfidf_similarity(user_skills, rows) +
+            (1 - self.skill_blend) * self._calculate_skill_overlap(user_skills, rows)
+        )
+    
+    def _calculate_education_compatibility(self, user_education: str,
+                                           rows: Optional[np.ndarray] = None) -> np.ndarray:
         """Calculate education compatibility scores"""
+        required_levels = self.catalog_index.education_levels
+        return self._education_level_scores(user_education)[
+            required_levels if rows is None else required_levels[rows]
+        ]
+    
+    def _education_level_scores(self, user_education: str) -> np.ndarray:
+        """Education compatibility for each required education level"""
         user_level = self.education_hierarchy.get(user_education, 0)
-        education_scores = []
-        
-        for internship in self.internships:
-            required_education = internship['education_requirement']
-            required_level = self.education_hierarchy.get(required_education, 0)
-            
-            if user_level >= required_level:
-                # User exceeds or meets requirement
-                education_scores.append(1.0)
-            elif user_level == required_level - 1:
-                # User is one level below (might still be eligible)
-                education_scores.append(0.7)
-            else:
-                # User doesn't meet requirement
-                education_scores.append(0.1)
+        required_levels = np.arange(self.catalog_index.max_level + 1)
         
-        return np.array(education_scores)
+        # Meets or exceeds requirement -> 1.0, one level below (might still be eligible) -> 0.7
+        return np.where(
+            user_level >= required_levels, 1.0,
+            np.where(user_level == required_levels - 1, 0.7, 0.1)
+        )
     
-    def _calculate_location_preference(self, user_location_state: Optional[str]) -> np.ndarray:
+    def _calculate_location_preference(self, user_location_state: Optional[str],
+                                       rows: Optional[np.ndarray] = None) -> np.ndarray:
         """Calculate location preference scores"""
         if not user_location_state:
-            return np.ones(len(self.internships))  # No preference
+            return np.ones(self._row_count(rows))  # No preference
         
-        location_scores = []
+        codes = self.catalog_index.location_codes
+        return self._location_pair_scores(user_location_state)[codes if rows is None else codes[rows]]
+    
+    def _location_pair_scores(self, user_location_state: str) -> np.ndarray:
+        """Location preference for each distinct (state, city) pair"""
         user_state_lower = user_location_state.lower()
+        pair_scores = []
         
-        for internship in self.internships:
-            internship_state = internship['location_state'].lower()
-            internship_city = internship['location_city'].lower()
-            
+        for internship_state, internship_city in self.catalog_index.location_values:
             if (user_state_lower in internship_state or 
                 internship_state in user_state_lower or
                 user_state_lower in internship_city):
-                location_scores.append(1.0)
+                pair_scores.append(1.0)
             elif internship_state == 'multiple':
-                location_scores.append(0.8)  # Multiple locations might include user's state
+                pair_scores.append(0.8)  # Multiple locations might include user's state
             else:
-                location_scores.append(0.3)  # Different state
+                pair_scores.append(0.3)  # Different state
         
-        return np.array(location_scores)
+        return np.array(pair_scores)
     
-    def _calculate_sector_preference(self, user_sectors: Optional[List[str]]) -> np.ndarray:
+    def _calculate_sector_preference(self, user_sectors: Optional[List[str]],
+                                     rows: Optional[np.ndarray] = None) -> np.ndarray:
         """Calculate sector preference scores"""
         if not user_sectors:
-            return np.ones(len(self.internships))  # No preference
+            return np.ones(self._row_count(rows))  # No preference
         
-        sector_scores = []
+        codes = self.catalog_index.sector_codes
+        return self._sector_value_scores(user_sectors)[codes if rows is None else codes[rows]]
+    
+    def _sector_value_scores(self, user_sectors: List[str]) -> np.ndarray:
+        """Sector preference for each distinct sector"""
         user_sectors_lower = [sector.lower() for sector in user_sectors]
         
-        for internship in self.internships:
-            internship_sector = internship['sector'].lower()
-            
-            if internship_sector in user_sectors_lower:
-                sector_scores.append(1.0)
-            else:
-                sector_scores.append(0.5)  # Not preferred but still possible
-        
-        return np.array(sector_scores)
+        # Preferred sectors score 1.0; others 0.5 (not preferred but still possible)
+        return np.array([
+            1.0 if sector in user_sectors_lower else 0.5
+            for sector in self.catalog_index.sector_values
+        ])
     
     def _generate_explanation(self, internship: Dict, user_skills: List[str], 
                             similarity_score: float, user_education: str,
@@ -302,10 +530,597 @@ class InternshipRecommendationEngine:
         
         return "; ".join(explanations) if explanations else "Matches your profile"
     
+    @staticmethod
+    def _user_query(education: str, skills: List[str], sectors: Optional[List[str]]) -> str:
+        """User query text for content similarity"""
+        user_query = f"{education} {' '.join(skills)}"
+        if sectors:
+            user_query += f" {' '.join(sectors)}"
+        return user_query
+    
+    def compute_components(self, education: str, skills: List[str],
+                           sectors: Optional[List[str]] = None,
+                           location_state: Optional[str] = None,
+                           rows: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Compute the raw scoring components for a user profile
+        
+        Skill match is kept as its two parts (TF-IDF similarity and direct
+        overlap) so callers can re-weight them without recomputing anything.
+        
+        Args:
+            education: User's education level
+            skills: List of user's skills
+            sectors: Preferred sectors (optional)
+            location_state: Preferred state (optional)
+            rows: Catalog rows to score (all rows when None)
+        
+        Returns:
+            Component name -> score per scored row
+        """
+        return {
+            'content_similarity': self._calculate_content_similarity(
+                self._user_query(education, skills, sectors), rows
+            ),
+            'skill_tfidf': self._calculate_skill_tfidf_similarity(skills, rows),
+            'skill_overlap': self._calculate_skill_overlap(skills, rows),
+            'education_match': self._calculate_education_compatibility(education, rows),
+            'location_preference': self._calculate_location_preference(location_state, rows),
+            'sector_preference': self._calculate_sector_preference(sectors, rows)
+        }
+    
+    def combine_components(self, components: Dict[str, np.ndarray],
+                           weights: Optional[Dict[str, float]] = None,
+                           skill_blend: Optional[float] = None) -> np.ndarray:
+        """
+        Weighted combination of scoring components into final scores
+        
+        Args:
+            components: Output of compute_components
+            weights: Component weights (defaults to self.weights)
+            skill_blend: TF-IDF share of skill_match (defaults to self.skill_blend)
+        """
+        weights = weights or self.weights
+        skill_blend = self.skill_blend if skill_blend is None else skill_blend
+        skill_similarities = (
+            skill_blend * components['skill_tfidf'] +
+            (1 - skill_blend) * components['skill_overlap']
+        )
+        
+        return (
+            weights['content_similarity'] * components['content_similarity'] +
+            weights['skill_match'] * skill_similarities +
+            weights['education_match'] * components['education_match'] +
+            weights['location_preference'] * components['location_preference'] +
+            weights['sector_preference'] * components['sector_preference']
+        )
+    
+    def _scoring_terms(self, education: str, skills: List[str],
+                       sectors: Optional[List[str]] = None,
+                       location_state: Optional[str] = None,
+                       weights: Optional[Dict[str, float]] = None,
+                       skill_blend: Optional[float] = None,
+                       user: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Per-request parts of the fused score: the weighted query vector and weighted per-value tables
+        
+        Location and sector tables are None when the user has no preference
+        (every row then gets the full weight).
+        """
+        weights = weights or self.weights
+        skill_blend = self.skill_blend if skill_blend is None else skill_blend
+        
+        # Weighted query: [content query | skill query]
+        content_vector = self.tfidf_vectorizer.transform([self._user_query(education, skills, sectors)])
+        skill_vector = self.skill_vectorizer.transform(
+            [' '.join([skill.lower().strip() for skill in skills])]
+        )
+        content_width = self.tfidf_matrix.shape[1]
+        query = np.zeros(self.scoring_operator.shape[1])
+        query[content_vector.indices] = weights['content_similarity'] * content_vector.data
+        query[content_width + skill_vector.indices] = (
+            weights['skill_match'] * skill_blend * skill_vector.data
+        )
+        
+        return {
+            'weights': weights,
+            'query': query,
+            'overlap_weight': weights['skill_match'] * (1 - skill_blend),
+            'education': weights['education_match'] * self._education_level_scores(education),
+            'location': (
+                weights['location_preference'] * self._location_pair_scores(location_state)
+                if location_state else None
+            ),
+            'sector': (
+                weights['sector_preference'] * self._sector_value_scores(sectors)
+                if sectors else None
+            ),
+            'congestion': self.congestion_penalties(),
+            'collaborative': self.collaborative_scores(weights, user),
+        }
+    
+    @property
+    def collaborative(self):
+        """Attached collaborative model (None without one)"""
+        return self._collaborative[0]
+    
+    @property
+    def collaborative_factors(self) -> Optional[np.ndarray]:
+        """Listing factors of the attached model aligned to catalog rows"""
+        return self._collaborative[1]
+    
+    def attach_collaborative(self, model) -> None:
+        """
+        Use a trained collaborative model, aligning its listing factors to the catalog rows
+        
+        Safe while serving: the model and its factors are replaced by one assignment,
+        so a concurrent request scores with either the old or the new pair.
+        """
+        self._collaborative = (model, None if model is None else model.item_factors_for(self.row_ids))
+    
+    def collaborative_scores(self, weights: Optional[Dict[str, float]] = None,
+                             user: Optional[int] = None) -> Optional[np.ndarray]:
+        """
+        Weighted collaborative score per catalog row: one dense mat-vec of the listing factors
+        
+        Args:
+            weights: Component weights (defaults to self.weights)
+            user: Event-log user key (app.event_log.user_key); unknown users get the mean user vector
+        
+        Returns:
+            Scores in [0, weight], or None when the weight is 0 or no model is attached
+        """
+        weight = (weights or self.weights).get('collaborative', 0.0)
+        model, factors = self._collaborative
+        if weight <= 0 or factors is None:
+            return None
+        scores = factors @ model.user_vector(user or 0)
+        np.clip(scores, 0.0, 1.0, out=scores)
+        return np.multiply(scores, weight, dtype=np.float64)
+    
+    def congestion_penalties(self) -> Optional[np.ndarray]:
+        """
+        Congestion penalty per catalog row from the live listing counters (None when disabled)
+        
+        The counters are gathered at most once per congestion_refresh_seconds and
+        the array is replaced by a single assignment, so concurrent requests
+        read either the old or the new penalties and never wait on updates.
+        The penalty is non-negative, so sector partition upper bounds stay valid.
+        """
+        counters = self.listing_counters
+        if counters is None or self.congestion_weight <= 0:
+            return None
+        now = time.monotonic()
+        cached = self._congestion
+        if cached is not None and now - cached[0] < self.congestion_refresh_seconds:
+            return cached[1]
+        values = counters.gather(self.row_ids)
+        penalties = congestion_penalty(
+            values[SEATS], values[APPLICATIONS], self.congestion_weight, self.congestion_saturation
+        )
+        self._congestion = (now, penalties)
+        return penalties
+    
+    def _apply_terms(self, terms: Dict[str, Any], operator, overlap: np.ndarray,
+                     rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Final scores of the operator's rows
+        
+        Args:
+            terms: Output of _scoring_terms
+            operator: Scoring operator rows to score
+            overlap: Skill overlap of those rows (overwritten; used as the scratch buffer)
+            rows: Catalog rows of the operator rows (all rows when None)
+        """
+        index = self.catalog_index
+        weights = terms['weights']
+        scores = operator @ terms['query']
+        scratch = overlap
+        
+        # Accumulate the remaining parts in place
+        scratch *= terms['overlap_weight']
+        scores += scratch
+        
+        education_codes = index.education_levels if rows is None else index.education_levels[rows]
+        np.take(terms['education'], education_codes, out=scratch)
+        scores += scratch
+        
+        if terms['location'] is not None:
+            location_codes = index.location_codes if rows is None else index.location_codes[rows]
+            np.take(terms['location'], location_codes, out=scratch)
+            scores += scratch
+        else:
+            scores += weights['location_preference']
+        
+        if terms['sector'] is not None:
+            sector_codes = index.sector_codes if rows is None else index.sector_codes[rows]
+            np.take(terms['sector'], sector_codes, out=scratch)
+            scores += scratch
+        else:
+            scores += weights['sector_preference']
+        
+        if terms['collaborative'] is not None:
+            if rows is None:
+                scores += terms['collaborative']
+            else:
+                np.take(terms['collaborative'], rows, out=scratch)
+                scores += scratch
+        
+        if terms['congestion'] is not None:
+            if rows is None:
+                scores -= terms['congestion']
+            else:
+                np.take(terms['congestion'], rows, out=scratch)
+                scores -= scratch
+        
+        return scores
+    
+    def score_rows(self, education: str, skills: List[str],
+                   sectors: Optional[List[str]] = None,
+                   location_state: Optional[str] = None,
+                   rows: Optional[np.ndarray] = None,
+                   weights: Optional[Dict[str, float]] = None,
+                   skill_blend: Optional[float] = None,
+                   user: Optional[int] = None) -> np.ndarray:
+        """
+        Final scores in one fused pass (apart from the collaborative and congestion
+        terms, the same result as combine_components(compute_components(...)))
+        
+        The weighted content and skill TF-IDF similarities come from a single
+        mat-vec of the stacked operator; the direct skill overlap and the
+        categorical parts are gathered from per-value tables into one scratch
+        buffer and accumulated into the score array in place.
+        
+        Args:
+            education: User's education level
+            skills: List of user's skills
+            sectors: Preferred sectors (optional)
+            location_state: Preferred state (optional)
+            rows: Catalog rows to score (all rows when None)
+            weights: Component weights (defaults to self.weights)
+            skill_blend: TF-IDF share of skill_match (defaults to self.skill_blend)
+            user: Event-log user key for the collaborative component (optional)
+        """
+        terms = self._scoring_terms(education, skills, sectors, location_state, weights, skill_blend, user)
+        operator = self.scoring_operator if rows is None else self.scoring_operator[rows]
+        overlap = self.catalog_index.skill_overlap(skills)
+        if rows is not None:
+            overlap = overlap[rows]
+        return self._apply_terms(terms, operator, overlap, rows)
+    
+    def score_sector_partitions(self, education: str, skills: List[str],
+                                sectors: List[str],
+                                location_state: Optional[str] = None,
+                                rows: Optional[np.ndarray] = None,
+                                k: int = 5,
+                                weights: Optional[Dict[str, float]] = None,
+                                skill_blend: Optional[float] = None,
+                                user: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score the preferred sectors' partitions first and skip the others when they cannot reach the top k
+        
+        A partition is skipped only if its score upper bound is below both the
+        k-th best score found so far and MIN_SIMILARITY, so the top k of the
+        returned rows (ties broken by ascending row) equals the top k of
+        score_rows over the same rows.
+        
+        Args:
+            education, skills, sectors, location_state, weights, skill_blend, user: As in score_rows
+            rows: Catalog rows that survived the hard filters (all rows when None)
+            k: Number of results the caller will select
+        
+        Returns:
+            (scored catalog rows in ascending order, their final scores)
+        """
+        terms = self._scoring_terms(education, skills, sectors, location_state, weights, skill_blend, user)
+        partitions = self.sector_partitions
+        known, skill_count = self.catalog_index.known_skills(skills)
+        
+        allowed = None
+        if rows is not None:
+            allowed = np.zeros(self.catalog_index.size, dtype=bool)
+            allowed[rows] = True
+        
+        scored_rows, scored = [], []
+        
+        def score_partition(code: int) -> None:
+            # Scoring the whole partition and dropping filtered rows is cheaper than slicing the operator
+            part_rows = partitions.rows[code]
+            overlap = partitions.skill_overlap(code, known, skill_count)
+            scores = self._apply_terms(terms, partitions.operators[code], overlap, part_rows)
+            if allowed is not None:
+                keep = allowed[part_rows]
+                part_rows, scores = part_rows[keep], scores[keep]
+            if len(part_rows):
+                scored_rows.append(part_rows)
+                scored.append(scores)
+        
+        preferred = self._sector_value_scores(sectors) == 1.0
+        for code in np.flatnonzero(preferred):
+            score_partition(code)
+        
+        # Any row that can still make the top k must beat the k-th best preferred score
+        threshold = MIN_SIMILARITY
+        found = sum(len(part) for part in scored)
+        if found >= k:
+            threshold = max(threshold, np.partition(np.concatenate(scored), found - k)[found - k])
+        
+        bounds = partitions.upper_bounds(
+            terms['query'], terms['overlap_weight'], known, skill_count, terms['education'],
+            terms['weights']['location_preference'] if terms['location'] is None else terms['location'],
+            terms['sector']
+        )
+        if terms['collaborative'] is not None:
+            # The partition bounds cover the content parts; the collaborative part adds at most its maximum
+            bounds = bounds + terms['collaborative'].max()
+        for code in np.flatnonzero(~preferred):
+            # Small margin so rounding in the bound can never drop a tied row
+            if bounds[code] + 1e-9 >= threshold:
+                score_partition(code)
+        
+        if not scored_rows:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        all_rows = np.concatenate(scored_rows)
+        order = np.argsort(all_rows, kind='stable')
+        return all_rows[order], np.concatenate(scored)[order]
+    
+    def score_within_deadline(self, education: str, skills: List[str],
+                              sectors: Optional[List[str]] = None,
+                              location_state: Optional[str] = None,
+                              rows: Optional[np.ndarray] = None,
+                              deadline: Optional[float] = None,
+                              weights: Optional[Dict[str, float]] = None,
+                              skill_blend: Optional[float] = None,
+                              user: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, bool]:
+        """
+        Score rows in chunks, most promising first, until done or the deadline passes
+        
+        Rows are ordered by a cheap prior: listings sharing a skill with the
+        user (from the inverted skill index, so this costs time proportional
+        to the matches rather than the catalog), preferred sectors first, then
+        the remaining listings. The first chunk is always scored; the deadline
+        is checked before each further chunk. When every chunk is scored the
+        result equals score_rows.
+        
+        Args:
+            education, skills, sectors, location_state, weights, skill_blend, user: As in score_rows
+            rows: Catalog rows that survived the hard filters (all rows when None)
+            deadline: time.perf_counter() value to stop at (no limit when None)
+        
+        Returns:
+            (scored catalog rows in ascending order, their final scores, True if rows were skipped)
+        """
+        terms = self._scoring_terms(education, skills, sectors, location_state, weights, skill_blend, user)
+        index = self.catalog_index
+        preferred = self._sector_value_scores(sectors) == 1.0 if sectors else None
+        
+        candidates, candidate_overlap = index.skill_candidates(skills)
+        if rows is not None:
+            position = np.minimum(np.searchsorted(rows, candidates), len(rows) - 1)
+            surviving = rows[position] == candidates
+            candidates, candidate_overlap = candidates[surviving], candidate_overlap[surviving]
+        
+        def prior_groups():
+            """(ascending rows, their skill overlap) groups in prior order"""
+            def by_sector(group_rows, overlap):
+                if preferred is None:
+                    yield group_rows, overlap
+                    return
+                in_preferred = preferred[index.sector_codes[group_rows]]
+                yield group_rows[in_preferred], overlap[in_preferred]
+                yield group_rows[~in_preferred], overlap[~in_preferred]
+            
+            yield from by_sector(candidates, candidate_overlap)
+            # Only reached with budget to spare: everything else has no skill overlap
+            remaining = np.ones(index.size, dtype=bool)
+            if rows is not None:
+                remaining[:] = False
+                remaining[rows] = True
+            remaining[candidates] = False
+            remaining_rows = np.flatnonzero(remaining)
+            yield from by_sector(remaining_rows, np.zeros(len(remaining_rows)))
+        
+        scored_rows, scored = [], []
+        chunk_rows = max(int(self.budget_chunk_rows), 1)
+        out_of_time = False
+        for group_rows, overlap in prior_groups():
+            for start in range(0, len(group_rows), chunk_rows):
+                if scored and deadline is not None and time.perf_counter() >= deadline:
+                    out_of_time = True
+                    break
+                chunk = group_rows[start:start + chunk_rows]
+                scored_rows.append(chunk)
+                scored.append(self._apply_terms(
+                    terms, self.scoring_operator[chunk], overlap[start:start + chunk_rows].copy(), chunk
+                ))
+            if out_of_time:
+                break
+        
+        if not scored_rows:
+            return np.empty(0, dtype=np.int64), np.empty(0), False
+        all_rows = np.concatenate(scored_rows)
+        partial = len(all_rows) < self._row_count(rows)
+        order = np.argsort(all_rows, kind='stable')
+        return all_rows[order], np.concatenate(scored)[order], partial
+    
+    def _score_pool(self, education: str, skills: List[str],
+                    sectors: Optional[List[str]], location_state: Optional[str],
+                    rows: Optional[np.ndarray], pool_size: int,
+                    weights: Optional[Dict[str, float]], skill_blend: Optional[float],
+                    deadline: Optional[float] = None,
+                    user: Optional[int] = None) -> Tuple[Optional[np.ndarray], np.ndarray, bool]:
+        """
+        Score the filtered rows with the cheapest exact strategy for the request
+        
+        Returns:
+            (scored catalog rows or None for all rows, their scores, True if the deadline cut scoring short)
+        """
+        if deadline is not None:
+            # Most promising chunks first; rows and scores cover only the chunks scored in time
+            return self.score_within_deadline(
+                education, skills, sectors, location_state, rows, deadline, weights, skill_blend, user
+            )
+        if sectors and self.sector_pruning and min((weights or self.weights).values()) >= 0:
+            # Preferred sectors first; rows and scores cover only the partitions that were scored
+            rows, final_scores = self.score_sector_partitions(
+                education, skills, sectors, location_state, rows, pool_size, weights, skill_blend, user
+            )
+            return rows, final_scores, False
+        # Weighted similarity of every surviving row in one fused pass
+        return rows, self.score_rows(
+            education, skills, sectors, location_state, rows, weights, skill_blend, user
+        ), False
+    
+    def _diversify(self, candidates: np.ndarray, final_scores: np.ndarray,
+                   rows: Optional[np.ndarray], max_results: int,
+                   diversity: Dict[str, Any]) -> np.ndarray:
+        """Re-rank a candidate pool with MMR over TF-IDF rows plus company/sector caps"""
+        catalog_rows = candidates if rows is None else rows[candidates]
+        diversity_lambda = self.diversity_lambda if diversity.get('diversify') else 1.0
+        
+        selected = mmr_rerank(
+            relevance=final_scores[candidates],
+            vectors=self.tfidf_matrix[catalog_rows],
+            k=max_results,
+            diversity_lambda=diversity_lambda,
+            company_codes=self.catalog_index.company_codes[catalog_rows],
+            max_per_company=diversity.get('max_per_company'),
+            sector_codes=self.catalog_index.sector_codes[catalog_rows],
+            max_per_sector=diversity.get('max_per_sector')
+        )
+        return candidates[selected]
+    
+    def get_recommendation_rows(self, education: str, skills: List[str],
+                                sectors: Optional[List[str]] = None,
+                                location_state: Optional[str] = None,
+                                max_results: int = 5,
+                                filters: Optional[Dict[str, Any]] = None,
+                                diversity: Optional[Dict[str, Any]] = None,
+                                weights: Optional[Dict[str, float]] = None,
+                                skill_blend: Optional[float] = None,
+                                user: Optional[int] = None) -> List[Tuple[int, float, str]]:
+        """
+        Rank internships for a user without copying catalog rows
+        
+        Args:
+            education: User's education level
+            skills: List of user's skills
+            sectors: Preferred sectors (optional)
+            location_state: Preferred state (optional)
+            max_results: Maximum number of results to return
+            filters: Hard filters applied before scoring (see filter_rows)
+            diversity: Re-ranking options - diversify (MMR), max_per_company, max_per_sector
+            weights: Component weights of the selected weight profile (defaults to self.weights)
+            skill_blend: TF-IDF share of skill_match for the profile (defaults to self.skill_blend)
+            user: Event-log user key for the collaborative component (optional)
+        
+        Returns:
+            List of (row index, similarity score, explanation) tuples, best first
+        """
+        return self.rank_rows(
+            education, skills, sectors, location_state, max_results, filters, diversity, weights, skill_blend,
+            user=user
+        )[0]
+    
+    def rank_rows(self, education: str, skills: List[str],
+                  sectors: Optional[List[str]] = None,
+                  location_state: Optional[str] = None,
+                  max_results: int = 5,
+                  filters: Optional[Dict[str, Any]] = None,
+                  diversity: Optional[Dict[str, Any]] = None,
+                  weights: Optional[Dict[str, float]] = None,
+                  skill_blend: Optional[float] = None,
+                  deadline: Optional[float] = None,
+                  user: Optional[int] = None) -> Tuple[List[Tuple[int, float, str]], bool]:
+        """
+        Rank internships for a user, optionally within a latency budget
+        
+        Args:
+            education, skills, sectors, location_state, max_results, filters,
+            diversity, weights, skill_blend, user: As in get_recommendation_rows
+            deadline: time.perf_counter() value after which scoring stops early and
+                the best results found so far are returned (see score_within_deadline)
+        
+        Returns:
+            (list of (row index, similarity score, explanation) tuples best first,
+            True if some rows were not scored)
+        """
+        if not self.internships:
+            raise ValueError("No internship data loaded")
+        
+        # Hard filters restrict scoring to the surviving rows
+        rows = self.filter_rows(education, **(filters or {}))
+        if rows is not None and len(rows) == 0:
+            return [], False
+        
+        diversity = diversity or {}
+        rerank = bool(
+            diversity.get('diversify') or diversity.get('max_per_company') or diversity.get('max_per_sector')
+        )
+        pool_size = max(self.diversity_pool_size, max_results) if rerank else max_results
+        rows, final_scores, partial = self._score_pool(
+            education, skills, sectors, location_state, rows, pool_size, weights, skill_blend, deadline, user
+        )
+        
+        # Select the candidate pool with O(n) top-k instead of a full sort
+        candidates = top_k_indices(final_scores, pool_size)
+        
+        # Skip if similarity too low (below MIN_SIMILARITY)
+        candidates = candidates[final_scores[candidates] >= MIN_SIMILARITY]
+        
+        if rerank:
+            candidates = self._diversify(candidates, final_scores, rows, max_results, diversity)
+        
+        results = []
+        for position in candidates[:max_results]:
+            idx = int(position if rows is None else rows[position])
+            internship = self.internships[idx]
+            similarity_score = float(final_scores[position])
+            
+            # Generate explanation
+            explanation = self._generate_explanation(
+                internship, skills, similarity_score, education,
+                location_state, sectors
+            )
+            
+            results.append((idx, similarity_score, explanation))
+        
+        return results, partial
+    
+    def top_rows(self, education: str, skills: List[str],
+                 sectors: Optional[List[str]] = None,
+                 location_state: Optional[str] = None,
+                 k: int = 20,
+                 filters: Optional[Dict[str, Any]] = None,
+                 weights: Optional[Dict[str, float]] = None,
+                 skill_blend: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best k catalog rows for a user without explanations or re-ranking (for batch jobs)
+        
+        Args:
+            education, skills, sectors, location_state, filters, weights, skill_blend: As in get_recommendation_rows
+            k: Number of rows to return
+        
+        Returns:
+            (catalog rows best first, their scores); rows below MIN_SIMILARITY are left out
+        """
+        rows = self.filter_rows(education, **(filters or {}))
+        if rows is not None and len(rows) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        rows, final_scores, _ = self._score_pool(
+            education, skills, sectors, location_state, rows, k, weights, skill_blend
+        )
+        positions = top_k_indices(final_scores, k)
+        positions = positions[final_scores[positions] >= MIN_SIMILARITY]
+        return (positions if rows is None else rows[positions]), final_scores[positions]
+    
     def get_recommendations(self, education: str, skills: List[str], 
                           sectors: Optional[List[str]] = None,
                           location_state: Optional[str] = None,
-                          max_results: int = 5) -> List[Dict[str, Any]]:
+                          max_results: int = 5,
+                          filters: Optional[Dict[str, Any]] = None,
+                          diversity: Optional[Dict[str, Any]] = None,
+                          time_budget: Optional[float] = None) -> List[Dict[str, Any]]:
         """
         Get personalized internship recommendations with high accuracy
         
@@ -315,6 +1130,10 @@ class InternshipRecommendationEngine:
             sectors: Preferred sectors (optional)
             location_state: Preferred state (optional)
             max_results: Maximum number of results to return
+            filters: Hard filters applied before scoring (see filter_rows)
+            diversity: Re-ranking options (see get_recommendation_rows)
+            time_budget: Seconds to spend scoring; when it runs out the best results
+                found so far are returned, each marked with partial_results=True
         
         Returns:
             List of recommended internships with similarity scores and explanations
@@ -322,68 +1141,30 @@ class InternshipRecommendationEngine:
         start_time = time.time()
         
         try:
-            if not self.internships:
-                raise ValueError("No internship data loaded")
-            
-            # Create user query for content similarity
-            user_query = f"{education} {' '.join(skills)}"
-            if sectors:
-                user_query += f" {' '.join(sectors)}"
-            
-            # Calculate different similarity components
-            content_similarities = self._calculate_content_similarity(user_query)
-            skill_similarities = self._calculate_skill_similarity(skills)
-            education_scores = self._calculate_education_compatibility(education)
-            location_scores = self._calculate_location_preference(location_state)
-            sector_scores = self._calculate_sector_preference(sectors)
-            
-            # Combine all scores using weighted average
-            final_scores = (
-                self.weights['content_similarity'] * content_similarities +
-                self.weights['skill_match'] * skill_similarities +
-                self.weights['education_match'] * education_scores +
-                self.weights['location_preference'] * location_scores +
-                self.weights['sector_preference'] * sector_scores
+            deadline = time.perf_counter() + time_budget if time_budget is not None else None
+            rows, partial = self.rank_rows(
+                education, skills, sectors, location_state, max_results, filters, diversity,
+                deadline=deadline
             )
             
-            # Get top recommendations
-            top_indices = np.argsort(final_scores)[::-1][:max_results * 2]  # Get more to filter
-            
             # Prepare recommendations with detailed information
             recommendations = []
-            seen_companies = set()
-            
-            for idx in top_indices:
-                if len(recommendations) >= max_results:
-                    break
-                
+            for idx, similarity_score, explanation in rows:
                 internship = self.internships[idx].copy()
-                similarity_score = float(final_scores[idx])
-                
-                # Skip if similarity too low (below 0.2)
-                if similarity_score < 0.2:
-                    continue
-                
-                # Diversify by company (optional: remove if not needed)
-                # if internship['company'] in seen_companies:
-                #     continue
-                # seen_companies.add(internship['company'])
-                
-                # Generate explanation
-                explanation = self._generate_explanation(
-                    internship, skills, similarity_score, education,
-                    location_state, sectors
-                )
                 
                 # Add recommendation metadata
                 internship['similarity_score'] = similarity_score
                 internship['reason'] = explanation
+                if time_budget is not None:
+                    internship['partial_results'] = partial
                 
                 recommendations.append(internship)
             
             processing_time = time.time() - start_time
             
             print(f"✅ Generated {len(recommendations)} recommendations in {processing_time:.2f}s")
+            if partial:
+                print(f"⏳ Time budget of {time_budget * 1000:.0f}ms ran out; results are partial")
             print(f"📊 Average similarity score: {np.mean([r['similarity_score'] for r in recommendations]):.3f}")
             
             return recommendations
@@ -392,6 +1173,105 @@ class InternshipRecommendationEngine:
             print(f"❌ Error generating recommendations: {e}")
             return []
     
+    def render_recommendations_json(self, rows: List[Tuple[int, float, str]]) -> bytes:
+        """Serialize ranked rows to a JSON array of InternshipResponse objects"""
+        return render_recommendations(self.listing_json, rows)
+    
+    def warm_up(self, queries: int = 8) -> Dict[str, Any]:
+        """
+        Run synthetic queries through every serving path before taking traffic
+        
+        Queries are derived from listings spread across the catalog. Each one
+        is scored over every row by the fused, sector-partition and
+        deadline-chunked paths (with the collaborative term when a model is
+        attached), so an all-expired catalog cannot leave them cold; the
+        candidates then go through diversity re-ranking, explanations, the
+        JSON renderer and response compression, and rank_rows is called with
+        hard filters, a latency budget and re-ranking options as requests do.
+        Lazy allocations and first-call caches are paid here rather than by
+        the first real users.
+        
+        Args:
+            queries: Number of synthetic recommendation queries
+        
+        Returns:
+            Number of queries run, rows scored and elapsed seconds
+        
+        Raises:
+            RuntimeError: If no row was scored (the engine must not report ready)
+        """
+        start_time = time.perf_counter()
+        samples = self.internships[::max(1, len(self.internships) // queries)][:queries]
+        weights = self.weights
+        users = [None]
+        model = self.collaborative
+        if model is not None:
+            weights = dict(self.weights, collaborative=self.weights.get('collaborative') or 0.1)
+            users = [0, int(model.user_keys[0])] if len(model.user_keys) else [0]
+        scored_rows = 0
+        
+        for n, internship in enumerate(samples):
+            education = internship['education_requirement']
+            skills = internship['skills_required'][:3]
+            sectors = [internship['sector']] if n % 2 == 0 else None
+            location_state = internship['location_state'] if n % 3 == 0 else None
+            max_results = 5 + n % 6
+            user = users[n % len(users)]
+            
+            scores = self.score_rows(education, skills, sectors, location_state, weights=weights, user=user)
+            scored_rows += len(scores)
+            if sectors and self.sector_pruning:
+                partition_rows, _ = self.score_sector_partitions(
+                    education, skills, sectors, location_state, k=max_results, weights=weights, user=user
+                )
+                scored_rows += len(partition_rows)
+            # Every other query starts with its budget spent, scoring only the first chunk
+            deadline = time.perf_counter() + (0.05 if n % 2 == 0 else 0.0)
+            chunk_rows, _, _ = self.score_within_deadline(
+                education, skills, sectors, location_state, deadline=deadline, weights=weights, user=user
+            )
+            scored_rows += len(chunk_rows)
+            
+            candidates = top_k_indices(scores, max(self.diversity_pool_size, max_results))
+            selected = self._diversify(candidates, scores, None, max_results, {
+                'diversify': n % 2 == 0,
+                'max_per_company': 1 if n % 4 == 0 else None,
+                'max_per_sector': 2 if n % 4 == 2 else None
+            })
+            ranked = [
+                (int(row), float(scores[row]), self._generate_explanation(
+                    self.internships[row], skills, float(scores[row]), education, location_state, sectors
+                ))
+                for row in selected
+            ]
+            body = self.render_recommendations_json(ranked)
+            for encoding in available_encodings():
+                compress(body, encoding)
+            
+            # Serving entry point (returns nothing when hard filters or expiry remove every row)
+            self.rank_rows(
+                education, skills, sectors, location_state, max_results,
+                filters={
+                    'min_stipend': 5000 if n % 4 == 1 else None,
+                    'max_duration_weeks': 24 if n % 4 == 2 else None,
+                    'open_only': n % 4 == 3,
+                    'strict_eligibility': n % 3 == 1
+                } if n % 2 else None,
+                diversity={'diversify': n % 2 == 0},
+                weights=weights,
+                deadline=time.perf_counter() + 0.05 if n % 3 == 2 else None,
+                user=user
+            )
+        
+        if samples:
+            self.get_similar_internships(samples[0]['id'])
+        for name in list(self.catalog_payloads):
+            self.get_catalog_payload(name)
+        
+        if scored_rows == 0:
+            raise RuntimeError("Warm-up scored no rows; the engine is not ready to serve")
+        return {"queries": len(samples), "scored_rows": scored_rows, "seconds": time.perf_counter() - start_time}
+    
     def get_similar_internships(self, internship_id: int, max_results: int = 5) -> List[Dict[str, Any]]:
         """Get internships similar to a given internship"""
         try:
@@ -410,10 +1290,15 @@ class InternshipRecommendationEngine:
             
             # Calculate similarities to all other internships
             target_vector = self.tfidf_matrix[target_idx]
-            similarities = cosine_similarity(target_vector, self.tfidf_matrix).flatten()
+            similarities = _cosine_scores(target_vector, self.tfidf_matrix)
             
             # Get top similar internships (excluding the target itself)
             similarities[target_idx] = -1  # Exclude self
+            if self.exclude_expired:
+                expired = np.unpackbits(
+                    self.catalog_index.open_bitmap(date.today()), count=len(similarities)
+                ) == 0
+                similarities[expired] = -1  # Exclude listings past their deadline
             top_indices = np.argsort(similarities)[::-1][:max_results]
             
             similar_internships = []
@@ -463,7 +1348,7 @@ def test_recommendation_engine():
     
     try:
         # Initialize and test engine
-        engine = InternshipRecommendationEngine(test_file)
+        engine = InternshipRecommendationEngine(test_file, exclude_expired=False)  # Fixed sample dates
         engine.load_data()
         
         # Test recommendation
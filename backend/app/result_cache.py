@@ -0,0 +1,212 @@
+# Recommendation Result Caches: Per-worker and Cross-worker Shared Memory
+# File: backend/app/result_cache.py
+
+import fcntl
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Hashable, Optional
+
+# Segment header: magic, slot count, slot size
+_HEADER = struct.Struct("<8sII")
+_HEADER_SIZE = 64
+_MAGIC = b"IMRCACH1"
+
+# Slot header: sequence number, key digest, stored-at timestamp, payload length
+_SLOT = struct.Struct("<Q16sdI")
+_SEQ = struct.Struct("<Q")
+
+# Write locks are striped over this many byte ranges of the lock file
+LOCK_STRIPES = 64
+
+
+def _digest(key: Hashable) -> bytes:
+    """128-bit digest of a cache key (stable across processes)"""
+    return hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16).digest()
+
+
+class LocalResultCache:
+    """Per-process LRU cache with the same interface as SharedResultCache"""
+
+    def __init__(self, max_entries: int = 4096, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.stores = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        digest = _digest(key)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None or (self.ttl and time.time() - entry[0] > self.ttl):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: bytes) -> bool:
+        digest = _digest(key)
+        with self._lock:
+            self._entries[digest] = (time.time(), value)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.stores += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "local",
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class SharedResultCache:
+    """
+    Fixed-size result cache in a named shared-memory segment, shared by all workers on a host.
+
+    Keys are hashed to a 128-bit digest that selects one slot (direct-mapped;
+    a colliding key simply replaces the previous entry). Reads are lock-free:
+    each slot carries a sequence number that writers make odd while writing,
+    and a reader retries if the number changed under it. Writers serialize on
+    striped fcntl byte-range locks, so only writers hitting the same stripe wait.
+    """
+
+    def __init__(self, name: str = "intern_mitra_results", slots: int = 4096,
+                 slot_size: int = 8192, ttl: float = 300.0):
+        """
+        Create the segment, or attach to it if another worker already created it
+
+        Args:
+            name: Shared-memory segment name (also names the lock file)
+            slots: Number of slots
+            slot_size: Bytes per slot, including the slot header
+            ttl: Seconds an entry stays valid (0 = until overwritten)
+        """
+        self.name = name
+        self.slots = slots
+        self.slot_size = slot_size
+        self.capacity = slot_size - _SLOT.size
+        self.ttl = ttl
+        size = _HEADER_SIZE + slots * slot_size
+
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            _HEADER.pack_into(self._shm.buf, 0, _MAGIC, slots, slot_size)
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=name)
+            # The creating worker may not have written the header yet
+            for _ in range(100):
+                magic, existing_slots, existing_slot_size = _HEADER.unpack_from(self._shm.buf, 0)
+                if magic != bytes(len(_MAGIC)):
+                    break
+                time.sleep(0.01)
+            if (magic, existing_slots, existing_slot_size) != (_MAGIC, slots, slot_size):
+                self._shm.close()
+                raise ValueError(f"Shared cache '{name}' exists with a different layout; unlink it first")
+        # The segment outlives any single worker; unlink() removes it explicitly
+        resource_tracker.unregister(self._shm._name, "shared_memory")
+
+        self._buf = self._shm.buf
+        self._lock_fd = os.open(os.path.join(tempfile.gettempdir(), f"{name}.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+        # fcntl locks are per process; this lock orders threads within the process
+        self._thread_lock = threading.Lock()
+        self.hits = self.misses = self.stores = self.too_large = self.contended = 0
+
+    def _slot_offset(self, digest: bytes) -> int:
+        return _HEADER_SIZE + (int.from_bytes(digest[:8], "little") % self.slots) * self.slot_size
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Cached value for a key, or None"""
+        digest = _digest(key)
+        offset = self._slot_offset(digest)
+        buf = self._buf
+
+        for _ in range(3):
+            seq, slot_digest, stored_at, length = _SLOT.unpack_from(buf, offset)
+            if seq & 1:
+                self.contended += 1
+                continue
+            if slot_digest != digest or (self.ttl and time.time() - stored_at > self.ttl):
+                break
+            start = offset + _SLOT.size
+            value = bytes(buf[start:start + length])
+            if _SEQ.unpack_from(buf, offset)[0] == seq:
+                self.hits += 1
+                return value
+            self.contended += 1
+
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, value: bytes) -> bool:
+        """Store a value; values larger than a slot are skipped"""
+        if len(value) > self.capacity:
+            self.too_large += 1
+            return False
+
+        digest = _digest(key)
+        offset = self._slot_offset(digest)
+        stripe = ((offset - _HEADER_SIZE) // self.slot_size) % LOCK_STRIPES
+        buf = self._buf
+
+        with self._thread_lock:
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_EX, 1, stripe)
+            try:
+                seq = _SEQ.unpack_from(buf, offset)[0]
+                _SEQ.pack_into(buf, offset, seq + 1)
+                start = offset + _SLOT.size
+                buf[start:start + len(value)] = value
+                _SLOT.pack_into(buf, offset, seq + 1, digest, time.time(), len(value))
+                _SEQ.pack_into(buf, offset, seq + 2)
+            finally:
+                fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, stripe)
+        self.stores += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for this process (the slots themselves are shared)"""
+        lookups = self.hits + self.misses
+        return {
+            "backend": "shared",
+            "name": self.name,
+            "slots": self.slots,
+            "slot_size": self.slot_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "too_large": self.too_large,
+            "contended_reads": self.contended,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """Detach this process from the segment"""
+        self._buf = None
+        self._shm.close()
+        os.close(self._lock_fd)
+
+    def unlink(self) -> None:
+        """Remove the segment and its lock file (call once, from the process that owns the pool)"""
+        try:
+            # unlink() unregisters from the resource tracker, which __init__ already did
+            resource_tracker.register(self._shm._name, "shared_memory")
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        try:
+            os.unlink(os.path.join(tempfile.gettempdir(), f"{self.name}.lock"))
+        except FileNotFoundError:
+            pass
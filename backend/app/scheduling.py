@@ -0,0 +1,193 @@
+# Interactive and Bulk Execution Lanes with Priority Scheduling
+# File: backend/app/scheduling.py
+
+import asyncio
+import contextlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+
+def _lower_thread_priority(niceness: int) -> None:
+    """Thread pool initializer: raise the calling thread's nice value (Linux schedules threads individually)"""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), niceness)
+    except (AttributeError, OSError):
+        pass
+
+
+class LaneFull(Exception):
+    """Raised when a lane's queue is at its limit"""
+
+
+class Lane:
+    """One execution lane: its own thread pool, a concurrency limit and queue counters"""
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int = 0, niceness: int = 0):
+        """
+        Args:
+            name: Lane name
+            max_concurrency: Tasks of this lane running at once (also its thread count)
+            max_queue: Tasks allowed to wait for a slot (0 = unbounded)
+            niceness: Nice value added to the lane's threads so the OS favours other lanes
+        """
+        self.name = name
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix=f"lane-{name}",
+            initializer=_lower_thread_priority if niceness else None,
+            initargs=(niceness,) if niceness else ()
+        )
+        self.slots = asyncio.Semaphore(self.max_concurrency)
+        self.waiting = self.running = 0
+        self.peak_waiting = self.completed = self.failed = self.rejected = 0
+        self.wait_seconds = self.max_wait_seconds = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        started = self.completed + self.failed + self.running
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "queue_depth": self.waiting,
+            "peak_queue_depth": self.peak_waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "mean_wait_ms": round(self.wait_seconds / started * 1000, 3) if started else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+        }
+
+
+class LaneScheduler:
+    """
+    Runs blocking work on separate interactive and bulk lanes.
+
+    Each lane has its own thread pool, so bulk jobs never occupy the threads
+    that serve students. Bulk work is submitted in small units; a bulk unit
+    only starts while the interactive lane has nothing running or queued, so
+    between units bulk jobs yield the CPU to interactive traffic. To keep bulk
+    jobs from starving under constant interactive load, a unit that has
+    yielded for bulk_max_delay seconds starts anyway. Bulk threads also run
+    at a lower OS priority, so a bulk unit that is already running gives way
+    to interactive threads.
+    """
+
+    def __init__(self, interactive_concurrency: int = 4, bulk_concurrency: int = 1,
+                 interactive_queue: int = 0, bulk_queue: int = 0,
+                 bulk_max_delay: float = 1.0, bulk_niceness: int = 10, enabled: bool = True):
+        """
+        Args:
+            interactive_concurrency: Interactive tasks running at once
+            bulk_concurrency: Bulk tasks running at once
+            interactive_queue: Interactive tasks allowed to wait (0 = unbounded)
+            bulk_queue: Bulk tasks allowed to wait (0 = unbounded)
+            bulk_max_delay: Longest a bulk unit yields to interactive work before starting anyway
+            bulk_niceness: Nice value of bulk threads (0 = same priority as interactive)
+            enabled: When False bulk work runs on the interactive lane with no priority (for comparisons)
+        """
+        self.enabled = enabled
+        self.bulk_max_delay = bulk_max_delay
+        self.lanes: Dict[str, Lane] = {
+            INTERACTIVE: Lane(INTERACTIVE, interactive_concurrency, interactive_queue),
+            BULK: Lane(BULK, bulk_concurrency, bulk_queue, bulk_niceness),
+        }
+        self._interactive_idle: Optional[asyncio.Event] = None
+        self.bulk_yields = 0
+        self.bulk_starvation_starts = 0
+
+    def _lane(self, name: str) -> Lane:
+        if not self.enabled:
+            return self.lanes[INTERACTIVE]
+        return self.lanes[name]
+
+    def _idle_event(self) -> asyncio.Event:
+        # Created lazily so it binds to the serving event loop
+        if self._interactive_idle is None:
+            self._interactive_idle = asyncio.Event()
+            self._interactive_idle.set()
+        return self._interactive_idle
+
+    def _update_idle(self) -> None:
+        lane = self.lanes[INTERACTIVE]
+        if lane.waiting or lane.running:
+            self._idle_event().clear()
+        else:
+            self._idle_event().set()
+
+    async def _yield_to_interactive(self) -> None:
+        """Wait until no interactive work is running or queued (at most bulk_max_delay)"""
+        idle = self._idle_event()
+        if idle.is_set():
+            return
+        self.bulk_yields += 1
+        try:
+            await asyncio.wait_for(idle.wait(), timeout=self.bulk_max_delay)
+        except asyncio.TimeoutError:
+            self.bulk_starvation_starts += 1
+
+    @contextlib.asynccontextmanager
+    async def slot(self, lane_name: str):
+        """
+        Hold one slot of a lane (waiting for it, and for bulk also yielding to interactive work)
+
+        Raises:
+            LaneFull: The lane's queue is at its limit
+        """
+        lane = self._lane(lane_name)
+        if lane.max_queue and lane.waiting >= lane.max_queue:
+            lane.rejected += 1
+            raise LaneFull(f"{lane.name} lane queue is full ({lane.waiting} waiting)")
+
+        queued_at = time.perf_counter()
+        lane.waiting += 1
+        lane.peak_waiting = max(lane.peak_waiting, lane.waiting)
+        self._update_idle()
+        try:
+            if lane.name == BULK:
+                await self._yield_to_interactive()
+            await lane.slots.acquire()
+        finally:
+            lane.waiting -= 1
+
+        waited = time.perf_counter() - queued_at
+        lane.wait_seconds += waited
+        lane.max_wait_seconds = max(lane.max_wait_seconds, waited)
+        lane.running += 1
+        self._update_idle()
+        try:
+            yield lane
+            lane.completed += 1
+        except BaseException:
+            lane.failed += 1
+            raise
+        finally:
+            lane.running -= 1
+            lane.slots.release()
+            self._update_idle()
+
+    async def run(self, lane_name: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) on a lane's thread pool once the lane grants a slot"""
+        async with self.slot(lane_name) as lane:
+            return await asyncio.get_running_loop().run_in_executor(lane.executor, fn, *args)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-lane concurrency, queue depth and wait metrics"""
+        return {
+            "enabled": self.enabled,
+            "bulk_max_delay": self.bulk_max_delay,
+            "bulk_yields": self.bulk_yields,
+            "bulk_starvation_starts": self.bulk_starvation_starts,
+            "lanes": {name: lane.stats() for name, lane in self.lanes.items()},
+        }
+
+    def shutdown(self) -> None:
+        """Stop the lane thread pools"""
+        for lane in self.lanes.values():
+            lane.executor.shutdown(wait=False)
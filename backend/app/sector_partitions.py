@@ -0,0 +1,119 @@
+# Per-sector Partitions of the Scoring Operator with Score Upper Bounds
+# File: backend/app/sector_partitions.py
+
+from typing import List, Union
+
+import numpy as np
+
+from app.catalog_index import jaccard
+
+
+class SectorPartitions:
+    """
+    Row partitions of the stacked scoring operator, one per sector, built once at load time.
+
+    Alongside each partition's operator rows it keeps its own flat skill
+    arrays (so the direct skill overlap is computed only for partitions that
+    get scored) and what is needed to bound the best score any row in the
+    partition could reach for a query: the column-wise maxima of its TF-IDF
+    rows and which education levels, locations and skills occur in it. The
+    engine scores the preferred sectors first and skips every other
+    partition whose bound cannot reach the current k-th best score.
+    """
+
+    def __init__(self, operator, content_width: int, catalog_index):
+        """
+        Build the partitions
+
+        Args:
+            operator: Stacked [content TF-IDF | skill TF-IDF] CSR matrix in catalog order
+            content_width: Number of content TF-IDF columns in operator
+            catalog_index: CatalogIndex of the same catalog
+        """
+        from scipy import sparse
+
+        codes = catalog_index.sector_codes
+        count = len(catalog_index.sector_values)
+        self.content_width = content_width
+
+        # Catalog rows (ascending) and operator rows of each sector
+        self.rows: List[np.ndarray] = [np.flatnonzero(codes == code) for code in range(count)]
+        self.operators = [operator[rows] for rows in self.rows]
+
+        # Flat (local row, skill code) arrays per partition for the Jaccard overlap
+        local = np.empty(catalog_index.size, dtype=np.int32)
+        for rows in self.rows:
+            local[rows] = np.arange(len(rows), dtype=np.int32)
+        skill_sectors = codes[catalog_index.skill_rows]
+        self.skill_rows = [local[catalog_index.skill_rows[skill_sectors == code]] for code in range(count)]
+        self.skill_codes = [catalog_index.skill_codes[skill_sectors == code] for code in range(count)]
+        self.skill_counts = [catalog_index.skill_counts[rows] for rows in self.rows]
+
+        # Column maxima bound each TF-IDF dot product from above (queries are non-negative)
+        column_max = sparse.vstack([part.max(axis=0) for part in self.operators], format='csr')
+        self.content_max = column_max[:, :content_width].tocsr()
+        self.skill_max = column_max[:, content_width:].tocsr()
+
+        # Categorical values present in each partition
+        self.education_presence = np.zeros((count, catalog_index.max_level + 1), dtype=bool)
+        self.education_presence[codes, catalog_index.education_levels] = True
+        self.location_presence = np.zeros((count, len(catalog_index.location_values)), dtype=bool)
+        self.location_presence[codes, catalog_index.location_codes] = True
+        self.skill_presence = np.zeros((count, len(catalog_index.skill_lookup)), dtype=bool)
+        self.skill_presence[codes[catalog_index.skill_rows], catalog_index.skill_codes] = True
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def skill_overlap(self, code: int, known: np.ndarray, skill_count: int) -> np.ndarray:
+        """
+        Jaccard overlap of every row in one partition (same values as CatalogIndex.skill_overlap)
+
+        Args:
+            code: Sector code of the partition
+            known: Mask over skill codes of the user's skills (CatalogIndex.known_skills)
+            skill_count: Number of distinct user skills
+        """
+        matches = np.bincount(self.skill_rows[code][known[self.skill_codes[code]]],
+                              minlength=len(self.rows[code]))
+        return jaccard(matches, skill_count, self.skill_counts[code])
+
+    def upper_bounds(self, query: np.ndarray, overlap_weight: float,
+                     known: np.ndarray, skill_count: int,
+                     education_scores: np.ndarray,
+                     location_scores: Union[np.ndarray, float],
+                     sector_scores: np.ndarray) -> np.ndarray:
+        """
+        Upper bound on the final score of any row in each partition
+
+        Args:
+            query: Weighted [content | skill] query vector (non-negative)
+            overlap_weight: Weight of the direct skill overlap (Jaccard) term
+            known: Mask over skill codes of the user's skills
+            skill_count: Number of distinct user skills
+            education_scores: Weighted education score per required level
+            location_scores: Weighted score per location pair, or a constant without a preference
+            sector_scores: Weighted score per sector
+
+        Returns:
+            Bound per partition, indexed by sector code
+        """
+        content_query = query[:self.content_width]
+        skill_query = query[self.content_width:]
+
+        # TF-IDF rows are L2-normalized, so each dot product is also at most the query norm
+        bounds = np.minimum(self.content_max @ content_query, np.linalg.norm(content_query))
+        bounds += np.minimum(self.skill_max @ skill_query, np.linalg.norm(skill_query))
+
+        # Jaccard m / (u + c - m) is at most m / u, and m is at most the user skills present
+        if skill_count:
+            matched = self.skill_presence[:, known].sum(axis=1)
+            bounds += overlap_weight * matched / skill_count
+
+        bounds += np.where(self.education_presence, education_scores, 0.0).max(axis=1)
+        if np.isscalar(location_scores):
+            bounds += location_scores
+        else:
+            bounds += np.where(self.location_presence, location_scores, 0.0).max(axis=1)
+        bounds += sector_scores
+        return bounds
@@ -0,0 +1,70 @@
+# Pre-serialized JSON Responses for Internship Recommendations
+# File: backend/app/serialization.py
+
+import json
+from typing import Any, Dict, List, Sequence, Tuple
+
+from app.models import InternshipResponse
+
+# Fields that change per request and are spliced into the pre-serialized listing
+DYNAMIC_FIELDS = ("similarity_score", "reason")
+
+# Static listing fields in InternshipResponse order
+STATIC_FIELDS = tuple(
+    name for name in InternshipResponse.model_fields if name not in DYNAMIC_FIELDS
+)
+
+_SCORE_KEY = b',"similarity_score":'
+_REASON_KEY = b',"reason":'
+
+
+def _dumps(value: Any) -> str:
+    """Compact JSON encoding matching FastAPI's UTF-8 output"""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def build_listing_prefixes(internships: Sequence[Dict[str, Any]]) -> List[bytes]:
+    """
+    Pre-serialize the static part of every listing once at load time
+
+    Each listing is validated against InternshipResponse so the fast path keeps
+    the response contract, then encoded as an unterminated JSON object
+    (everything except the closing brace) ready for the dynamic fields.
+
+    Args:
+        internships: Catalog rows in engine order
+
+    Returns:
+        One UTF-8 JSON prefix per row
+    """
+    prefixes = []
+    for internship in internships:
+        validated = InternshipResponse(
+            **{name: internship[name] for name in STATIC_FIELDS},
+            similarity_score=0.0,
+            reason=""
+        )
+        static = validated.model_dump(include=set(STATIC_FIELDS))
+        encoded = _dumps({name: static[name] for name in STATIC_FIELDS})
+        prefixes.append(encoded[:-1].encode("utf-8"))
+    return prefixes
+
+
+def render_recommendations(prefixes: Sequence[bytes], rows: Sequence[Tuple[int, float, str]]) -> bytes:
+    """
+    Assemble a JSON array of InternshipResponse objects from pre-serialized listings
+
+    Args:
+        prefixes: Output of build_listing_prefixes for the engine's catalog
+        rows: (row index, similarity score, reason) for each recommendation
+
+    Returns:
+        UTF-8 encoded JSON array
+    """
+    parts = []
+    for idx, score, reason in rows:
+        parts.append(
+            prefixes[idx] + _SCORE_KEY + repr(float(score)).encode("ascii") +
+            _REASON_KEY + _dumps(reason).encode("utf-8") + b"}"
+        )
+    return b"[" + b",".join(parts) + b"]"
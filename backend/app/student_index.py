@@ -0,0 +1,328 @@
+# Student Profile Index for Reverse Matching (internship -> best-fitting students)
+# File: backend/app/student_index.py
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.catalog_index import jaccard
+from app.models import RecommendationRequest
+from app.ranking import top_k_indices
+from app.recommendation_engine import MIN_SIMILARITY, InternshipRecommendationEngine
+
+
+class StudentBlock:
+    """
+    Up to block_size students in columnar form.
+
+    Their content and skill TF-IDF vectors are stored inverted (one row per
+    feature, one column per student), so scoring a listing only reads the
+    postings of the listing's own terms. Skills are kept as an inverted
+    index over the catalog's skill codes for the Jaccard overlap, and the
+    categorical parts as one profile class code per student.
+    """
+
+    def __init__(self, vectors, skill_postings: np.ndarray, skill_offsets: np.ndarray,
+                 skill_counts: np.ndarray, profile_classes: np.ndarray):
+        self.vectors = vectors
+        self.skill_postings = skill_postings
+        self.skill_offsets = skill_offsets
+        self.skill_counts = skill_counts
+        self.profile_classes = profile_classes
+
+    def __len__(self) -> int:
+        return len(self.skill_counts)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.vectors.data, self.vectors.indices, self.vectors.indptr, self.skill_postings,
+                  self.skill_offsets, self.skill_counts, self.profile_classes)
+        return sum(array.nbytes for array in arrays)
+
+
+class StudentIndex:
+    """
+    Student profiles indexed against one engine's vectorizers and catalog codes.
+
+    Scoring a listing against the pool applies the engine's weighted formula
+    from the other side: the listing's row of the stacked scoring operator is
+    the query, each student's [content | skill] TF-IDF vector the row, so a
+    (student, listing) pair gets the score the listing would get in that
+    student's recommendations (up to float32 storage of the student vectors).
+    The categorical parts depend only on a student's (education, location,
+    sectors) combination, so they are scored once per distinct combination
+    (profile class) and gathered with one lookup per student. Students are
+    stored in fixed-size blocks that are scored one at a time; only students
+    at or above the k-th best score so far are kept from each block, which
+    bounds temporary memory for pools of millions of profiles and lets the
+    pool grow by appending blocks.
+    """
+
+    def __init__(self, engine: InternshipRecommendationEngine, block_size: int = 65536):
+        """
+        Args:
+            engine: Loaded engine whose vectorizers and catalog codes the index uses
+            block_size: Students per block
+        """
+        self.engine = engine
+        self.block_size = block_size
+        self.student_ids: List[Any] = []
+        self.blocks: List[StudentBlock] = []
+        self.skipped_profiles = 0
+        self.build_seconds = 0.0
+
+        index = engine.catalog_index
+        self._skill_starts = np.concatenate([[0], np.cumsum(index.skill_counts)])
+        self._content_width = engine.tfidf_matrix.shape[1]
+
+        # Per distinct value, the engine's score for every catalog value (row 0 = no preference)
+        self._education_codes: Dict[Any, int] = {}
+        self._location_codes: Dict[Optional[str], int] = {None: 0}
+        self._sector_codes: Dict[Optional[Tuple[str, ...]], int] = {None: 0}
+        self.education_table = np.empty((0, index.max_level + 1))
+        self.location_table = np.ones((1, len(index.location_values)))
+        self.sector_table = np.ones((1, len(index.sector_values)))
+
+        # Profile classes: (education, location, sectors) codes and education level per class
+        self._class_codes: Dict[Tuple[int, int, int], int] = {}
+        self._class_rows: List[Tuple[int, int, int, int]] = []
+        self.class_education = self.class_location = self.class_sector = self.class_levels = np.empty(0, np.int32)
+
+    def __len__(self) -> int:
+        return len(self.student_ids)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(block.nbytes for block in self.blocks)
+
+    def _education_code(self, education) -> int:
+        code = self._education_codes.get(education)
+        if code is None:
+            code = self._education_codes[education] = len(self._education_codes)
+            self.education_table = np.vstack([self.education_table, self.engine._education_level_scores(education)])
+        return code
+
+    def _location_code(self, location_state: Optional[str]) -> int:
+        key = location_state or None
+        code = self._location_codes.get(key)
+        if code is None:
+            code = self._location_codes[key] = len(self._location_codes)
+            self.location_table = np.vstack([self.location_table, self.engine._location_pair_scores(key)])
+        return code
+
+    def _sector_code(self, sectors: Optional[List[str]]) -> int:
+        key = tuple(sectors) if sectors else None
+        code = self._sector_codes.get(key)
+        if code is None:
+            code = self._sector_codes[key] = len(self._sector_codes)
+            self.sector_table = np.vstack([self.sector_table, self.engine._sector_value_scores(list(key))])
+        return code
+
+    def add_profiles(self, profiles: List[RecommendationRequest], student_ids: List[Any]) -> None:
+        """
+        Append validated profiles to the pool (in blocks of at most block_size)
+
+        Args:
+            profiles: Student profiles as recommendation requests
+            student_ids: Identifier of each profile
+        """
+        for start in range(0, len(profiles), self.block_size):
+            self.blocks.append(self._build_block(profiles[start:start + self.block_size]))
+        self.student_ids.extend(student_ids)
+
+    def _build_block(self, profiles: List[RecommendationRequest]) -> StudentBlock:
+        from scipy import sparse
+
+        engine = self.engine
+        catalog_skills = engine.catalog_index.skill_lookup
+
+        # Same query texts the engine vectorizes for a recommendation request
+        content = engine.tfidf_vectorizer.transform([
+            engine._user_query(profile.education, profile.skills, profile.sectors) for profile in profiles
+        ])
+        skills = engine.skill_vectorizer.transform([
+            ' '.join([skill.lower().strip() for skill in profile.skills]) for profile in profiles
+        ])
+        vectors = sparse.hstack([content, skills], format='csr').T.tocsr().astype(np.float32)
+        vectors.sort_indices()
+
+        # Inverted skill index over catalog skill codes (unknown skills only count toward set sizes)
+        skill_sets = [{skill.lower() for skill in profile.skills} for profile in profiles]
+        skill_counts = np.array([len(skill_set) for skill_set in skill_sets], dtype=np.int32)
+        codes_per_student = [[catalog_skills[s] for s in skill_set if s in catalog_skills] for skill_set in skill_sets]
+        skill_rows = np.repeat(np.arange(len(profiles), dtype=np.int32), [len(codes) for codes in codes_per_student])
+        skill_codes = np.array([code for codes in codes_per_student for code in codes], dtype=np.int32)
+        order = np.argsort(skill_codes, kind='stable')
+        skill_offsets = np.concatenate([[0], np.cumsum(np.bincount(skill_codes, minlength=len(catalog_skills)))])
+
+        return StudentBlock(
+            vectors=vectors,
+            skill_postings=skill_rows[order],
+            skill_offsets=skill_offsets.astype(np.int64),
+            skill_counts=skill_counts,
+            profile_classes=np.array([self._profile_class(profile) for profile in profiles], dtype=np.int32),
+        )
+
+    def _profile_class(self, profile: RecommendationRequest) -> int:
+        key = (
+            self._education_code(profile.education),
+            self._location_code(profile.location_state),
+            self._sector_code(profile.sectors),
+        )
+        code = self._class_codes.get(key)
+        if code is None:
+            code = self._class_codes[key] = len(self._class_codes)
+            self._class_rows.append(key + (self.engine.education_hierarchy.get(profile.education, 0),))
+            self.class_education, self.class_location, self.class_sector, self.class_levels = (
+                np.array(column, dtype=np.int32) for column in zip(*self._class_rows)
+            )
+        return code
+
+    def top_students(self, row: int, k: int = 20,
+                     weights: Optional[Dict[str, float]] = None,
+                     skill_blend: Optional[float] = None,
+                     eligible_only: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best-fitting students for one listing
+
+        Args:
+            row: Catalog row of the listing
+            k: Number of students to return
+            weights: Component weights (defaults to the engine's)
+            skill_blend: TF-IDF share of skill_match (defaults to the engine's)
+            eligible_only: Only students meeting the listing's education requirement
+
+        Returns:
+            (student positions best first, their scores); ties go to the earlier
+            student and scores below MIN_SIMILARITY are left out
+        """
+        engine = self.engine
+        index = engine.catalog_index
+        weights = weights or engine.weights
+        skill_blend = engine.skill_blend if skill_blend is None else skill_blend
+
+        # The listing's operator row, weighted like a recommendation query
+        operator_row = engine.scoring_operator[row]
+        features = operator_row.indices
+        feature_weights = np.where(
+            features < self._content_width,
+            weights['content_similarity'],
+            weights['skill_match'] * skill_blend
+        )
+        query = operator_row.data * feature_weights
+
+        listing_skills = index.skill_codes[self._skill_starts[row]:self._skill_starts[row + 1]]
+        listing_skill_count = int(index.skill_counts[row])
+        required_level = int(index.education_levels[row])
+
+        # Categorical part of the score per profile class
+        class_scores = (
+            weights['education_match'] * self.education_table[self.class_education, required_level]
+            + weights['location_preference'] * self.location_table[self.class_location, index.location_codes[row]]
+            + weights['sector_preference'] * self.sector_table[self.class_sector, index.sector_codes[row]]
+        )
+        if eligible_only:
+            class_scores[self.class_levels < required_level] = -np.inf
+        overlap_weight = weights['skill_match'] * (1 - skill_blend)
+
+        candidates, candidate_scores = [], []
+        threshold = MIN_SIMILARITY
+        offset = 0
+        for block in self.blocks:
+            scores = block.vectors[features].T @ query
+            scores += class_scores[block.profile_classes]
+
+            # Jaccard is non-zero only for students sharing a skill with the listing
+            postings = [block.skill_postings[block.skill_offsets[code]:block.skill_offsets[code + 1]]
+                        for code in listing_skills]
+            if postings:
+                students, matches = np.unique(np.concatenate(postings), return_counts=True)
+                scores[students] += overlap_weight * jaccard(
+                    matches, listing_skill_count, block.skill_counts[students]
+                )
+
+            # Keep students that can still make the top k, in ascending order
+            keep = np.flatnonzero(scores >= threshold)
+            if len(keep) > k:
+                keep = np.sort(keep[top_k_indices(scores[keep], k)])
+            candidates.append(keep + offset)
+            candidate_scores.append(scores[keep])
+            offset += len(block)
+
+            found = sum(len(part) for part in candidate_scores)
+            if found >= k:
+                threshold = max(threshold, np.partition(np.concatenate(candidate_scores), found - k)[found - k])
+
+        if not candidates:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        candidates, candidate_scores = np.concatenate(candidates), np.concatenate(candidate_scores)
+        best = top_k_indices(candidate_scores, k)
+        return candidates[best], candidate_scores[best]
+
+    @classmethod
+    def from_file(cls, engine: InternshipRecommendationEngine, path: str,
+                  input_format: Optional[str] = None, list_separator: str = ";",
+                  block_size: int = 65536) -> "StudentIndex":
+        """
+        Build an index from an NDJSON or CSV profile file (the bulk export input format)
+
+        Profiles that fail validation are skipped and counted in skipped_profiles.
+        """
+        from app.bulk_export import detect_format, parse_record, read_chunks
+
+        input_format = input_format or detect_format(path)
+        start = time.perf_counter()
+        student_index = cls(engine, block_size)
+        for _, records in read_chunks(path, input_format, block_size):
+            profiles, student_ids = [], []
+            for line_no, raw in records:
+                try:
+                    payload = parse_record(raw, input_format, list_separator)
+                    profiles.append(RecommendationRequest(**payload))
+                    student_ids.append(payload.get("student_id", line_no))
+                except Exception:
+                    student_index.skipped_profiles += 1
+            student_index.add_profiles(profiles, student_ids)
+        student_index.build_seconds = time.perf_counter() - start
+        return student_index
+
+
+class StudentPool:
+    """The student index for the current engine, rebuilt from the profile file when the engine changes"""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.index: Optional[StudentIndex] = None
+        self._lock = threading.Lock()
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.path)
+
+    def current(self, engine: InternshipRecommendationEngine) -> Optional[StudentIndex]:
+        """The index if it was built against engine, else None"""
+        index = self.index
+        return index if index is not None and index.engine is engine else None
+
+    def index_for(self, engine: InternshipRecommendationEngine) -> StudentIndex:
+        """Index built against engine (built once per engine; concurrent callers wait for it)"""
+        with self._lock:
+            if self.current(engine) is None:
+                index = StudentIndex.from_file(engine, self.path)
+                print(f"🎓 Indexed {len(index)} student profiles in {index.build_seconds:.1f}s "
+                      f"({index.nbytes / 1e6:.1f} MB, {index.skipped_profiles} skipped)")
+                self.index = index
+            return self.index
+
+    def stats(self) -> Dict[str, Any]:
+        index = self.index
+        return {
+            "path": self.path,
+            "students": len(index) if index else 0,
+            "blocks": len(index.blocks) if index else 0,
+            "megabytes": round(index.nbytes / 1e6, 1) if index else 0.0,
+            "skipped_profiles": index.skipped_profiles if index else 0,
+            "build_seconds": round(index.build_seconds, 2) if index else None,
+        }
@@ -0,0 +1,156 @@
+# Named Weight Profiles and A/B Experiment Routing
+# File: backend/app/weight_profiles.py
+
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Optional
+
+from app.recommendation_engine import InternshipRecommendationEngine
+
+REQUIRED_WEIGHTS = ('content_similarity', 'skill_match', 'education_match',
+                    'location_preference', 'sector_preference')
+# Weights a profile may leave out, with the value they then take
+OPTIONAL_WEIGHTS = {'collaborative': 0.0}
+
+# Experiment traffic is split into this many hash buckets
+BUCKETS = 10000
+
+
+class WeightProfile:
+    """A named weighting of the scoring components"""
+
+    __slots__ = ("name", "weights", "skill_blend")
+
+    def __init__(self, name: str, weights: Dict[str, float], skill_blend: float):
+        missing = [key for key in REQUIRED_WEIGHTS if key not in weights]
+        if missing:
+            raise ValueError(f"Weight profile '{name}' is missing weights: {', '.join(missing)}")
+        if any(value < 0 for value in weights.values()) or not 0.0 <= skill_blend <= 1.0:
+            raise ValueError(f"Weight profile '{name}' has out-of-range values")
+
+        self.name = name
+        self.weights = {key: float(weights[key]) for key in REQUIRED_WEIGHTS}
+        self.weights.update({key: float(weights.get(key, value)) for key, value in OPTIONAL_WEIGHTS.items()})
+        self.skill_blend = float(skill_blend)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"weights": self.weights, "skill_blend": self.skill_blend}
+
+
+class WeightProfileRegistry:
+    """
+    Resolves the weight profile for each request and keeps per-profile counters.
+
+    A request can name a profile explicitly; otherwise, while an experiment is
+    running, users are assigned to a variant by hashing their user id so they
+    see a stable weighting. Every profile reuses the same component vectors,
+    so switching profiles costs only the final weighted sum.
+    """
+
+    def __init__(self, default_profile: WeightProfile):
+        self.default_name = default_profile.name
+        self.profiles: Dict[str, WeightProfile] = {default_profile.name: default_profile}
+        self.experiment: Optional[Dict[str, Any]] = None
+        self._boundaries = []
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, float]] = {}
+
+    @classmethod
+    def from_engine_defaults(cls) -> "WeightProfileRegistry":
+        """Registry whose default profile mirrors the engine's built-in weights"""
+        engine = InternshipRecommendationEngine("")
+        return cls(WeightProfile("default", engine.weights, engine.skill_blend))
+
+    def add_profile(self, profile: WeightProfile) -> None:
+        self.profiles[profile.name] = profile
+
+    def set_experiment(self, name: str, variants: Dict[str, float]) -> None:
+        """
+        Start routing users without an explicit profile across variants
+
+        Args:
+            name: Experiment name (part of the hash, so renaming reshuffles users)
+            variants: Profile name -> traffic share (shares are normalized)
+        """
+        unknown = [variant for variant in variants if variant not in self.profiles]
+        if unknown:
+            raise ValueError(f"Unknown weight profiles in experiment: {', '.join(unknown)}")
+        total = float(sum(variants.values()))
+        if total <= 0:
+            raise ValueError("Experiment traffic shares must be positive")
+
+        boundaries, cumulative = [], 0.0
+        for variant, share in variants.items():
+            cumulative += share / total
+            boundaries.append((int(round(cumulative * BUCKETS)), variant))
+        self.experiment = {"name": name, "variants": dict(variants)}
+        self._boundaries = boundaries
+
+    def load_config(self, path: str) -> None:
+        """
+        Load profiles and an optional experiment from a JSON file
+
+        Format:
+            {"profiles": {"skills_first": {"weights": {...}, "skill_blend": 0.5}},
+             "experiment": {"name": "skills-v1", "variants": {"default": 50, "skills_first": 50}}}
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        default = self.profiles[self.default_name]
+        for name, spec in config.get("profiles", {}).items():
+            self.add_profile(WeightProfile(
+                name, spec.get("weights", default.weights), spec.get("skill_blend", default.skill_blend)
+            ))
+        experiment = config.get("experiment")
+        if experiment:
+            self.set_experiment(experiment["name"], experiment["variants"])
+
+    def resolve(self, profile_name: Optional[str] = None, user_id: Optional[str] = None) -> WeightProfile:
+        """
+        Pick the profile for a request
+
+        Raises:
+            KeyError: If profile_name is not a registered profile
+        """
+        if profile_name:
+            return self.profiles[profile_name]
+        if self.experiment and user_id:
+            key = f"{self.experiment['name']}:{user_id}".encode("utf-8")
+            bucket = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big") % BUCKETS
+            for boundary, variant in self._boundaries:
+                if bucket < boundary:
+                    return self.profiles[variant]
+        return self.profiles[self.default_name]
+
+    def record(self, profile_name: str, latency_seconds: float, results: int) -> None:
+        """Count a served request for a profile"""
+        with self._lock:
+            counters = self._counters.setdefault(profile_name, {
+                "requests": 0, "empty_responses": 0, "results_returned": 0,
+                "total_latency_ms": 0.0, "max_latency_ms": 0.0,
+            })
+            latency_ms = latency_seconds * 1000
+            counters["requests"] += 1
+            counters["empty_responses"] += 0 if results else 1
+            counters["results_returned"] += results
+            counters["total_latency_ms"] += latency_ms
+            counters["max_latency_ms"] = max(counters["max_latency_ms"], latency_ms)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Profiles, experiment configuration and per-profile counters"""
+        with self._lock:
+            counters = {}
+            for name, values in self._counters.items():
+                requests = values["requests"]
+                counters[name] = {
+                    **values,
+                    "mean_latency_ms": values["total_latency_ms"] / requests if requests else 0.0,
+                    "mean_results": values["results_returned"] / requests if requests else 0.0,
+                }
+        return {
+            "default_profile": self.default_name,
+            "profiles": {name: profile.to_dict() for name, profile in self.profiles.items()},
+            "experiment": self.experiment,
+            "counters": counters,
+        }
@@ -0,0 +1,272 @@
+# Weight Tuning over Cached Component-Score Matrices
+# File: backend/app/weight_tuning.py
+
+import argparse
+import contextlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.evaluation import generate_labeled_profiles, load_profiles
+from app.ranking import top_k_indices
+from app.recommendation_engine import MIN_SIMILARITY, InternshipRecommendationEngine
+
+# Cached component order; skill_match is stored as its TF-IDF and overlap parts
+COMPONENTS = ('content_similarity', 'skill_tfidf', 'skill_overlap',
+              'education_match', 'location_preference', 'sector_preference')
+
+WEIGHT_NAMES = ('content_similarity', 'skill_match', 'education_match',
+                'location_preference', 'sector_preference')
+
+
+def build_component_cache(engine: InternshipRecommendationEngine,
+                          labeled_profiles: List[Dict[str, Any]],
+                          pool_size: int = 200) -> Dict[str, np.ndarray]:
+    """
+    Score every profile once and keep the components of its candidate pool
+
+    The pool for each profile is the union of the top pool_size rows under the
+    engine's current weights and under each text component alone, which covers
+    the rows that can reach the top k under any reasonable weighting (use
+    pool_size >= catalog size for an exact cache).
+
+    Args:
+        engine: Loaded recommendation engine
+        labeled_profiles: Profiles with relevant_ids
+        pool_size: Rows kept per ranking used to build the pool
+
+    Returns:
+        Arrays for save_component_cache / evaluate_weights
+    """
+    id_to_row = {internship['id']: row for row, internship in enumerate(engine.internships)}
+    pools, values, relevant_masks, relevant_counts = [], [], [], []
+
+    for entry in labeled_profiles:
+        profile = entry['profile']
+        components = engine.compute_components(
+            profile['education'], profile['skills'],
+            profile.get('sectors'), profile.get('location_state')
+        )
+        final_scores = engine.combine_components(components)
+
+        pool = np.unique(np.concatenate([
+            top_k_indices(final_scores, pool_size),
+            top_k_indices(components['content_similarity'], pool_size),
+            top_k_indices(components['skill_tfidf'], pool_size),
+            top_k_indices(components['skill_overlap'], pool_size),
+        ]))
+        relevant_rows = {id_to_row[i] for i in entry['relevant_ids'] if i in id_to_row}
+
+        pools.append(pool)
+        values.append(np.stack([components[name][pool] for name in COMPONENTS]))
+        relevant_masks.append(np.isin(pool, list(relevant_rows)))
+        relevant_counts.append(len(relevant_rows))
+
+    width = max(len(pool) for pool in pools)
+    count = len(pools)
+    rows = np.full((count, width), -1, dtype=np.int32)
+    # float32 keeps near-ties and the MIN_SIMILARITY cut-off ordered as the engine ranks them
+    scores = np.zeros((len(COMPONENTS), count, width), dtype=np.float32)
+    relevant = np.zeros((count, width), dtype=bool)
+    for i, (pool, value, mask) in enumerate(zip(pools, values, relevant_masks)):
+        rows[i, :len(pool)] = pool
+        scores[:, i, :len(pool)] = value
+        relevant[i, :len(pool)] = mask
+
+    return {
+        'rows': rows,
+        'components': scores,
+        'relevant': relevant,
+        'relevant_counts': np.array(relevant_counts, dtype=np.int32),
+    }
+
+
+def save_component_cache(cache: Dict[str, np.ndarray], path: str) -> None:
+    """Write a component cache as a compressed .npz file"""
+    np.savez_compressed(path, **cache)
+
+
+def load_component_cache(path: str) -> Dict[str, np.ndarray]:
+    """Read a component cache written by save_component_cache"""
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def weight_coefficients(weights: Dict[str, float], skill_blend: float) -> np.ndarray:
+    """Per-component coefficients (COMPONENTS order) for a weighting and skill blend"""
+    return np.array([
+        weights['content_similarity'],
+        weights['skill_match'] * skill_blend,
+        weights['skill_match'] * (1 - skill_blend),
+        weights['education_match'],
+        weights['location_preference'],
+        weights['sector_preference'],
+    ], dtype=np.float32)
+
+
+def evaluate_weights(cache: Dict[str, np.ndarray], coefficients: np.ndarray,
+                     k: int = 5) -> Dict[str, np.ndarray]:
+    """
+    Score many weightings at once from the cached components
+
+    Args:
+        cache: Component cache
+        coefficients: (trials, 6) coefficient matrix from weight_coefficients
+        k: Ranking cut-off
+
+    Returns:
+        Mean precision@k, recall@k and nDCG@k per trial
+    """
+    components = np.asarray(cache['components'], dtype=np.float32)
+    valid = cache['rows'] >= 0
+    relevant = cache['relevant']
+    relevant_counts = cache['relevant_counts']
+
+    # (trials, profiles, pool) in one tensor contraction
+    scores = np.tensordot(coefficients, components, axes=(1, 0))
+    scores[:, ~valid] = -np.inf
+    scores[scores < MIN_SIMILARITY] = -np.inf
+
+    k = min(k, scores.shape[2])
+    top = np.argpartition(-scores, k - 1, axis=2)[:, :, :k]
+    top_scores = np.take_along_axis(scores, top, axis=2)
+    order = np.argsort(-top_scores, axis=2, kind='stable')
+    top = np.take_along_axis(top, order, axis=2)
+    top_scores = np.take_along_axis(top_scores, order, axis=2)
+
+    hits = np.take_along_axis(np.broadcast_to(relevant, scores.shape), top, axis=2)
+    hits &= np.isfinite(top_scores)
+
+    discounts = 1.0 / np.log2(np.arange(k) + 2)
+    dcg = (hits * discounts).sum(axis=2)
+    ideal = np.cumsum(discounts)[np.clip(np.minimum(relevant_counts, k) - 1, 0, None)]
+    ideal = np.where(relevant_counts > 0, ideal, 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ndcg = np.where(ideal > 0, dcg / ideal, 0.0)
+        recall = np.where(relevant_counts > 0, hits.sum(axis=2) / relevant_counts, 0.0)
+
+    return {
+        'precision': (hits.sum(axis=2) / k).mean(axis=1),
+        'recall': recall.mean(axis=1),
+        'ndcg': ndcg.mean(axis=1),
+    }
+
+
+def search_weights(cache: Dict[str, np.ndarray], trials: int = 2000, k: int = 5,
+                   metric: str = 'ndcg', method: str = 'random',
+                   skill_blends: Optional[List[float]] = None, grid_step: float = 0.1,
+                   batch_size: int = 32, seed: int = 42) -> Dict[str, Any]:
+    """
+    Search weight vectors and skill blends against the cached components
+
+    Args:
+        cache: Component cache
+        trials: Number of random weightings (random search)
+        k: Ranking cut-off
+        metric: 'ndcg', 'precision' or 'recall'
+        method: 'random' (Dirichlet samples) or 'grid' (every weighting on a simplex grid)
+        skill_blends: Candidate TF-IDF shares for skill_match
+        grid_step: Weight increment for grid search
+        batch_size: Weightings evaluated per tensor contraction
+        seed: Random seed
+
+    Returns:
+        Best weights, skill blend and metrics, plus search statistics
+    """
+    skill_blends = skill_blends or [0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
+
+    if method == 'grid':
+        n = int(round(1 / grid_step))
+        steps = range(n + 1)
+        grid = [
+            (a, b, c, d, n - a - b - c - d)
+            for a in steps for b in steps[:n + 1 - a] for c in steps[:n + 1 - a - b]
+            for d in steps[:n + 1 - a - b - c]
+        ]
+        weight_vectors = np.array(grid, dtype=np.float32) / n
+    else:
+        weight_vectors = np.random.default_rng(seed).dirichlet(np.ones(len(WEIGHT_NAMES)), trials)
+
+    candidates = [
+        (dict(zip(WEIGHT_NAMES, map(float, vector))), blend)
+        for vector in weight_vectors for blend in skill_blends
+    ]
+
+    start = time.perf_counter()
+    best_index, best_value, best_metrics = -1, -np.inf, None
+    for offset in range(0, len(candidates), batch_size):
+        batch = candidates[offset:offset + batch_size]
+        coefficients = np.stack([weight_coefficients(w, blend) for w, blend in batch])
+        metrics = evaluate_weights(cache, coefficients, k)
+        i = int(np.argmax(metrics[metric]))
+        if metrics[metric][i] > best_value:
+            best_index, best_value = offset + i, float(metrics[metric][i])
+            best_metrics = {name: float(values[i]) for name, values in metrics.items()}
+    elapsed = time.perf_counter() - start
+
+    weights, blend = candidates[best_index]
+    return {
+        'weights': {name: round(value, 4) for name, value in weights.items()},
+        'skill_blend': blend,
+        'metrics': best_metrics,
+        'evaluated': len(candidates),
+        'seconds': round(elapsed, 3),
+    }
+
+
+# CLI interface for weight tuning
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune scoring weights from cached component scores")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="Score profiles once and cache their components")
+    build.add_argument("--data", default=os.path.join(os.path.dirname(__file__), "..", "data",
+                                                      "internships_dataset.json"))
+    build.add_argument("--profiles", help="Labeled profiles (JSON array or NDJSON)")
+    build.add_argument("--generate", type=int, default=500)
+    build.add_argument("--pool", type=int, default=200)
+    build.add_argument("--cache", required=True, help="Output .npz path")
+
+    search = subparsers.add_parser("search", help="Search weights against a cache")
+    search.add_argument("--cache", required=True)
+    search.add_argument("--trials", type=int, default=2000)
+    search.add_argument("--method", choices=["random", "grid"], default="random")
+    search.add_argument("--grid-step", type=float, default=0.1)
+    search.add_argument("--metric", choices=["ndcg", "precision", "recall"], default="ndcg")
+    search.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        engine = InternshipRecommendationEngine(args.data, exclude_expired=False)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            engine.load_data()
+        if args.profiles:
+            labeled = load_profiles(args.profiles)
+        else:
+            labeled = generate_labeled_profiles(engine.internships, args.generate)
+
+        start = time.perf_counter()
+        component_cache = build_component_cache(engine, labeled, args.pool)
+        save_component_cache(component_cache, args.cache)
+        print(f"✅ Cached components for {len(labeled)} profiles "
+              f"(pool width {component_cache['rows'].shape[1]}) in {time.perf_counter() - start:.1f}s")
+        print(f"💾 {args.cache}: {os.path.getsize(args.cache) / 1e6:.2f} MB")
+    else:
+        component_cache = load_component_cache(args.cache)
+        engine_defaults = InternshipRecommendationEngine("")
+        baseline = evaluate_weights(
+            component_cache,
+            weight_coefficients(engine_defaults.weights, engine_defaults.skill_blend)[None, :],
+            args.k
+        )
+        result = search_weights(component_cache, trials=args.trials, k=args.k,
+                                metric=args.metric, method=args.method, grid_step=args.grid_step)
+        print(f"📊 Current weights: {args.metric}@{args.k} = {float(baseline[args.metric][0]):.4f}")
+        print(f"🏆 Best of {result['evaluated']} weightings in {result['seconds']}s: "
+              f"{args.metric}@{args.k} = {result['metrics'][args.metric]:.4f}")
+        print(json.dumps({"weights": result["weights"], "skill_blend": result["skill_blend"],
+                          "metrics": result["metrics"]}, indent=2))
@@ -0,0 +1,30 @@
+# Shared helpers for benchmarks: synthetic catalogs of arbitrary size
+# File: backend/benchmarks/_catalog.py
+
+import contextlib
+import json
+import os
+import random
+import tempfile
+
+from app.data_processor import InternshipDataProcessor
+from app.recommendation_engine import InternshipRecommendationEngine
+
+
+def synthetic_catalog_path(size: int, seed: int = 42) -> str:
+    """Generate (or reuse) a synthetic dataset with the given number of internships"""
+    path = os.path.join(tempfile.gettempdir(), f"internships_synthetic_{size}_{seed}.json")
+    if not os.path.exists(path):
+        random.seed(seed)
+        internships = InternshipDataProcessor().generate_comprehensive_dataset(size)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(internships, f, ensure_ascii=False)
+    return path
+
+
+def load_engine(data_path: str) -> InternshipRecommendationEngine:
+    """Build an engine without the load-time console output"""
+    engine = InternshipRecommendationEngine(data_path)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        engine.load_data()
+    return engine
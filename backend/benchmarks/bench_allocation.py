@@ -0,0 +1,90 @@
+# Benchmark: Auction Allocation on Large Candidate Graphs
+# File: backend/benchmarks/bench_allocation.py
+#
+# Usage (from backend/):
+#   python -m benchmarks.bench_allocation [--students 1000000] [--internships 100000] [--k 20]
+#   python -m benchmarks.bench_allocation --catalog-students 2000   # real scores from the engine
+#
+# The synthetic graph skews demand like real rankings do: a few listings
+# appear in most students' top k. --catalog-students builds the graph from
+# real engine scores on a synthetic catalog instead.
+
+import argparse
+import json
+import os
+import resource
+import tempfile
+import time
+
+import numpy as np
+
+from app.allocation import CandidateGraph, auction_allocate, build_candidate_graph, independent_top1_overflow
+from app.evaluation import generate_labeled_profiles
+from benchmarks._catalog import load_engine, synthetic_catalog_path
+
+
+def synthetic_graph(students: int, internships: int, k: int, seed: int = 42) -> CandidateGraph:
+    """Top-k graph with Zipf-like listing popularity and scores in [MIN_SIMILARITY, 1]"""
+    rng = np.random.default_rng(seed)
+    popularity = 1.0 / np.arange(1, internships + 1) ** 0.8
+    popularity /= popularity.sum()
+    items = np.sort(rng.choice(internships, size=(students, k), p=popularity).astype(np.int32), axis=1)
+    utilities = np.clip(rng.normal(0.55, 0.15, size=(students, k)), 0.2, 1.0).astype(np.float32)
+    # Drop repeated listings within a student's row
+    keep = np.ones((students, k), dtype=bool)
+    keep[:, 1:] = items[:, 1:] != items[:, :-1]
+    indptr = np.zeros(students + 1, dtype=np.int64)
+    np.cumsum(keep.sum(axis=1), out=indptr[1:])
+    # Rows best first, as engine.top_rows returns them
+    rows = np.repeat(np.arange(students), k).reshape(students, k)[keep]
+    order = np.lexsort((-utilities[keep], rows))
+    return CandidateGraph(list(range(students)), indptr, items[keep][order], utilities[keep][order])
+
+
+def catalog_graph(students: int, size: int, k: int, workers: int) -> CandidateGraph:
+    """Top-k graph from engine scores of generated profiles on a synthetic catalog"""
+    data_path = synthetic_catalog_path(size)
+    engine = load_engine(data_path)
+    path = os.path.join(tempfile.gettempdir(), f"allocation_students_{students}.ndjson")
+    with open(path, "w", encoding="utf-8") as f:
+        for i, entry in enumerate(generate_labeled_profiles(engine.internships, students)):
+            f.write(json.dumps({**entry["profile"], "student_id": i}) + "\n")
+    graph, _, _, _ = build_candidate_graph(path, data_path, k, workers, exclude_expired=False)
+    return graph
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time the auction allocation on a large candidate graph")
+    parser.add_argument("--students", type=int, default=1000000)
+    parser.add_argument("--internships", type=int, default=100000)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--capacities", type=int, nargs="+", default=[1, 5])
+    parser.add_argument("--epsilon", type=float, default=1e-3)
+    parser.add_argument("--catalog-students", type=int, help="Use engine scores for this many profiles instead")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.catalog_students:
+        graph = catalog_graph(args.catalog_students, args.internships, args.k, args.workers)
+    else:
+        graph = synthetic_graph(args.students, args.internships, args.k)
+    print(f"\nGraph: {graph.students} students x {args.internships} internships, {graph.edges} edges "
+          f"({graph.nbytes / 1e6:.0f} MB), built in {time.perf_counter() - start:.1f}s")
+
+    print(f"\n{'seats/listing':>13} {'assigned':>9} {'objective':>11} {'gap':>8} {'rounds':>7} "
+          f"{'solve s':>8} {'top-1 overflow':>15}")
+    for capacity in args.capacities:
+        capacities = np.full(args.internships, capacity, dtype=np.int64)
+        result = auction_allocate(graph, capacities, args.epsilon)
+        gap = (result["dual_bound"] - result["objective"]) / result["dual_bound"]
+        overflow = independent_top1_overflow(graph, capacities)["students_over_capacity"]
+        print(f"{capacity:>13} {result['assigned']:>9} {result['objective']:>11.1f} {gap:>8.3%} "
+              f"{result['rounds']:>7} {result['seconds']:>8.1f} {overflow:>15}")
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"\nPeak memory: {peak:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
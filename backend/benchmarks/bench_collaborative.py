@@ -0,0 +1,140 @@
+# Benchmark: Implicit-ALS Training Time, Held-out Recall and Scoring Overhead
+# File: backend/benchmarks/bench_collaborative.py
+#
+# Usage (from backend/): python -m benchmarks.bench_collaborative [--interactions 10000000] [--users 500000]
+#
+# Interactions are generated from latent student cohorts: each cohort
+# favours its own Zipf-ranked subset of listings, with some traffic to
+# globally popular ones. One interaction per evaluated student is held out;
+# recall@k of the trained factors is compared with a popularity ranking.
+# Scoring overhead is the p50 of rank_rows with and without the
+# collaborative weight on a synthetic catalog.
+
+import argparse
+import resource
+import time
+
+import numpy as np
+
+from app.collaborative import CollaborativeModel, interaction_matrix, train_implicit_als
+from app.evaluation import generate_labeled_profiles
+from app.models import RecommendationRequest
+from benchmarks._catalog import load_engine, synthetic_catalog_path
+
+
+def synthetic_interactions(users: int, items: int, interactions: int, cohorts: int = 500,
+                           cohort_items: int = 400, seed: int = 42):
+    """(user, item, weight) triples with cohort structure"""
+    rng = np.random.default_rng(seed)
+    cohort_of_user = rng.integers(0, cohorts, users)
+    favourites = np.stack([rng.choice(items, cohort_items, replace=False) for _ in range(cohorts)])
+    global_popularity = 1.0 / np.arange(1, items + 1) ** 0.9
+    global_popularity /= global_popularity.sum()
+
+    user_ids = rng.integers(0, users, interactions)
+    from_cohort = rng.random(interactions) < 0.8
+    ranks = np.minimum(rng.zipf(1.4, interactions) - 1, cohort_items - 1)
+    item_ids = np.where(
+        from_cohort,
+        favourites[cohort_of_user[user_ids], ranks],
+        rng.choice(items, interactions, p=global_popularity)
+    )
+    weights = rng.choice(np.array([1.0, 3.0, 10.0, 20.0], dtype=np.float32), interactions,
+                         p=[0.6, 0.3, 0.09, 0.01])
+    return user_ids.astype(np.uint64) + 1, item_ids.astype(np.int64), weights
+
+
+def hold_out(matrix, students: int, seed: int = 7):
+    """Remove one observed listing for each of `students` random users; returns (matrix, users, held items)"""
+    rng = np.random.default_rng(seed)
+    counts = np.diff(matrix.indptr)
+    candidates = np.flatnonzero(counts >= 2)
+    chosen = rng.choice(candidates, min(students, len(candidates)), replace=False)
+    positions = matrix.indptr[chosen] + rng.integers(0, counts[chosen])
+    held = matrix.indices[positions].copy()
+    matrix = matrix.copy()
+    matrix.data[positions] = 0
+    matrix.eliminate_zeros()
+    return matrix, chosen, held
+
+
+def recall_at_k(matrix, scores_for, students: np.ndarray, held: np.ndarray, k: int, batch: int = 200) -> float:
+    """Share of held-out listings ranked in the top k, excluding listings seen in training"""
+    hits = 0
+    for start in range(0, len(students), batch):
+        users = students[start:start + batch]
+        scores = scores_for(users)
+        seen = matrix[users]
+        scores[np.repeat(np.arange(len(users)), np.diff(seen.indptr)), seen.indices] = -np.inf
+        top = np.argpartition(-scores, k, axis=1)[:, :k]
+        hits += int((top == held[start:start + batch, None]).any(axis=1).sum())
+    return hits / len(students)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train implicit ALS on synthetic interactions")
+    parser.add_argument("--interactions", type=int, default=10000000)
+    parser.add_argument("--users", type=int, default=500000)
+    parser.add_argument("--catalog", type=int, default=100000)
+    parser.add_argument("--factors", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--cg-steps", type=int, default=3)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--holdout", type=int, default=20000)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    user_keys, item_ids, weights = synthetic_interactions(args.users, args.catalog, args.interactions)
+    matrix, users, items = interaction_matrix(user_keys, item_ids, weights)
+    del user_keys, item_ids, weights
+    train, students, held = hold_out(matrix, args.holdout)
+    print(f"\nInteractions: {args.interactions} events -> {train.nnz} (student, listing) pairs, "
+          f"{train.shape[0]} students x {train.shape[1]} listings, built in {time.perf_counter() - start:.1f}s")
+
+    user_factors, item_factors, report = train_implicit_als(
+        train, args.factors, args.iterations, cg_steps=args.cg_steps, workers=args.workers
+    )
+    print(f"Training: {report['seconds']:.1f}s ({report['seconds_per_iteration']:.1f}s per iteration, "
+          f"{report['iterations']} iterations, {report['workers']} workers, {args.factors} factors)")
+
+    popularity = np.asarray(train.sum(axis=0)).ravel()
+    als_recall = recall_at_k(train, lambda rows: user_factors[rows] @ item_factors.T, students, held, args.k)
+    popular_recall = recall_at_k(
+        train, lambda rows: np.tile(popularity, (len(rows), 1)), students, held, args.k
+    )
+    print(f"Held-out recall@{args.k}: ALS {als_recall:.3f}, popularity {popular_recall:.3f}")
+    print(f"Peak memory: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+    # Scoring overhead on a catalog whose internship ids are the trained listing ids
+    engine = load_engine(synthetic_catalog_path(args.catalog))
+    model = CollaborativeModel(users, user_factors, engine.row_ids[items], item_factors)
+    engine.attach_collaborative(model)
+    requests = [RecommendationRequest(**entry["profile"])
+                for entry in generate_labeled_profiles(engine.internships, args.queries)]
+    rng = np.random.default_rng(3)
+    known_users = rng.choice(model.user_keys, len(requests))
+
+    print(f"\n{'collaborative':>13} {'p50 ms':>7} {'p95 ms':>7}")
+    for weight in (0.0, 0.1):
+        weights = dict(engine.weights, collaborative=weight)
+        latencies = []
+        for request, user in zip(requests, known_users):
+            query_start = time.perf_counter()
+            engine.rank_rows(request.education, request.skills, request.sectors, request.location_state, 10,
+                             weights=weights, user=int(user))
+            latencies.append((time.perf_counter() - query_start) * 1000)
+        p50, p95 = np.percentile(latencies, [50, 95])
+        print(f"{weight:>13} {p50:>7.2f} {p95:>7.2f}")
+    mat_vec = []
+    for user in known_users:
+        query_start = time.perf_counter()
+        engine.collaborative_scores(dict(engine.weights, collaborative=0.1), int(user))
+        mat_vec.append((time.perf_counter() - query_start) * 1000)
+    print(f"Collaborative mat-vec alone: {np.median(mat_vec):.2f} ms p50 "
+          f"({engine.collaborative_factors.nbytes / 1e6:.1f} MB of float32 listing factors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# Benchmark: Bytes on Wire and CPU per Response With and Without Compression
+# File: backend/benchmarks/bench_compression.py
+#
+# Usage (from backend/): python -m benchmarks.bench_compression
+
+import contextlib
+import json
+import os
+import time
+
+from app.compression import available_encodings, compress
+from app.recommendation_engine import InternshipRecommendationEngine
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "internships_dataset.json")
+RUNS = 500
+
+
+def _cpu_us(fn) -> float:
+    """Mean process CPU time per call in microseconds"""
+    start = time.process_time()
+    for _ in range(RUNS):
+        fn()
+    return (time.process_time() - start) / RUNS * 1e6
+
+
+def main() -> None:
+    engine = InternshipRecommendationEngine(DATA_PATH)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        engine.load_data()
+
+    print(f"Encodings available: {', '.join(available_encodings())}\n")
+    print(f"{'endpoint':<12} {'mode':<26} {'bytes':>8} {'cpu µs':>9}")
+
+    static_sources = {
+        "sectors": engine.get_sectors,
+        "locations": engine.get_locations,
+        "skills": engine.get_skills,
+        "stats": engine.get_statistics,
+    }
+    for name, source in static_sources.items():
+        payload = engine.catalog_payloads[name]
+        # Before: handlers rebuilt and encoded the payload on every request
+        before = _cpu_us(lambda: json.dumps(source()).encode("utf-8"))
+        print(f"{name:<12} {'per-request json':<26} {len(json.dumps(source()).encode()):>8} {before:>9.1f}")
+        for encoding, size in payload.sizes().items():
+            after = _cpu_us(lambda: payload.response(encoding))
+            print(f"{'':<12} {'precompressed ' + encoding:<26} {size:>8} {after:>9.1f}")
+
+    rows = engine.get_recommendation_rows("B.Tech", ["Python", "SQL"], ["Technology"], None, 10)
+    body = engine.render_recommendations_json(rows)
+    print(f"{'recommend':<12} {'identity':<26} {len(body):>8} {0.0:>9.1f}")
+    for encoding in available_encodings():
+        cost = _cpu_us(lambda: compress(body, encoding))
+        print(f"{'':<12} {'dynamic ' + encoding:<26} {len(compress(body, encoding)):>8} {cost:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# Benchmark: Listing Counter Throughput and Scoring Interference
+# File: backend/benchmarks/bench_counters.py
+#
+# Usage (from backend/): python -m benchmarks.bench_counters [--catalog 100000] [--rate 5000]
+#
+# Measures increments per second through ListingCounters (one event per
+# call, as /api/events receives them) from threads and from processes
+# sharing one segment, checks no increment was lost, then times scoring with
+# and without the congestion penalty while a background thread applies
+# --rate increments per second.
+
+import argparse
+import multiprocessing
+import queue
+import threading
+import time
+
+import numpy as np
+
+from app.evaluation import generate_labeled_profiles
+from app.listing_counters import APPLICATIONS, ListingCounters
+from app.models import RecommendationRequest
+from benchmarks._catalog import load_engine, synthetic_catalog_path
+
+SEGMENT_NAME = "bench_listing_counters"
+
+
+def _increment(counters: ListingCounters, ids: np.ndarray, result) -> None:
+    """Apply one increment per id (runs in a thread or a forked process)"""
+    for internship_id in ids:
+        counters.add(APPLICATIONS, (int(internship_id),))
+    result.put(len(ids))
+
+
+def increment_throughput(capacity: int, events: int, writers: int, processes: bool) -> float:
+    """Increments per second from several writers to one shared segment; checks the total"""
+    # Forked writers inherit the mapping, as pre-forked gunicorn workers do
+    counters = ListingCounters(capacity, SEGMENT_NAME)
+    rng = np.random.default_rng(42)
+    # Zipf-like ids so hot listings contend on the same stripes
+    ids = (rng.zipf(1.3, events) - 1) % capacity
+    parts = np.array_split(ids, writers)
+    if processes:
+        context = multiprocessing.get_context("fork")
+        result = context.Queue()
+        runners = [context.Process(target=_increment, args=(counters, part, result)) for part in parts]
+    else:
+        result = queue.Queue()
+        runners = [threading.Thread(target=_increment, args=(counters, part, result)) for part in parts]
+    start = time.perf_counter()
+    for runner in runners:
+        runner.start()
+    counted = sum(result.get() for _ in runners)
+    for runner in runners:
+        runner.join()
+    seconds = time.perf_counter() - start
+    total = int(counters.values[APPLICATIONS].sum())
+    counters.unlink()
+    counters.close()
+    if counted != events or total != events:
+        raise AssertionError(f"Lost increments: {events} sent, {total} counted")
+    return events / seconds
+
+
+def scoring_latencies(engine, requests, rate: int) -> np.ndarray:
+    """Per-request scoring latency (ms) while a thread applies rate increments per second"""
+    stop = threading.Event()
+
+    def load() -> None:
+        ids = engine.row_ids
+        rng = np.random.default_rng(7)
+        batch = max(rate // 100, 1)
+        while not stop.is_set():
+            for internship_id in rng.choice(ids, batch):
+                engine.listing_counters.add(APPLICATIONS, (int(internship_id),))
+            time.sleep(batch / rate)
+
+    writer = threading.Thread(target=load) if rate else None
+    if writer:
+        writer.start()
+    latencies = []
+    for request in requests:
+        start = time.perf_counter()
+        engine.rank_rows(request.education, request.skills, request.sectors, request.location_state, 10)
+        latencies.append((time.perf_counter() - start) * 1000)
+    stop.set()
+    if writer:
+        writer.join()
+    return np.array(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Listing counter throughput and its effect on scoring")
+    parser.add_argument("--catalog", type=int, default=100000)
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--rate", type=int, default=5000, help="Background increments per second while scoring")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    capacity = 1 << 18
+    print(f"\n{'writers':>16} {'increments/s':>13}")
+    for label, writers, processes in (("1 thread", 1, False), (f"{args.writers} threads", args.writers, False),
+                                      (f"{args.writers} processes", args.writers, True)):
+        rate = increment_throughput(capacity, args.events, writers, processes)
+        print(f"{label:>16} {rate:>13,.0f}")
+
+    engine = load_engine(synthetic_catalog_path(args.catalog))
+    requests = [RecommendationRequest(**entry["profile"])
+                for entry in generate_labeled_profiles(engine.internships, args.queries)]
+    counters = ListingCounters(capacity)
+    rng = np.random.default_rng(1)
+    counters.set_seats({int(i): int(s) for i, s in zip(engine.row_ids, rng.integers(0, 10, len(engine.row_ids)))})
+    engine.listing_counters = counters
+
+    print(f"\n{'penalty':>8} {'increments/s':>13} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7}")
+    for weight, rate in ((0.0, 0), (0.0, args.rate), (0.3, 0), (0.3, args.rate)):
+        engine.congestion_weight = weight
+        scoring_latencies(engine, requests[:10], 0)
+        p50, p95, p99 = np.percentile(scoring_latencies(engine, requests, rate), [50, 95, 99])
+        print(f"{weight:>8} {rate:>13} {p50:>7.1f} {p95:>7.1f} {p99:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# Benchmark: MMR Diversity Re-ranking Overhead by Candidate Pool Size
+# File: backend/benchmarks/bench_diversity.py
+#
+# Usage (from backend/): python -m benchmarks.bench_diversity [--size 20000]
+
+import argparse
+import timeit
+
+import numpy as np
+
+from app.ranking import mmr_rerank, top_k_indices
+from benchmarks._catalog import load_engine, synthetic_catalog_path
+
+QUERY = {"education": "B.Tech", "skills": ["Python", "SQL", "Machine Learning"],
+         "sectors": ["Technology"], "location_state": "Telangana", "max_results": 10}
+
+
+def main(size: int, runs: int) -> None:
+    engine = load_engine(synthetic_catalog_path(size))
+    index = engine.catalog_index
+    request_ms = timeit.timeit(lambda: engine.get_recommendation_rows(**QUERY), number=runs) / runs * 1000
+    print(f"Catalog size: {size}, full request without re-ranking: {request_ms:.2f}ms")
+
+    scores = np.random.default_rng(0).random(size)
+    for pool_size in (100, 300, 1000):
+        def rerank(**caps):
+            pool = top_k_indices(scores, pool_size)
+            return mmr_rerank(scores[pool], engine.tfidf_matrix[pool], QUERY["max_results"],
+                              company_codes=index.company_codes[pool],
+                              sector_codes=index.sector_codes[pool], **caps)
+
+        plain = timeit.timeit(lambda: top_k_indices(scores, QUERY["max_results"]), number=runs) / runs * 1000
+        mmr = timeit.timeit(rerank, number=runs) / runs * 1000
+        capped = timeit.timeit(lambda: rerank(max_per_company=1, max_per_sector=3), number=runs) / runs * 1000
+        print(f"  pool={pool_size:<5} top-k only {plain:6.2f}ms  mmr {mmr:6.2f}ms  mmr+caps {capped:6.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    main(args.size, args.runs)
@@ -0,0 +1,93 @@
+# Benchmark: Event Log Append Latency and Flush Throughput
+# File: backend/benchmarks/bench_event_log.py
+#
+# Usage (from backend/): python -m benchmarks.bench_event_log [--events 1000000] [--batch 10]
+#
+# Times EventLog.append as /api/recommend calls it (one impression per
+# returned listing), alone and while a writer thread flushes concurrently,
+# then pushes a burst faster than the writer drains to show events being
+# dropped instead of blocking, and reports flush throughput per format.
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from app.event_log import IMPRESSION, EventLog, read_segment
+
+
+def append_latencies(log: EventLog, appends: int, batch: int) -> np.ndarray:
+    """Per-call append latency in microseconds"""
+    rng = np.random.default_rng(42)
+    ids = rng.integers(0, 100000, (appends, batch))
+    scores = rng.random((appends, batch))
+    latencies = np.empty(appends)
+    for i in range(appends):
+        start = time.perf_counter()
+        log.append(IMPRESSION, ids[i], scores[i], i, i, 1, "default")
+        latencies[i] = (time.perf_counter() - start) * 1e6
+    return latencies
+
+
+def flush_continuously(log: EventLog, stop: threading.Event, interval: float) -> None:
+    """Writer thread standing in for the background flush task"""
+    while not stop.is_set():
+        log.flush()
+        time.sleep(interval)
+    log.flush(close=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Event log append latency and flush throughput")
+    parser.add_argument("--events", type=int, default=1000000)
+    parser.add_argument("--batch", type=int, default=10, help="Impressions per append (listings per response)")
+    parser.add_argument("--capacity", type=int, default=65536)
+    parser.add_argument("--flush-interval", type=float, default=0.05)
+    args = parser.parse_args()
+    appends = args.events // args.batch
+
+    print(f"\n{'format':>7} {'writer':>8} {'p50 us':>7} {'p99 us':>7} {'max us':>8} {'appends/s':>10} "
+          f"{'dropped':>8} {'written':>8} {'MB on disk':>11} {'B/event':>8}")
+    for segment_format in ("ndjson", "binary"):
+        for concurrent in (False, True):
+            directory = tempfile.mkdtemp(prefix="bench_events_")
+            log = EventLog(directory, segment_format, args.capacity)
+            stop = threading.Event()
+            writer = threading.Thread(target=flush_continuously, args=(log, stop, args.flush_interval))
+            if concurrent:
+                writer.start()
+            start = time.perf_counter()
+            latencies = append_latencies(log, appends, args.batch)
+            seconds = time.perf_counter() - start
+            if concurrent:
+                stop.set()
+                writer.join()
+            else:
+                log.flush(close=True)
+            size = sum(os.path.getsize(path) for path in log.segment_files())
+            read_back = sum(len(read_segment(path)) for path in log.segment_files())
+            if read_back != log.written:
+                raise AssertionError(f"{log.written} events written, {read_back} read back")
+            p50, p99 = np.percentile(latencies, [50, 99])
+            print(f"{segment_format:>7} {'thread' if concurrent else 'none':>8} {p50:>7.1f} {p99:>7.1f} "
+                  f"{latencies.max():>8.0f} {appends / seconds:>10,.0f} {log.dropped:>8} {log.written:>8} "
+                  f"{size / 1e6:>11.1f} {size / max(log.written, 1):>8.1f}")
+            shutil.rmtree(directory)
+
+        # Flush throughput on a full buffer, off the request path
+        directory = tempfile.mkdtemp(prefix="bench_events_")
+        log = EventLog(directory, segment_format, args.capacity)
+        append_latencies(log, args.capacity // args.batch, args.batch)
+        start = time.perf_counter()
+        written = log.flush(close=True)
+        print(f"{segment_format:>7} flush of {written} events: {(time.perf_counter() - start) * 1000:.0f} ms "
+              f"({written / (time.perf_counter() - start):,.0f} events/s)")
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# Benchmark: Hard-Filtered vs Unfiltered Recommendation Latency
+# File: backend/benchmarks/bench_filters.py
+#
+# Usage (from backend/): python -m benchmarks.bench_filters [--size 20000]
+
+import argparse
+import timeit
+
+from benchmarks._catalog import load_engine, synthetic_catalog_path
+
+QUERY = {"education": "B.Tech", "skills": ["Python", "SQL", "Machine Learning"],
+         "sectors": ["Technology"], "location_state": "Telangana", "max_results": 10}
+
+CASES = {
+    "unfiltered": None,
+    "unselective (open, >=8 weeks)": {"open_only": True, "min_duration_weeks": 8},
+    "medium (stipend >= 20000)": {"min_stipend": 20000},
+    "selective (stipend >= 28000, <=8 weeks, eligible)": {
+        "min_stipend": 28000, "max_duration_weeks": 8, "strict_eligibility": True
+    },
+}
+
+
+def main(size: int, runs: int) -> None:
+    engine = load_engine(synthetic_catalog_path(size))
+    print(f"Catalog size: {size}")
+    for name, filters in CASES.items():
+        rows = engine.filter_rows(QUERY["education"], **(filters or {}))
+        surviving = size if rows is None else len(rows)
+        filter_ms = timeit.timeit(
+            lambda: engine.filter_rows(QUERY["education"], **(filters or {})), number=runs
+        ) / runs * 1000
+        total_ms = timeit.timeit(
+            lambda: engine.get_recommendation_rows(**QUERY, filters=filters), number=runs
+        ) / runs * 1000
+        print(f"  {name:<52} rows={surviving:<7} filter={filter_ms:7.3f}ms total={total_ms:8.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    main(args.size, args.runs)
@@ -0,0 +1,71 @@
+# Benchmark: Import-time Profile of the API Process
+# File: backend/benchmarks/bench_imports.py
+#
+# Usage (from backend/): python -m benchmarks.bench_imports [--module app.main] [--top 15]
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+# Modules the API import path should not load (engine builds import them on demand)
+HEAVY_MODULES = ("pandas", "sklearn", "scipy")
+
+
+def import_profile(module: str) -> List[Tuple[str, int, int]]:
+    """
+    Import a module in a fresh interpreter under -X importtime
+
+    Returns:
+        (module, self us, cumulative us) for every imported module, in import order
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    profile = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile.append((name.strip(), int(self_us), int(cumulative_us)))
+    return profile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile import time of the API process")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    totals = []
+    for _ in range(args.runs):
+        profile = import_profile(args.module)
+        totals.append(sum(self_us for _, self_us, _ in profile))
+    totals.sort()
+
+    print(f"\n📦 import {args.module}: {len(profile)} modules, "
+          f"median {totals[len(totals) // 2] / 1000:.0f} ms over {args.runs} runs")
+
+    by_package = {}
+    for name, self_us, _ in profile:
+        package = name.strip().split(".")[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+    print(f"{'package':<30} {'self ms':>10}")
+    for package, self_us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{package:<30} {self_us / 1000:>10.1f}")
+
+    loaded = {name.strip().split(".")[0] for name, _, _ in profile}
+    heavy = [name for name in HEAVY_MODULES if name in loaded]
+    if heavy:
+        print(f"⚠️ Heavy modules on the import path: {', '.join(heavy)}")
+    else:
+        print(f"✅ None of {', '.join(HEAVY_MODULES)} imported")
+
+
+if __name__ == "__main__":
+    main()
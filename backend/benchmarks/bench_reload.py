@@ -0,0 +1,91 @@
+# Benchmark: Request Latency and Failures During Catalog Hot-Reload
+# File: backend/benchmarks/bench_reload.py
+#
+# Usage (from backend/): python -m benchmarks.bench_reload [--mode process|thread]
+
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from app.engine_manager import EngineManager
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "internships_dataset.json")
+
+QUERIES = [
+    {"education": "B.Tech", "skills": ["Python", "SQL"], "sectors": ["Technology"], "location_state": "Telangana"},
+    {"education": "MBA", "skills": ["Financial Analysis", "Excel"], "sectors": ["Finance"], "location_state": None},
+    {"education": "BSc", "skills": ["Research", "Data Entry"], "sectors": None, "location_state": "Delhi"},
+]
+
+
+def _client(manager: EngineManager, stop: threading.Event, phase: Dict[str, str],
+            latencies: Dict[str, List[float]], failures: List[str]) -> None:
+    """Issue recommendations back-to-back against whatever snapshot is current"""
+    i = 0
+    while not stop.is_set():
+        query = QUERIES[i % len(QUERIES)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            engine = manager.current.engine
+            if not engine.get_recommendations(**query):
+                failures.append("empty result")
+        except Exception as e:
+            failures.append(repr(e))
+        latencies[phase["name"]].append((time.perf_counter() - start) * 1000)
+
+
+async def run(mode: str, clients: int, reloads: int) -> None:
+    manager = EngineManager(DATA_PATH, build_mode=mode, watch_interval=0)
+    manager.load()
+
+    stop = threading.Event()
+    phase = {"name": "steady"}
+    latencies: Dict[str, List[float]] = {"steady": [], "reloading": []}
+    failures: List[str] = []
+    threads = [threading.Thread(target=_client, args=(manager, stop, phase, latencies, failures))
+               for _ in range(clients)]
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for t in threads:
+            t.start()
+        await asyncio.sleep(2.0)
+
+        phase["name"] = "reloading"
+        reload_times = []
+        for _ in range(reloads):
+            start = time.perf_counter()
+            await manager.reload()
+            reload_times.append(time.perf_counter() - start)
+
+        stop.set()
+        for t in threads:
+            t.join()
+
+    print(f"Build mode: {mode}, clients: {clients}, reloads: {reloads}")
+    print(f"Final catalog version: {manager.current.version}")
+    print(f"Mean reload time: {np.mean(reload_times):.2f}s")
+    for name, values in latencies.items():
+        values = np.array(values)
+        print(f"  {name:<10} n={len(values):<6} p50={np.percentile(values, 50):.2f}ms "
+              f"p99={np.percentile(values, 99):.2f}ms max={values.max():.2f}ms")
+    print(f"Failed requests: {len(failures)}")
+    if failures:
+        print(f"  first failure: {failures[0]}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mode", choices=["process", "thread"], default="process")
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--reloads", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.mode, args.clients, args.reloads))
@@ -0,0 +1,98 @@
+# Benchmark: Per-worker vs Shared-memory Result Cache Across Worker Processes
+# File: backend/benchmarks/bench_result_cache.py
+#
+# Usage (from backend/): python -m benchmarks.bench_result_cache [--workers 8] [--requests 8000]
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from app.result_cache import LocalResultCache, SharedResultCache
+from benchmarks._catalog import load_engine, synthetic_catalog_path
+from benchmarks.bench_coalescing import spike_workload
+
+# Inherited by forked workers
+_STATE: Dict[str, Any] = {}
+
+
+def _serve(requests: List[Any]) -> Dict[str, Any]:
+    """Worker loop: cache lookup, score on a miss, store the rows"""
+    engine = _STATE["engine"]
+    cache = _STATE["cache"]() if callable(_STATE["cache"]) else _STATE["cache"]
+    latencies = []
+    for request in requests:
+        start = time.perf_counter()
+        key = request.coalescing_key()
+        cached = cache.get(key)
+        if cached is not None:
+            rows = json.loads(cached)
+        else:
+            rows = engine.get_recommendation_rows(
+                education=request.education, skills=request.skills, sectors=request.sectors,
+                location_state=request.location_state, max_results=request.max_results or 5,
+                filters=request.hard_filters(), diversity=request.diversity_options()
+            )
+            cache.put(key, json.dumps(rows).encode("utf-8"))
+        engine.render_recommendations_json(rows)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {"latencies": latencies, "hits": cache.hits, "misses": cache.misses}
+
+
+def run(mode: str, workload: List[Any], workers: int) -> Dict[str, Any]:
+    """Serve the workload round-robin across forked workers with one cache mode"""
+    if mode == "shared":
+        cache = SharedResultCache(name=f"bench_results_{os.getpid()}", slots=8192, slot_size=4096)
+        _STATE["cache"] = cache
+    else:
+        cache = None
+        _STATE["cache"] = lambda: LocalResultCache(max_entries=8192)
+
+    shards = [workload[i::workers] for i in range(workers)]
+    start = time.perf_counter()
+    with multiprocessing.get_context("fork").Pool(workers) as pool:
+        results = pool.map(_serve, shards)
+    wall = time.perf_counter() - start
+    if cache is not None:
+        cache.close()
+        cache.unlink()
+
+    latencies = np.array([latency for result in results for latency in result["latencies"]])
+    hits = sum(result["hits"] for result in results)
+    misses = sum(result["misses"] for result in results)
+    return {
+        "hit_rate": hits / (hits + misses),
+        "computations": misses,
+        "mean_ms": float(latencies.mean()),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "wall": wall,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare per-worker and shared result caches")
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=8000)
+    parser.add_argument("--distinct", type=int, default=1500)
+    args = parser.parse_args()
+
+    _STATE["engine"] = load_engine(synthetic_catalog_path(args.size))
+    workload = spike_workload(_STATE["engine"].internships, args.requests, args.distinct)
+
+    print(f"\n🗄️ {args.requests} requests over {args.distinct} profiles (Zipf), "
+          f"{args.workers} workers, catalog {args.size}")
+    print(f"{'cache':<10} {'hit rate':>9} {'computed':>9} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'wall s':>7}")
+    for mode in ("local", "shared"):
+        r = run(mode, workload, args.workers)
+        print(f"{mode:<10} {r['hit_rate']:>9.1%} {r['computations']:>9} {r['mean_ms']:>8.2f} "
+              f"{r['p50_ms']:>8.3f} {r['p95_ms']:>8.2f} {r['wall']:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
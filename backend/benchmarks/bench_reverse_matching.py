@@ -0,0 +1,60 @@
+# Benchmark: Reverse Matching (rank the student pool for one internship)
+# File: backend/benchmarks/bench_reverse_matching.py
+#
+# Usage (from backend/): python -m benchmarks.bench_reverse_matching [--students 100000 1000000]
+#
+# Pools are sampled with replacement from generated labeled profiles, so
+# large pools keep a realistic mix of skills, sectors and locations.
+
+import argparse
+import time
+
+import numpy as np
+
+from app.evaluation import generate_labeled_profiles
+from app.models import RecommendationRequest
+from app.student_index import StudentIndex
+from benchmarks._catalog import load_engine, synthetic_catalog_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-query latency of ranking students for a listing")
+    parser.add_argument("--students", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--catalog", type=int, default=100000)
+    parser.add_argument("--distinct-profiles", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--block-size", type=int, default=65536)
+    args = parser.parse_args()
+
+    engine = load_engine(synthetic_catalog_path(args.catalog))
+    base = [RecommendationRequest(**entry["profile"])
+            for entry in generate_labeled_profiles(engine.internships, args.distinct_profiles)]
+    rng = np.random.default_rng(42)
+    listings = rng.choice(len(engine.internships), args.queries, replace=False)
+
+    print(f"\n{'students':>9} {'build s':>8} {'index MB':>9} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} "
+          f"{'eligible p50':>13}")
+    for size in args.students:
+        index = StudentIndex(engine, args.block_size)
+        start = time.perf_counter()
+        for block_start in range(0, size, args.block_size):
+            sample = rng.integers(0, len(base), min(args.block_size, size - block_start))
+            index.add_profiles([base[i] for i in sample], (block_start + np.arange(len(sample))).tolist())
+        build = time.perf_counter() - start
+
+        latencies = {False: [], True: []}
+        for eligible_only in (False, True):
+            index.top_students(int(listings[0]), args.k, eligible_only=eligible_only)
+            for row in listings:
+                query_start = time.perf_counter()
+                index.top_students(int(row), args.k, eligible_only=eligible_only)
+                latencies[eligible_only].append((time.perf_counter() - query_start) * 1000)
+
+        p50, p95, p99 = np.percentile(latencies[False], [50, 95, 99])
+        print(f"{size:>9} {build:>8.1f} {index.nbytes / 1e6:>9.1f} {p50:>7.1f} {p95:>7.1f} {p99:>7.1f} "
+              f"{np.percentile(latencies[True], 50):>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
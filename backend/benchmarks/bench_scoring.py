@@ -0,0 +1,78 @@
+# Benchmark: Fused Scoring Kernel vs Per-component Scoring
+# File: backend/benchmarks/bench_scoring.py
+#
+# Usage (from backend/): python -m benchmarks.bench_scoring [--sizes 2000 20000 100000]
+
+import argparse
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from app.evaluation import generate_labeled_profiles
+from benchmarks._catalog import load_engine, synthetic_catalog_path
+
+
+def _measure(fn: Callable[[dict], object], profiles: List[dict]) -> Dict[str, float]:
+    """Mean latency, plus traced allocations and peak memory per call"""
+    for profile in profiles[:5]:
+        fn(profile)
+
+    start = time.perf_counter()
+    for profile in profiles:
+        fn(profile)
+    latency_ms = (time.perf_counter() - start) / len(profiles) * 1000
+
+    # NumPy reports its buffers to tracemalloc, so this covers the array temporaries
+    blocks, peaks = [], []
+    tracemalloc.start()
+    for profile in profiles[:50]:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        fn(profile)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+        after = tracemalloc.take_snapshot()
+        blocks.append(sum(max(stat.count_diff, 0) for stat in after.compare_to(before, "lineno")))
+    tracemalloc.stop()
+
+    return {
+        "latency_ms": latency_ms,
+        "peak_kb": float(np.mean(peaks)) / 1024,
+        "blocks": float(np.mean(blocks)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare fused and per-component scoring")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 20000, 100000])
+    parser.add_argument("--profiles", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"\n{'catalog':>8} {'path':<22} {'latency ms':>11} {'peak KB':>9} {'live blocks':>12}")
+    for size in args.sizes:
+        engine = load_engine(synthetic_catalog_path(size))
+        profiles = [entry["profile"] for entry in generate_labeled_profiles(engine.internships, args.profiles)]
+
+        def component_scores(p):
+            return engine.combine_components(engine.compute_components(
+                p["education"], p["skills"], p.get("sectors"), p.get("location_state")
+            ))
+
+        def fused_scores(p):
+            return engine.score_rows(p["education"], p["skills"], p.get("sectors"), p.get("location_state"))
+
+        def recommendations(p):
+            return engine.get_recommendation_rows(
+                p["education"], p["skills"], p.get("sectors"), p.get("location_state")
+            )
+
+        for name, fn in (("per-component scores", component_scores), ("fused scores", fused_scores),
+                         ("get_recommendation_rows", recommendations)):
+            m = _measure(fn, profiles)
+            print(f"{size:>8} {name:<22} {m['latency_ms']:>11.3f} {m['peak_kb']:>9.0f} {m['blocks']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
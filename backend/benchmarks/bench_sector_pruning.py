@@ -0,0 +1,55 @@
+# Benchmark: Sector-partitioned Scoring with Early Termination vs Exhaustive Scoring
+# File: backend/benchmarks/bench_sector_pruning.py
+#
+# Usage (from backend/): python -m benchmarks.bench_sector_pruning [--sizes 20000 100000]
+
+import argparse
+import time
+
+import numpy as np
+
+from app.evaluation import generate_labeled_profiles
+from benchmarks._catalog import load_engine, synthetic_catalog_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare sector-pruned and exhaustive scoring")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20000, 100000])
+    parser.add_argument("--profiles", type=int, default=200)
+    parser.add_argument("--max-results", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"\n{'catalog':>8} {'exhaustive ms':>14} {'pruned ms':>10} {'speedup':>8} "
+          f"{'rows scored':>12} {'identical':>10}")
+    for size in args.sizes:
+        engine = load_engine(synthetic_catalog_path(size))
+        queries = []
+        for entry in generate_labeled_profiles(engine.internships, args.profiles):
+            profile = entry["profile"]
+            # Single-sector queries only (profiles name their target listing's sector)
+            if profile["sectors"]:
+                queries.append((profile["education"], profile["skills"], profile["sectors"],
+                                profile["location_state"]))
+
+        timings, results, scored = {}, {}, []
+        for pruning in (False, True):
+            engine.sector_pruning = pruning
+            for query in queries[:5]:
+                engine.get_recommendation_rows(*query, max_results=args.max_results)
+            start = time.perf_counter()
+            results[pruning] = [engine.get_recommendation_rows(*query, max_results=args.max_results)
+                                for query in queries]
+            timings[pruning] = (time.perf_counter() - start) / len(queries) * 1000
+
+        for query in queries:
+            rows = engine.filter_rows(query[0])
+            scored_rows, _ = engine.score_sector_partitions(*query, rows=rows, k=args.max_results)
+            scored.append(len(scored_rows) / engine._row_count(rows))
+
+        print(f"{size:>8} {timings[False]:>14.2f} {timings[True]:>10.2f} "
+              f"{timings[False] / timings[True]:>7.1f}x {np.mean(scored):>12.1%} "
+              f"{str(results[False] == results[True]):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# Benchmark: Pydantic Response Construction vs Pre-serialized Listings
+# File: backend/benchmarks/bench_serialization.py
+#
+# Usage (from backend/): python -m benchmarks.bench_serialization
+
+import contextlib
+import os
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from typing import List
+
+from app.models import InternshipResponse
+from app.recommendation_engine import InternshipRecommendationEngine
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "internships_dataset.json")
+RUNS = 2000
+
+
+def main() -> None:
+    engine = InternshipRecommendationEngine(DATA_PATH)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        engine.load_data()
+
+    rows = engine.get_recommendation_rows("B.Tech", ["Python", "SQL"], ["Technology"], None, 10)
+    adapter = TypeAdapter(List[InternshipResponse])
+
+    def pydantic_path() -> bytes:
+        # Mirrors the previous handler: build models, re-validate for response_model, encode
+        response = []
+        for idx, score, reason in rows:
+            rec = dict(engine.internships[idx], similarity_score=score, reason=reason)
+            response.append(InternshipResponse(**{k: rec[k] for k in InternshipResponse.model_fields}))
+        validated = adapter.validate_python(jsonable_encoder(response))
+        return adapter.dump_json(validated)
+
+    def fast_path() -> bytes:
+        return engine.render_recommendations_json(rows)
+
+    for name, fn in (("pydantic", pydantic_path), ("pre-serialized", fast_path)):
+        seconds = timeit.timeit(fn, number=RUNS) / RUNS
+        print(f"{name:<15} {seconds * 1e6:8.1f} µs/response ({len(fn())} bytes, {len(rows)} listings)")
+
+
+if __name__ == "__main__":
+    main()